@@ -6,30 +6,15 @@ from config import settings
 from jose import jwt, JWTError, ExpiredSignatureError
 from custom_logger import info_logger, error_logger
 from utils.limiter_utils import limit_safe
-from typing import Any
+from utils.tracing import get_tracer
 import uuid
 import os
 
 print("[AUTH_BC] AUTH_MODULE_IMPORTED file=auth/hybrid_auth.py", flush=True)
 
-def _clip(v: Any, limit: int = 180) -> str:
-    try:
-        s = repr(v)
-    except Exception:
-        s = f"<unrepr:{type(v).__name__}>"
-    return s if len(s) <= limit else s[:limit] + "…"
-
+# 🧵 Render-visible breadcrumbs (utils/tracing); long values are clipped
+_auth_bc = get_tracer("AUTH_BC", clip=180)
 
-def _auth_bc(event: str, **fields) -> None:
-    """
-    Render-visible breadcrumb logger.
-    Uses print(..., flush=True) so breadcrumbs appear in Render Logs.
-    """
-    try:
-        parts = " ".join(f"{k}={_clip(v)}" for k, v in fields.items())
-        print(f"[AUTH_BC] {event}" + (f" {parts}" if parts else ""), flush=True)
-    except Exception as e:
-        print(f"[AUTH_BC] {event} breadcrumb_error={type(e).__name__}:{e}", flush=True)
 
 # 🔐 JWT Configuration
 SECRET_KEY = settings.SECRET_KEY
@@ -73,7 +58,8 @@ class TokenPair(BaseModel):
 # 🛡️ Token Decoder 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        info_logger.info(f"🧾 Decoding token: {credentials.credentials}")
+        # 🔇 DEBUG only, and never the whole token
+        info_logger.debug("🧾 Decoding token …%s", credentials.credentials[-6:])
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
         username = payload.get("sub")
         role = payload.get("role")
@@ -287,7 +273,7 @@ async def login_user(request: Request, login: LoginInput):
 async def rotate_token(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         incoming = credentials.credentials
-        info_logger.info(f"🔄 Refresh attempt with token: {incoming}")
+        info_logger.debug("🔄 Refresh attempt with token …%s", incoming[-6:])
 
         # 🔍 Search all users for a matching refresh token
         for username, token_info in refresh_token_store.items():
@@ -0,0 +1,164 @@
+# benchmarks/storage_benchmark.py
+#
+# 🏁 Runs the same synthetic Pokédex workloads against every storage backend
+# so they can be compared side by side.
+#
+#   python benchmarks/storage_benchmark.py                  # memory, file, sqlite
+#   python benchmarks/storage_benchmark.py --size 20000 --ops 5000
+#   python benchmarks/storage_benchmark.py --postgres       # also DATABASE_URL
+#
+# File and SQLite run against throwaway copies in a temp directory. PostgreSQL
+# has no such sandbox: --postgres overwrites the "pokedex" collection of the
+# configured database, so point DATABASE_URL at a scratch database.
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from utils import sqlite_store  # noqa: E402
+from utils.db_json_store import db_enabled  # noqa: E402
+from utils.storage_backends import (  # noqa: E402
+    FileBackend,
+    FileCollection,
+    MemoryBackend,
+    PostgresBackend,
+    SqliteBackend,
+)
+
+COLLECTION = "pokedex"
+TYPES = ["Grass", "Fire", "Water", "Electric", "Psychic", "Rock", "Ghost", "Dragon"]
+
+
+def synthetic_pokedex(size: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        str(i): {
+            "id": i,
+            "name": f"Mon{i:05d}",
+            "level": rng.randint(1, 100),
+            "ptype": rng.choice(TYPES),
+        }
+        for i in range(1, size + 1)
+    }
+
+
+def build_backends(workdir: str, include_postgres: bool):
+    backends = {
+        "memory": MemoryBackend(),
+        "file": FileBackend(collections={
+            COLLECTION: FileCollection(
+                path=os.path.join(workdir, "pokedex.json"),
+                journal_path=os.path.join(workdir, "pokedex.journal"),
+                binary_path=os.path.join(workdir, "pokedex.bin"),
+            ),
+        }),
+    }
+
+    settings.SQLITE_PATH = os.path.join(workdir, "pokemon.sqlite3")
+    backends["sqlite"] = SqliteBackend()
+
+    if include_postgres:
+        if db_enabled():
+            backends["postgres"] = PostgresBackend()
+        else:
+            print("⚠️ --postgres given but DATABASE_URL is unset (or TESTING=1); skipping PostgreSQL")
+
+    return backends
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_workloads(backend, dex: dict, ops: int, batch: int, seed: int):
+    rng = random.Random(seed)
+    ids = list(dex)
+
+    def point_get():
+        backend.get(COLLECTION, rng.choice(ids))
+
+    def get_many():
+        backend.get_many(COLLECTION, rng.sample(ids, batch))
+
+    def patch():
+        backend.patch(COLLECTION, rng.choice(ids), {"level": rng.randint(1, 100)})
+
+    def mixed():
+        if rng.random() < 0.9:
+            point_get()
+        else:
+            patch()
+
+    bulk_repeat = max(1, min(5, ops // 200))
+    scan_repeat = max(1, min(20, ops // 50))
+
+    return [
+        ("bulk replace", timed(lambda: backend.replace(COLLECTION, dex), bulk_repeat)),
+        ("point get", timed(point_get, ops)),
+        (f"get_many x{batch}", timed(get_many, max(1, ops // 10))),
+        ("patch", timed(patch, ops)),
+        ("mixed 90/10", timed(mixed, ops)),
+        ("full scan", timed(lambda: backend.scan(COLLECTION), scan_repeat)),
+    ]
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, results) -> None:
+    print(f"\n📦 {name}")
+    print(f"  {'workload':<16}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for workload, samples in results:
+        mean = statistics.fmean(samples)
+        ops_per_sec = 1 / mean if mean else float("inf")
+        print(
+            f"  {workload:<16}{ops_per_sec:>12,.0f}"
+            f"{percentile(samples, 50) * 1000:>10.3f}{percentile(samples, 99) * 1000:>10.3f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare Pokédex storage backends on the same workloads.")
+    parser.add_argument("--size", type=int, default=5000, help="entries in the synthetic Pokédex")
+    parser.add_argument("--ops", type=int, default=2000, help="operations per point workload")
+    parser.add_argument("--batch", type=int, default=50, help="ids per get_many call")
+    parser.add_argument("--seed", type=int, default=151)
+    parser.add_argument("--only", nargs="*", help="backend names to run (default: all available)")
+    parser.add_argument("--postgres", action="store_true", help="also run against DATABASE_URL (overwrites its pokedex)")
+    args = parser.parse_args(argv)
+
+    dex = synthetic_pokedex(args.size, args.seed)
+    batch = min(args.batch, args.size)
+    print(f"🏁 {args.size} entries, {args.ops} ops per point workload, seed {args.seed}")
+
+    with tempfile.TemporaryDirectory(prefix="pokedex-bench-") as workdir:
+        backends = build_backends(workdir, args.postgres)
+        try:
+            for name, backend in backends.items():
+                if args.only and name not in args.only:
+                    continue
+                backend.replace(COLLECTION, {})
+                report(name, run_workloads(backend, dex, args.ops, batch, args.seed))
+        finally:
+            sqlite_store.close_connection()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
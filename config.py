@@ -50,6 +50,53 @@ class Settings(BaseSettings):
     # 🌐 HTTPS Redirect Toggle (used in middleware)
     FORCE_HTTPS: bool = os.getenv("FORCE_HTTPS", "0") == "1"
 
+    # 🗄️ Storage backend: "auto" (PostgreSQL if DATABASE_URL, else JSON files), "postgres", "sqlite" or "file"
+    STORAGE_BACKEND: str = "auto"
+    SQLITE_PATH: str = os.path.join("data", "pokemon.sqlite3")
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000          # Wait this long for another writer's lock
+
+    # 🐘 PostgreSQL connection pool (used only when DATABASE_URL is set)
+    DB_POOL_MIN_SIZE: int = 1                   # Opened at start and kept warm; extra connections close on return
+    DB_POOL_MAX_SIZE: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0       # Wait this long for a free connection
+    DB_POOL_IDLE_CHECK_SECONDS: float = 30.0    # Ping idle connections older than this
+    DB_CONNECT_TIMEOUT: int = 10
+    DB_JSONB_ORJSON: bool = True                # Decode JSONB with orjson on the pool's connections
+    DB_STORAGE_LAYOUT: str = "document"         # "document" (one JSONB row) or "rows" (row per entry)
+    STORAGE_VERIFY_MODE: str = "hash"           # "off", "hash" (checked by the write itself) or "full" (re-read)
+    STORAGE_CAS_RETRIES: int = 3                # Merge-and-retry attempts on a concurrent save
+
+    # 📓 Local JSON fallback (no DATABASE_URL): snapshot + append-only journal
+    FILE_JOURNAL_COMPACT_BYTES: int = 262144    # Fold the journal into the snapshot past this size (0 = no journal)
+    FILE_JOURNAL_FSYNC: bool = False            # fsync every journal append / snapshot write
+    FILE_BINARY_SNAPSHOT: bool = True           # Keep data/pokedex.bin (orjson) next to the JSON for fast loads
+
+    # 🧺 Write coalescing (0 = off, every mutation is saved on its own)
+    WRITE_BATCH_WINDOW_MS: int = 0              # Collect mutations for this long, then save once
+    WRITE_BATCH_MAX_SIZE: int = 100             # Flush early once this many mutations are waiting
+
+    # 🧊 Encoded GET /pokemon responses kept per Pokédex version (ETag / 304)
+    RESPONSE_CACHE_ENTRIES: int = 512           # Distinct route+query bodies kept (0 = off, ETags still sent)
+
+    # 📡 Change feed (GET /feed/events SSE, /feed/ws WebSocket)
+    FEED_RETENTION: int = 10000                 # Recent events kept so reconnecting clients can resume from a cursor
+    FEED_CLIENT_BUFFER: int = 256               # Undelivered events per client before it is cut off (it resumes)
+    FEED_HEARTBEAT_SECONDS: float = 15.0        # Keep-alive ping on an idle stream
+
+    # 🧵 Breadcrumb tracing ([FH_BC], [DB_BC], ... — utils/tracing)
+    TRACE_LEVEL: str = "off" if os.getenv("TESTING", "0") == "1" else "info"   # "off", "error", "info" or "debug"
+    TRACE_LEVELS: str = ""                      # Per-subsystem overrides, e.g. "FH_BC=debug,DB_BC=error"
+    TRACE_SAMPLE_RATE: float = 1.0              # Fraction of info/debug breadcrumbs kept (errors always kept)
+    TRACE_QUEUE_SIZE: int = 10000               # Lines buffered for the writer thread; beyond that they are dropped
+
+    # 🪵 File logs (custom_logger): queued, written by a background thread
+    LOG_LEVELS: str = ""                        # Per-logger levels, e.g. "api_info=DEBUG,uvicorn=WARNING"
+    LOG_QUEUE_SIZE: int = 10000                 # Records buffered for the writer; beyond that they are dropped
+    LOG_ROTATE_BYTES: int = 5242880             # Rotate a log file past this size (0 = never)
+    LOG_ROTATE_WHEN: str = ""                   # Time-based rotation instead ("midnight", "H", ...); "" = size-based
+    LOG_BACKUP_COUNT: int = 5                   # Rotated files kept per log
+    LOG_CONSOLE: bool = os.getenv("TESTING", "0") != "1"   # Also echo app logs to stderr
+
     class Config:
         env_file = dotenv_path
         env_file_encoding = "utf-8"
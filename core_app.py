@@ -2,15 +2,14 @@
 
 import sys
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
-import logging
-
-logging.basicConfig(level=logging.DEBUG)
 
 # 📁 Add root path for project-wide module discovery
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -30,7 +29,7 @@ else:
 
 # 🧠 Logging + Middleware
 from logger_middleware import LoggingMiddleware
-from custom_logger import info_logger, error_logger
+from custom_logger import info_logger, error_logger, flush_logs
 from utils.secure_static import SecureStaticFiles
 from utils.security_headers import SecurityHeadersMiddleware
 
@@ -51,9 +50,13 @@ from routers import (
     upload_secure_image,
     gallery,
     upload_csv_validated,
-    download
+    download,
+    feed
 )
 from auth.hybrid_auth import router as hybrid_auth_router
+from utils.db_json_store import DocumentConflictError, close_pool, shutdown_store_executor
+from utils.write_batcher import drain_all as drain_write_batches
+from utils.change_feed import change_feed
 
 # 🔍 Detect test mode
 def is_testing_env():
@@ -68,8 +71,23 @@ def enable_https_redirect():
     else:
         print("🧪 HTTPS redirect DISABLED (dev/test)")
 
+# ♻️ Startup / shutdown hooks
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 📡 End open SSE/WebSocket feeds so the server is not held open by them
+    change_feed.close()
+    # 🧺 Save any coalesced writes still waiting for their window
+    await drain_write_batches()
+    # 🐘 Finish in-flight storage calls, then release pooled PostgreSQL connections
+    shutdown_store_executor()
+    close_pool()
+    # 🪵 Give the log writer a moment to empty its queue
+    flush_logs()
+
 # 🚀 Initialize FastAPI app
 core_app = FastAPI(
+    lifespan=lifespan,
     title="Modular Pokémon API",
     description="A FastAPI-powered PokéCenter for trainers worldwide.",
     version="1.0",
@@ -91,6 +109,18 @@ if not is_testing_env():
 else:
     info_logger.info("🧪 Testing mode: Rate limiter middleware disabled.")
 
+# ⚔️ Concurrent-save conflicts that could not be merged → 409
+@core_app.exception_handler(DocumentConflictError)
+async def document_conflict_handler(request: Request, exc: DocumentConflictError):
+    error_logger.error(f"{request.method} {request.url.path} → 409: {exc}")
+    return JSONResponse(
+        status_code=409,
+        content={
+            "detail": "Another trainer changed the same Pokémon at the same time. Reload and try again.",
+            "conflicting_ids": exc.entry_keys,
+        },
+    )
+
 # 📜 Logging Middleware
 try:
     core_app.add_middleware(LoggingMiddleware)
@@ -115,7 +145,8 @@ core_app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Missing-Ids", "ETag"]  # 📄 GET /pokemon/ paging + multi-get, 🧊 If-None-Match
 )
 
 # 📂 Serve static files
@@ -133,3 +164,4 @@ core_app.include_router(upload_secure_image.router)
 core_app.include_router(upload_misc.router)
 core_app.include_router(gallery.router)
 core_app.include_router(download.router)
+core_app.include_router(feed.router)
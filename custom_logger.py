@@ -1,6 +1,12 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import time
+
+from config import settings
 
 # 📁 Create logs/ folder if not exists
 LOG_DIR = "logs"
@@ -12,20 +18,146 @@ try:
 except Exception:
     pass  # Safe fallback for older Python versions
 
+# 🧵 Non-blocking pipeline: request code only puts records on a bounded queue
+# (QueueHandler); one QueueListener thread formats them and does the disk I/O
+# (rotation included). A full queue drops the record and counts it, so a
+# stalled log disk never adds latency to a response.
+#
+#   logger ─► _BoundedQueueHandler ─► queue ─► listener thread ─► file handlers
+#                                                                └► console
+
+# 🎚️ Default level per logger; LOG_LEVELS overrides ("api_info=DEBUG,uvicorn=WARNING")
+_DEFAULT_LEVELS = {
+    "api_error": logging.ERROR,
+    "api_info": logging.INFO,
+    "api_middleware": logging.INFO,
+}
+
+# (logger name, file in logs/, format)
+_LOG_FILES = [
+    ("api_error", "error_log.txt", "[%(asctime)s] [ERROR] %(message)s"),
+    ("api_info", "api_info.log", "[%(asctime)s] [INFO] %(message)s"),
+    ("api_middleware", "middleware_logs.txt", "%(message)s"),
+]
+
+_STATS = {"enqueued": 0, "dropped": 0, "high_water": 0}
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never waits: a full queue drops the record."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _STATS["dropped"] += 1
+            return
+
+        _STATS["enqueued"] += 1
+        size = self.queue.qsize()
+        if size > _STATS["high_water"]:
+            _STATS["high_water"] = size
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Shutdown only: wait for room instead of failing on a full queue
+        self.queue.put(self._sentinel, timeout=5)
+
+
+def _parse_levels(spec: str) -> dict:
+    levels = dict(_DEFAULT_LEVELS)
+    for item in str(spec or "").split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip():
+            value = logging.getLevelName(level.strip().upper())
+            if isinstance(value, int):
+                levels[name.strip()] = value
+    return levels
+
+
+def _file_handler(filename: str, fmt: str) -> logging.Handler:
+    path = os.path.join(LOG_DIR, filename)
+
+    # 🔄 Time-based rotation wins if set, else size-based, else one plain file
+    if settings.LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=settings.LOG_ROTATE_WHEN, backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8", delay=True,
+        )
+    elif settings.LOG_ROTATE_BYTES > 0:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=settings.LOG_ROTATE_BYTES, backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8", delay=True,
+        )
+    else:
+        handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+
+    handler.setFormatter(logging.Formatter(fmt))
+    return handler
+
+
+def _configure():
+    log_queue: queue.Queue = queue.Queue(maxsize=max(1, int(settings.LOG_QUEUE_SIZE)))
+    queue_handler = _BoundedQueueHandler(log_queue)
+
+    sinks = []
+    for name, filename, fmt in _LOG_FILES:
+        handler = _file_handler(filename, fmt)
+        handler.addFilter(logging.Filter(name))  # each file only gets its own logger
+        sinks.append(handler)
+
+    if settings.LOG_CONSOLE:
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+        sinks.append(console)
+
+    for name, level in _parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    loggers = {}
+    for name, _filename, _fmt in _LOG_FILES:
+        logger = logging.getLogger(name)
+        # ✅ Prevent duplicate handlers on reload
+        for old in [h for h in logger.handlers if isinstance(h, _BoundedQueueHandler)]:
+            logger.removeHandler(old)
+        logger.addHandler(queue_handler)
+        logger.propagate = False  # the console sink replaces the old root basicConfig
+        loggers[name] = logger
+
+    listener = _Listener(log_queue, *sinks, respect_handler_level=True)
+    listener.start()
+    return log_queue, listener, loggers
+
+
+_QUEUE, _LISTENER, _LOGGERS = _configure()
+
 # 🔴 Error Logger: Logs all ERROR-level events
-error_logger = logging.getLogger("api_error")
-if not error_logger.hasHandlers():  # ✅ Prevent duplicate handlers on reload
-    error_handler = logging.FileHandler(f"{LOG_DIR}/error_log.txt", encoding="utf-8")
-    error_handler.setFormatter(logging.Formatter("[%(asctime)s] [ERROR] %(message)s"))
-    error_logger.setLevel(logging.ERROR)
-    error_logger.addHandler(error_handler)
+error_logger = _LOGGERS["api_error"]
 
 # 🟢 Info Logger: General info and audit events
-info_logger = logging.getLogger("api_info")
-if not info_logger.hasHandlers():  # ✅ Prevent duplicate handlers on reload
-    info_handler = logging.FileHandler(f"{LOG_DIR}/api_info.log", encoding="utf-8")
-    info_handler.setFormatter(logging.Formatter("[%(asctime)s] [INFO] %(message)s"))
-    info_logger.setLevel(logging.INFO)
-    info_logger.addHandler(info_handler)
+info_logger = _LOGGERS["api_info"]
+
+# 🌐 Request Logger: one line per request (logger_middleware)
+middleware_logger = _LOGGERS["api_middleware"]
+
+
+def flush_logs(timeout: float = 2.0) -> None:
+    """Wait (bounded) until queued records are on disk — shutdown, tests."""
+    deadline = time.monotonic() + timeout
+    while _QUEUE.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def logging_stats() -> dict:
+    return {"queued": _QUEUE.qsize(), **_STATS}
+
+
+def _stop_listener() -> None:
+    try:
+        _LISTENER.stop()
+    except Exception:
+        pass
 
 
+atexit.register(_stop_listener)
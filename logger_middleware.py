@@ -4,12 +4,10 @@ from starlette.requests import Request
 from datetime import datetime
 from jose import jwt, JWTError
 import time
-import os
 
-# ⚙️ Logging setup
-LOG_DIR = "logs"
-LOG_FILE = "middleware_logs.txt"
-os.makedirs(LOG_DIR, exist_ok=True)
+# ⚙️ Logging setup — lines go to logs/middleware_logs.txt via the queued
+# custom_logger pipeline, so the response never waits on the disk
+from custom_logger import middleware_logger
 
 # 🔐 JWT Setup (same as your app)
 SECRET_KEY = "pikachu-secret-key"  # Use your actual key
@@ -51,13 +49,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # 📝 Log format
         log_entry = (
             f"[{timestamp}] {method} {url} | 👤 {username} | 📍 {ip} | "
-            f"Status: {status_code} | ⏱️ {duration}s\n"
+            f"Status: {status_code} | ⏱️ {duration}s"
         )
 
-        # 💾 Save log to file with utf-8 to avoid UnicodeEncodeError
-        log_path = os.path.join(LOG_DIR, LOG_FILE)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(log_entry)
+        # 💾 Queued; the writer thread appends it (utf-8) off the request path
+        middleware_logger.info(log_entry)
 
         # 🛑 If error, return fallback response
         return response if response else PlainTextResponse("Internal Server Error", status_code=500)
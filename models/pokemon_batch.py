@@ -0,0 +1,47 @@
+from typing import Annotated, List, Literal, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from models.pokemon_model import Pokemon, PatchPokemon
+
+# 📦 POST /pokemon/batch — many creates / patches / deletes in one request
+
+MAX_BATCH_OPERATIONS = 1000
+
+
+class CreateOperation(BaseModel):
+    op: Literal["create"]
+    pokemon: Pokemon
+
+
+class PatchOperation(BaseModel):
+    op: Literal["patch"]
+    id: int
+    changes: PatchPokemon
+
+
+class DeleteOperation(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+BatchOperation = Annotated[
+    Union[CreateOperation, PatchOperation, DeleteOperation],
+    Field(discriminator="op"),
+]
+
+
+class PokemonBatch(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "operations": [
+                    {"op": "create", "pokemon": {"poke_name": "Eevee", "level": 12, "ptype": "Normal"}},
+                    {"op": "patch", "id": 4, "changes": {"level": 20}},
+                    {"op": "delete", "id": 7},
+                ]
+            }
+        }
+    )
@@ -24,3 +24,17 @@ class PatchPokemon(BaseModel):
     level: Optional[int] = Field(None, ge=5, le=100)
     ptype: Optional[str] = Field(None)
     nickname: Optional[str] = Field(None)
+
+class PokemonFields(BaseModel):
+    """Read-route response: all of Pokemon by default, only the asked-for attributes with ?fields=."""
+    id: Optional[int] = Field(None, description="Only sent when asked for with ?fields=")
+    name: Optional[str] = Field(None, description="Name of the Pokémon")
+    level: Optional[int] = Field(None, description="Level between 5 and 100")
+    ptype: Optional[str] = Field(None, description="Type of the Pokémon")
+    nickname: Optional[str] = Field(None, description="Optional nickname")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"name": "Charizard", "level": 50}
+        }
+    )
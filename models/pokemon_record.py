@@ -0,0 +1,84 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from models.pokemon_model import Pokemon
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def _dumps(data: Any) -> bytes:
+    # Same bytes Starlette's JSONResponse would send
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True, slots=True)
+class PokemonRecord:
+    """
+    One stored Pokémon, validated once when it enters the Pokédex cache.
+
+    `body` holds the pre-rendered JSON response (the Pokemon model dumped
+    by field name), so read routes can send cached records without
+    re-validating or re-serializing them per request.
+    """
+
+    id: int
+    name: str
+    level: int
+    ptype: str
+    nickname: Optional[str] = None
+    body: bytes = field(default=b"", repr=False, compare=False)
+
+    @classmethod
+    def from_entry(cls, pokemon_id: Any, entry: Any) -> "PokemonRecord":
+        """
+        Validate a stored entry (old `poke_name` style included) against the
+        Pokemon model. Raises like Pokemon.model_validate on bad data.
+        """
+        if not isinstance(entry, dict):
+            raise TypeError(f"Entry for pid {pokemon_id} is not a dict")
+
+        fixed = dict(entry)
+
+        # Support both old and new naming styles
+        if "name" not in fixed and "poke_name" in fixed:
+            fixed["name"] = fixed.get("poke_name")
+        if "poke_name" not in fixed and "name" in fixed:
+            fixed["poke_name"] = fixed.get("name")
+
+        fixed["nickname"] = fixed.get("nickname") or None
+
+        if fixed.get("level") is not None:
+            fixed["level"] = int(fixed["level"])
+
+        pokemon = Pokemon.model_validate(fixed)
+
+        return cls(
+            id=int(fixed.get("id", pokemon_id)),
+            name=pokemon.name,
+            level=pokemon.level,
+            ptype=pokemon.ptype,
+            nickname=pokemon.nickname,
+            body=_dumps(pokemon.model_dump()),
+        )
+
+
+# Attributes a client can ask for with ?fields=
+RECORD_FIELDS = ("id", "name", "level", "ptype", "nickname")
+
+
+def project_json(record: PokemonRecord, fields) -> bytes:
+    """JSON object with only `fields` (a subset of RECORD_FIELDS) of the record."""
+    return _dumps({name: getattr(record, name) for name in fields})
+
+
+def records_json(records, fields=None) -> bytes:
+    """JSON array body for pre-rendered records, or only `fields` of each."""
+    if fields:
+        return b"[" + b",".join(project_json(record, fields) for record in records) + b"]"
+    return b"[" + b",".join(record.body for record in records) + b"]"
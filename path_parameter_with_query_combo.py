@@ -1,12 +1,11 @@
 from fastapi import Query,FastAPI,Path,HTTPException,status
 from pydantic import BaseModel,Field
-from typing import Optional,List,Dict,Union
+from typing import Optional,List,Union
 from enum import Enum
-from utils.file_handler import load_pokedex
+from utils.file_handler import query_pokedex
 
 app=FastAPI()
 
-pokedex: Dict[int,dict]=load_pokedex()
 
 class Region(str,Enum):
     kanto="Kanto"
@@ -47,11 +46,10 @@ def get_pokemon_by_region_filtered(
 ):
     
 
+    # 🗂️ Level + type narrow the candidates via the indexes; region is checked on what's left
     filtered = [
-        p for p in pokedex.values()
+        p for p in query_pokedex(ptype=ptype, min_level=level, max_level=level)
         if p.get("region", "").lower() == region_name.value.lower()
-        and (level is None or p.get("level") == level)
-        and (ptype is None or p.get("Type", "").lower() == ptype.lower())
     ]
 
     if not filtered:
@@ -1,12 +1,11 @@
 from fastapi import FastAPI, HTTPException, status, Path, Query
 from pydantic import BaseModel, Field
 from enum import Enum
-from typing import Dict, Optional, List, Union
-from utils.file_handler import load_pokedex
+from typing import Optional, List, Union
+from utils.file_handler import query_pokedex
 
 app = FastAPI()
 
-pokedex: Dict[int, dict] = load_pokedex()
 
 class Region(str, Enum):
     kanto = "Kanto"
@@ -49,11 +48,8 @@ def get_pokemon_by_pokemon_level_filtered(
             detail="Minimum level cannot be greater than maximum level."
         )
 
-    filtered = [
-        p for p in pokedex.values()
-        if min_level <= p.get("level", 0) <= max_level
-        and (ptype is None or p.get("Type", "").lower() == ptype.lower())
-    ]
+    # 🗂️ Level range + type come from the Pokédex indexes
+    filtered = query_pokedex(ptype=ptype, min_level=min_level, max_level=max_level)
 
     if not filtered:
         raise HTTPException(
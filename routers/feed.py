@@ -0,0 +1,126 @@
+# routers/feed.py
+
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from auth.hybrid_auth import get_current_user
+from config import settings
+from custom_logger import info_logger
+from utils.change_feed import InvalidFeedCursorError, change_feed
+from utils.limiter_utils import limit_safe
+
+router = APIRouter(prefix="/feed", tags=["Trainer View"])
+
+# Control events after which the server ends the stream
+ENDING_EVENTS = ("overflow", "closed")
+
+CURSOR_DESCRIPTION = "Resume after this cursor (from the last event received)"
+
+
+def _dumps(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+
+
+def _sse(event: dict) -> bytes:
+    # id: lets EventSource send Last-Event-ID on reconnect → resume
+    return f"id: {event['cursor']}\nevent: {event['type']}\ndata: {_dumps(event)}\n\n".encode("utf-8")
+
+
+def _subscribe(cursor: Optional[str]):
+    try:
+        return change_feed.subscribe(cursor)
+    except InvalidFeedCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# 📡 Server-Sent Events
+# One "change" event per insert/update/delete of a Pokémon or team slot:
+#   {"type": "change", "seq": 42, "cursor": "…:42", "collection": "pokemon",
+#    "op": "update", "id": 25, "data": {...}}
+# Reconnect with Last-Event-ID (EventSource does it for you) or ?cursor= to get
+# what was missed. "reset" = refetch GET /pokemon/ and /team/, then go on;
+# "overflow" = this client fell behind, reconnect with its cursor.
+@router.get("/events", response_class=StreamingResponse)
+@limit_safe("10/minute")
+async def feed_events(
+    request: Request,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(get_current_user),
+):
+    subscription = _subscribe(last_event_id or cursor)
+    info_logger.info(f"📡 Change feed (SSE) opened by {current_user['username']}")
+
+    async def stream():
+        try:
+            yield f"retry: 3000\n: connected {change_feed.cursor(subscription.last_seq)}\n\n".encode("utf-8")
+            while True:
+                event = await subscription.next(settings.FEED_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield b": ping\n\n"
+                    continue
+                yield _sse(event)
+                if event["type"] in ENDING_EVENTS:
+                    break
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # nginx: don't buffer the stream
+    )
+
+
+# 🔌 WebSocket — same events as JSON text frames, {"type": "ping"} when idle.
+# Browsers cannot set headers on a WebSocket, so the access token may also
+# come as ?token=.
+@router.websocket("/ws")
+async def feed_websocket(
+    websocket: WebSocket,
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    token: Optional[str] = Query(None),
+):
+    scheme, _, header_token = (websocket.headers.get("authorization") or "").partition(" ")
+    try:
+        credentials = header_token if scheme.lower() == "bearer" else token
+        user = get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=credentials or ""))
+        subscription = _subscribe(cursor)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    info_logger.info(f"🔌 Change feed (WebSocket) opened by {user['username']}")
+
+    # 👂 Notice the client leaving while we wait for events
+    gone = asyncio.Event()
+
+    async def watch():
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
+            gone.set()
+            subscription.end()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        while True:
+            event = await subscription.next(settings.FEED_HEARTBEAT_SECONDS)
+            if gone.is_set():
+                break
+            await websocket.send_text(_dumps(event or {"type": "ping"}))
+            if event is not None and event["type"] in ENDING_EVENTS:
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+        watcher.cancel()
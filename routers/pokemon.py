@@ -1,103 +1,283 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
-from typing import List, Any
-from dependencies.pokedex_provider import get_pokedex_data
-from utils.file_handler import save_pokedex, load_pokedex
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Any, Optional, Tuple
+from config import settings
+from utils.file_handler import (
+    allocate_pokemon_ids_async,
+    delete_pokedex_entry_async,
+    get_pokemon_records_many_async,
+    insert_pokedex_entry_async,
+    iter_pokemon_records,
+    patch_pokedex_entry_async,
+    pokedex_stats_async,
+    pokedex_version_async,
+    pokemon_records_page_async,
+    search_pokemon_records_async,
+)
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from utils.pokedex_batch import BatchRejected, apply_operations
+from utils.pokedex_export import EXPORT_MEDIA_TYPES, accepts_gzip, csv_chunks, gzip_chunks, ndjson_chunks
+from utils.response_cache import CachedResponse, ResponseCache, etag_matches
+from utils.write_batcher import pokedex_writes
+from utils.change_feed import change_feed
 from audit_logger import log_pokemon_addition
 from custom_logger import info_logger
 from auth.hybrid_auth import get_current_user, role_required
 from utils.limiter_utils import limit_safe
-from models.pokemon_model import Pokemon, PatchPokemon
+from utils.tracing import get_tracer
+from models.pokemon_model import Pokemon, PatchPokemon, PokemonFields
+from models.pokemon_batch import CreateOperation, PokemonBatch
+from models.pokemon_record import RECORD_FIELDS, project_json, records_json
 
 
-def _poke_bc(event: str, **fields) -> None:
-    try:
-        parts = " ".join(f"{k}={repr(v)}" for k, v in fields.items())
-        print(f"[POKE_BC] {event}" + (f" {parts}" if parts else ""), flush=True)
-    except Exception as e:
-        print(f"[POKE_BC] {event} breadcrumb_error={type(e).__name__}:{e}", flush=True)
+_poke_bc = get_tracer("POKE_BC")
 
 
 router = APIRouter(prefix="/pokemon", tags=["Trainer View"])
 
-
-# ✅ GET all Pokémon
-@router.get("/", response_model=List[Pokemon], response_model_by_alias=False)
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+EXPORT_BATCH_SIZE = 500
+MAX_IDS = 200
+MISSING_IDS_HEADER = "X-Missing-Ids"
+IDS_PATTERN = r"^\d+(,\d+)*$"
+FIELDS_PATTERN = "^({0})(,({0}))*$".format("|".join(RECORD_FIELDS))
+MAX_SEARCH_RESULTS = 50
+FEED_OPS = {"create": "insert", "patch": "update", "delete": "delete"}  # batch op → change-feed op
+
+# 🧊 Encoded GET bodies per (route, query, Pokédex version). A request whose
+# If-None-Match still matches gets a 304 after one version probe — no load,
+# no validation, no serialization.
+_responses = ResponseCache(settings.RESPONSE_CACHE_ENTRIES)
+
+
+def _send_cached(request: Request, cached: CachedResponse) -> Response:
+    # no-cache: clients may keep the body but must revalidate with the ETag
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache", **cached.headers}
+
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    # "name,level,name" → ("name", "level"); None = whole records
+    return tuple(dict.fromkeys(fields.split(","))) if fields else None
+
+
+# ✅ GET all Pokémon — one page at a time
+# ⚡ Records were validated and rendered to JSON once, when they entered the
+# Pokédex cache, so these routes only stitch bytes together. response_model
+# and `responses` are for the OpenAPI docs only (PokemonFields: every field
+# optional, since ?fields= may drop any of them); returning a Response skips
+# re-validation.
+#
+# Pages come off the cache's presorted indexes (keyset, not offset): the
+# X-Next-Cursor response header is passed back as ?cursor= for the next
+# page and is absent on the last one. Without ?limit= every match is sent.
+# ?ids=1,5,9 fetches just those Pokémon (in that order) with one point
+# lookup; ids that do not exist are listed in X-Missing-Ids.
+# ?fields=name,level sends only those attributes of each Pokémon.
+# Both GET routes answer from _responses and honour If-None-Match.
+@router.get(
+    "/",
+    response_model=List[PokemonFields],
+    responses={200: {"description": "Pokémon as name, level, ptype and nickname, or only the attributes in ?fields="}},
+)
 @limit_safe("10/minute")
 async def get_all_pokemon(
     request: Request,
-    pokedex=Depends(get_pokedex_data),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Pokémon per page (default: all)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort_by: str = Query("id", pattern="^(id|name|level)$", description="Field to sort by: 'id', 'name' or 'level'"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Order of sorting: 'asc' or 'desc'"),
+    ptype: Optional[str] = Query(None, description="Only this type (case-insensitive)"),
+    min_level: Optional[int] = Query(None, ge=1, le=100, description="Minimum level (inclusive)"),
+    max_level: Optional[int] = Query(None, ge=1, le=100, description="Maximum level (inclusive)"),
+    name_prefix: Optional[str] = Query(None, min_length=1, description="Name starts with (case-insensitive)"),
+    ids: Optional[str] = Query(None, pattern=IDS_PATTERN, description=f"Comma-separated ids (max {MAX_IDS}); no paging or filters"),
+    fields: Optional[str] = Query(None, pattern=FIELDS_PATTERN, description="Comma-separated attributes to return"),
     current_user: dict = Depends(get_current_user),
 ):
     _poke_bc("POKE_LIST_ENTER", user=current_user.get("username"), role=current_user.get("role"))
 
-    result = []
+    field_names = _parse_fields(fields)
+    descending = order == "desc"
+    wanted: Tuple[int, ...] = ()
+
+    if ids is not None:
+        if limit or cursor or any(f is not None for f in (ptype, min_level, max_level, name_prefix)):
+            raise HTTPException(status_code=400, detail="ids cannot be combined with paging or filters")
+        wanted = tuple(dict.fromkeys(int(pid) for pid in ids.split(",")))
+        if len(wanted) > MAX_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_IDS} ids per request")
 
     try:
-        _poke_bc(
-            "POKE_LIST_SOURCE_READY",
-            pokedex_type=type(pokedex).__name__,
-            pokedex_len=len(pokedex) if hasattr(pokedex, "__len__") else None,
+        after = decode_cursor(cursor, sort_by, descending) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    version = await pokedex_version_async()
+    if ids is not None:
+        key = ("ids", wanted, field_names)
+    else:
+        key = ("list", limit, cursor, sort_by, order, ptype, min_level, max_level, name_prefix, field_names)
+
+    cached = _responses.get(key, version)
+    if cached is not None:
+        _poke_bc("POKE_LIST_CACHED", etag=cached.etag)
+        return _send_cached(request, cached)
+
+    headers = {}
+
+    if ids is not None:
+        found = await get_pokemon_records_many_async(wanted)
+        page = [(pid, found[pid]) for pid in wanted if pid in found]
+        missing = [str(pid) for pid in wanted if pid not in found]
+        if missing:
+            headers[MISSING_IDS_HEADER] = ",".join(missing)
+    else:
+        page, next_after = await pokemon_records_page_async(
+            sort_by=sort_by,
+            descending=descending,
+            after=after,
+            limit=limit,
+            ptype=ptype,
+            min_level=min_level,
+            max_level=max_level,
+            name_prefix=name_prefix,
         )
+        if next_after is not None:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_by, descending, next_after)
+
+    for pid, record in page:
+        if isinstance(record, Exception):
+            _poke_bc("POKE_LIST_ITEM_ERR", pid=pid, err_type=type(record).__name__, err=str(record))
+            raise HTTPException(
+                status_code=500,
+                detail=f"Pokémon list failed at id {pid}: {type(record).__name__}: {record}",
+            )
+
+    _poke_bc("POKE_LIST_OK", count=len(page), more=NEXT_CURSOR_HEADER in headers)
+    body = records_json((record for _pid, record in page), field_names)
+    return _send_cached(request, _responses.put(key, version, body, headers))
+
+
+# 📊 Pokédex stats — registered before /{pokemon_id}
+# Served from running totals the index keeps on every insert/patch/delete,
+# so the cost does not depend on the size of the Pokédex.
+@router.get("/stats")
+@limit_safe("10/minute")
+async def pokedex_stats(request: Request, current_user: dict = Depends(get_current_user)):
+    version = await pokedex_version_async()
+    key = ("stats",)
 
-        for pid, data in pokedex.items():
-            try:
-                _poke_bc("POKE_LIST_ITEM_BEGIN", pid=pid, raw=data)
-
-                if not isinstance(data, dict):
-                    raise TypeError(f"Entry for pid {pid} is not a dict")
-
-                fixed_data = data.copy()
-
-                # Always normalize id
-                fixed_data["id"] = int(fixed_data.get("id", pid))
-
-                # Support both old and new naming styles
-                if "name" not in fixed_data and "poke_name" in fixed_data:
-                    fixed_data["name"] = fixed_data.get("poke_name")
-                if "poke_name" not in fixed_data and "name" in fixed_data:
-                    fixed_data["poke_name"] = fixed_data.get("name")
-
-                # Normalize nickname
-                fixed_data["nickname"] = fixed_data.get("nickname") or None
-
-                # Normalize level if it came as text
-                if fixed_data.get("level") is not None:
-                    fixed_data["level"] = int(fixed_data["level"])
-
-                pokemon = Pokemon.model_validate(fixed_data)
-                result.append(pokemon)
-
-                _poke_bc("POKE_LIST_ITEM_OK", pid=pid, normalized=fixed_data)
-
-            except Exception as e:
-                _poke_bc(
-                    "POKE_LIST_ITEM_ERR",
-                    pid=pid,
-                    raw=data,
-                    err_type=type(e).__name__,
-                    err=str(e),
-                )
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Pokémon list failed at id {pid}: {type(e).__name__}: {e}",
-                )
-
-        _poke_bc("POKE_LIST_OK", count=len(result))
-        return result
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        _poke_bc("POKE_LIST_ERR", err_type=type(e).__name__, err=str(e))
-        raise HTTPException(status_code=500, detail="Pokémon list crash")
-    
+    cached = _responses.get(key, version)
+    if cached is not None:
+        return _send_cached(request, cached)
+
+    stats = await pokedex_stats_async()
+
+    _poke_bc("POKE_STATS_OK", count=stats["count"])
+    body = json.dumps(stats, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _send_cached(request, _responses.put(key, version, body))
+
+
+# 🔍 Fuzzy name search — registered before /{pokemon_id}
+# Ranked by trigram similarity over name / poke_name / nickname (typos and
+# partial names still match). Only the best `limit` hits are kept, so the
+# cost does not grow with how many Pokémon match.
+@router.get("/search")
+@limit_safe("30/minute")
+async def search_pokemon(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=50, description="Name or nickname, typos allowed"),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS, description="Best matches to return"),
+    min_score: float = Query(0.2, ge=0, le=1, description="Minimum similarity (0–1)"),
+    current_user: dict = Depends(get_current_user),
+):
+    version = await pokedex_version_async()
+    key = ("search", q.casefold(), limit, min_score)
+
+    cached = _responses.get(key, version)
+    if cached is not None:
+        return _send_cached(request, cached)
+
+    hits = await search_pokemon_records_async(q, k=limit, min_score=min_score)
+
+    parts = []
+    for score, pid, record in hits:
+        if isinstance(record, Exception):
+            _poke_bc("POKE_SEARCH_ITEM_ERR", pid=pid, err_type=type(record).__name__, err=str(record))
+            continue  # a ranked list can live without one broken entry
+        # {"id": .., "score": .., <pre-rendered record fields>}
+        parts.append(b'{"id":%d,"score":%.4f,%s' % (pid, score, record.body[1:]))
 
+    _poke_bc("POKE_SEARCH_OK", q=q, hits=len(parts))
+    return _send_cached(request, _responses.put(key, version, b"[" + b",".join(parts) + b"]"))
 
-@router.get("/{pokemon_id}", response_model=Pokemon, response_model_by_alias=False)
+
+# 📤 Streaming export (NDJSON or CSV) — registered before /{pokemon_id}
+# Rows are encoded one keyset page at a time and sent chunked, so memory
+# stays flat however big the Pokédex is. gzip when the client accepts it.
+@router.get("/export", response_class=StreamingResponse)
+@limit_safe("5/minute")
+async def export_pokemon(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="'ndjson' or 'csv'"),
+    ptype: Optional[str] = Query(None, description="Only this type (case-insensitive)"),
+    min_level: Optional[int] = Query(None, ge=1, le=100, description="Minimum level (inclusive)"),
+    max_level: Optional[int] = Query(None, ge=1, le=100, description="Maximum level (inclusive)"),
+    name_prefix: Optional[str] = Query(None, min_length=1, description="Name starts with (case-insensitive)"),
+    current_user: dict = Depends(get_current_user),
+):
+    _poke_bc("POKE_EXPORT_BEGIN", user=current_user.get("username"), fmt=fmt)
+
+    def batches():
+        exported = 0
+        for batch in iter_pokemon_records(
+            batch_size=EXPORT_BATCH_SIZE,
+            ptype=ptype,
+            min_level=min_level,
+            max_level=max_level,
+            name_prefix=name_prefix,
+        ):
+            valid = []
+            for pid, record in batch:
+                # Headers are already out: bad entries are left out, not a 500
+                if isinstance(record, Exception):
+                    _poke_bc("POKE_EXPORT_ITEM_ERR", pid=pid, err_type=type(record).__name__, err=str(record))
+                else:
+                    valid.append((pid, record))
+            exported += len(valid)
+            yield valid
+        _poke_bc("POKE_EXPORT_OK", fmt=fmt, count=exported)
+
+    chunks = ndjson_chunks(batches()) if fmt == "ndjson" else csv_chunks(batches())
+    headers = {
+        "Content-Disposition": f'attachment; filename="pokedex.{fmt}"',
+        "Vary": "Accept-Encoding",
+    }
+
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+
+    # Sync generator: Starlette pulls it in a worker thread, off the event loop
+    return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES[fmt], headers=headers)
+
+
+@router.get(
+    "/{pokemon_id}",
+    response_model=PokemonFields,
+    responses={200: {"description": "The Pokémon as name, level, ptype and nickname, or only the attributes in ?fields="}},
+)
 async def get_pokemon_by_id(
     request: Request,
     pokemon_id: int,
-    pokedex=Depends(get_pokedex_data),
+    fields: Optional[str] = Query(None, pattern=FIELDS_PATTERN, description="Comma-separated attributes to return"),
     current_user: dict = Depends(get_current_user),
 ):
     _poke_bc(
@@ -107,55 +287,32 @@ async def get_pokemon_by_id(
         role=current_user.get("role"),
     )
 
-    try:
-        lookup_key = None
-        if pokemon_id in pokedex:
-            lookup_key = pokemon_id
-        elif str(pokemon_id) in pokedex:
-            lookup_key = str(pokemon_id)
-
-        _poke_bc(
-            "POKE_GET_BY_ID_LOOKUP",
-            pokemon_id=pokemon_id,
-            pokedex_keys=list(pokedex.keys())[:20] if hasattr(pokedex, "keys") else None,
-            resolved_key=lookup_key,
-        )
-
-        if lookup_key is None:
-            raise HTTPException(status_code=404, detail="Pokemon not found")
+    version = await pokedex_version_async()
+    field_names = _parse_fields(fields)
+    key = ("item", pokemon_id, field_names)
 
-        data = pokedex[lookup_key]
-        if not isinstance(data, dict):
-            raise TypeError(f"Entry for pokemon_id {pokemon_id} is not a dict")
+    cached = _responses.get(key, version)
+    if cached is not None:
+        return _send_cached(request, cached)
 
-        fixed_data = data.copy()
-        fixed_data["id"] = int(fixed_data.get("id", pokemon_id))
+    # 🎯 Point lookup — no full Pokédex load when the cache is cold
+    record = (await get_pokemon_records_many_async([pokemon_id])).get(pokemon_id)
 
-        if "name" not in fixed_data and "poke_name" in fixed_data:
-            fixed_data["name"] = fixed_data.get("poke_name")
-        if "poke_name" not in fixed_data and "name" in fixed_data:
-            fixed_data["poke_name"] = fixed_data.get("name")
-
-        fixed_data["nickname"] = fixed_data.get("nickname") or None
-
-        if fixed_data.get("level") is not None:
-            fixed_data["level"] = int(fixed_data["level"])
-
-        pokemon = Pokemon.model_validate(fixed_data)
-
-        _poke_bc("POKE_GET_BY_ID_OK", pokemon_id=pokemon_id, normalized=fixed_data)
-        return pokemon
+    if record is None:
+        raise HTTPException(status_code=404, detail="Pokemon not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
+    if isinstance(record, Exception):
         _poke_bc(
             "POKE_GET_BY_ID_ERR",
             pokemon_id=pokemon_id,
-            err_type=type(e).__name__,
-            err=str(e),
+            err_type=type(record).__name__,
+            err=str(record),
         )
-        raise HTTPException(status_code=500, detail=f"Pokemon fetch failed: {type(e).__name__}: {e}")
+        raise HTTPException(status_code=500, detail=f"Pokemon fetch failed: {type(record).__name__}: {record}")
+
+    _poke_bc("POKE_GET_BY_ID_OK", pokemon_id=pokemon_id)
+    body = project_json(record, field_names) if field_names else record.body
+    return _send_cached(request, _responses.put(key, version, body))
     
 
 # ✅ ADD new Pokémon
@@ -165,21 +322,30 @@ async def add_pokemon(
     request: Request,
     pokemon: Pokemon,
     background_tasks: BackgroundTasks,
-    pokedex=Depends(get_pokedex_data),
     current_user: str = Depends(role_required("admin"))
 ):
-    new_id = max([int(k) for k in pokedex.keys()], default=0) + 1
     model_dump = pokemon.model_dump()
 
     # 🧹 Remove None nicknames for cleanliness
     if model_dump.get("nickname") is None:
         model_dump.pop("nickname", None)
 
+    # 🔢 Persistent ID counter — no max() over the Pokédex, no collisions between adds
+    new_id = await allocate_pokemon_ids_async()
     model_dump["id"] = new_id
-    pokedex[str(new_id)] = model_dump
-    print("🐛 Final Pokedex (before saving):", pokedex)
 
-    save_pokedex(pokedex)
+    if pokedex_writes.enabled:
+        # 🧺 Coalesced write
+        def add(current):
+            current[new_id] = dict(model_dump)
+
+        await pokedex_writes.submit(add)
+    else:
+        # 💾 Only the new entry is written, not the whole Pokédex
+        await insert_pokedex_entry_async(new_id, model_dump)
+    _poke_bc("POKE_ADD_OK", pokemon_id=new_id, name=pokemon.name)
+    change_feed.publish("pokemon", "insert", new_id, model_dump)
+
     background_tasks.add_task(log_pokemon_addition, current_user, pokemon.name, new_id)
 
     return {
@@ -191,6 +357,49 @@ async def add_pokemon(
         }
     }
 
+# 📦 BATCH create / patch / delete
+# All operations are checked and applied to one loaded Pokédex, then saved
+# with a single write (compare-and-swap, like save_pokedex). One failing
+# operation rejects the whole batch and nothing is saved.
+@router.post("/batch", status_code=status.HTTP_200_OK)
+@limit_safe("5/minute")
+async def batch_pokemon(
+    request: Request,
+    batch: PokemonBatch,
+    background_tasks: BackgroundTasks,
+    current_user: str = Depends(role_required("admin"))
+):
+    operations = batch.operations
+    creates = sum(1 for operation in operations if isinstance(operation, CreateOperation))
+
+    # 🔢 One id block for every create (ids of a rejected batch are not reused)
+    first_id = await allocate_pokemon_ids_async(creates) if creates else 0
+    new_ids = iter(range(first_id, first_id + creates))
+
+    try:
+        results = await pokedex_writes.submit(lambda current: apply_operations(current, operations, new_ids))
+    except BatchRejected as e:
+        _poke_bc("POKE_BATCH_REJECTED", size=len(operations), reason=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": str(e), "results": e.results},
+        )
+
+    _poke_bc("POKE_BATCH_OK", size=len(operations), created=creates)
+    info_logger.info(f"📦 Batch of {len(operations)} operations applied by {current_user}")
+
+    for result in results:
+        data = None if result["op"] == "delete" else result["data"]
+        change_feed.publish("pokemon", FEED_OPS[result["op"]], result["id"], data)
+        if result["op"] == "create":
+            background_tasks.add_task(log_pokemon_addition, current_user, result["data"]["name"], result["id"])
+
+    return {
+        "Message": f"{len(operations)} operations applied by {current_user}!",
+        "Data": results,
+    }
+
+
 # ✅ PATCH Pokémon
 @router.patch("/{pokemon_id}", status_code=status.HTTP_200_OK)
 @limit_safe("5/minute")
@@ -198,34 +407,37 @@ async def update_pokemon(
     request: Request,
     pokemon_id: int,
     updated_data: PatchPokemon,
-    pokedex=Depends(get_pokedex_data),
     current_user: str = Depends(role_required("admin"))
 ):
-    lookup_key = None
-    if pokemon_id in pokedex:
-        lookup_key = pokemon_id
-    elif str(pokemon_id) in pokedex:
-        lookup_key = str(pokemon_id)
-
-    print("🧠 PATCH lookup ID:", pokemon_id)
-    print("🧠 Current pokedex keys:", list(pokedex.keys()))
-    print("🧠 PATCH resolved key:", lookup_key)
-
-    if lookup_key is None:
-        raise HTTPException(status_code=404, detail="Pokemon not found")
-
-    pokemon = pokedex[lookup_key]
-
-    # 🛠️ Apply partial updates
+    # 🛠️ Collect partial updates — only these fields are sent to storage
+    updates = {}
     if updated_data.level is not None:
-        pokemon["level"] = updated_data.level
+        updates["level"] = updated_data.level
     if updated_data.ptype is not None:
-        pokemon["ptype"] = updated_data.ptype
+        updates["ptype"] = updated_data.ptype
     if updated_data.nickname is not None:
-        pokemon["nickname"] = updated_data.nickname
+        updates["nickname"] = updated_data.nickname
+
+    if pokedex_writes.enabled:
+        def patch(current):
+            if pokemon_id not in current:
+                return None
+            merged = {**current[pokemon_id], **updates}
+            if merged.get("nickname") in (None, ""):
+                merged.pop("nickname", None)  # 🧹 Blank nickname clears it, same as the point op
+            current[pokemon_id] = merged
+            return dict(merged)
+
+        pokemon = await pokedex_writes.submit(patch)
+    else:
+        pokemon = await patch_pokedex_entry_async(pokemon_id, updates)
+    _poke_bc("POKE_PATCH_RESULT", pokemon_id=pokemon_id, fields=sorted(updates), found=pokemon is not None)
+
+    if pokemon is None:
+        raise HTTPException(status_code=404, detail="Pokemon not found")
 
-    save_pokedex(pokedex)
     info_logger.info(f"✏️ '{pokemon['name']}' [ID {pokemon_id}] updated by {current_user}")
+    change_feed.publish("pokemon", "update", pokemon_id, {"id": pokemon_id, **pokemon})
 
     return {
         "Message": f"{pokemon['name']} updated by {current_user}!",
@@ -241,26 +453,19 @@ async def update_pokemon(
 async def delete_pokemon(
     request: Request,
     pokemon_id: int,
-    pokedex=Depends(get_pokedex_data),
     current_user: str = Depends(role_required("admin"))
 ):
-    lookup_key = None
-    if pokemon_id in pokedex:
-        lookup_key = pokemon_id
-    elif str(pokemon_id) in pokedex:
-        lookup_key = str(pokemon_id)
+    if pokedex_writes.enabled:
+        deleted = await pokedex_writes.submit(lambda current: current.pop(pokemon_id, None))
+    else:
+        deleted = await delete_pokedex_entry_async(pokemon_id)
+    _poke_bc("POKE_DELETE_RESULT", pokemon_id=pokemon_id, found=deleted is not None)
 
-    print("🧠 DELETE lookup ID:", pokemon_id)
-    print("🧠 Current pokedex keys:", list(pokedex.keys()))
-    print("🧠 DELETE resolved key:", lookup_key)
-
-    if lookup_key is None:
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Pokemon not found")
 
-    deleted = pokedex.pop(lookup_key)
-    save_pokedex(pokedex)
-
     info_logger.info(f"🗑️ '{deleted['name']}' [ID {pokemon_id}] deleted by {current_user}")
+    change_feed.publish("pokemon", "delete", pokemon_id)
 
     return {
         "Message": f"{deleted['name']} deleted by {current_user}!",
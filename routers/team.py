@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List, Dict, Optional
 from auth.security import verify_token
-from utils.team_handler import load_team, save_team
+from utils.team_handler import load_team_async
+from utils.write_batcher import team_writes
+from utils.change_feed import change_feed
+from utils.db_json_store import DocumentConflictError
 from dependencies.pokedex_provider import get_team_pokedex_data
 from pydantic import BaseModel, Field
 from custom_logger import info_logger, error_logger
@@ -15,7 +18,7 @@ router = APIRouter(prefix="/team", tags=["Gym Battle Team"])
 @limit_safe("5/minute")  
 async def get_team(request: Request, current_user: str = Depends(verify_token)):
     try:
-        team = load_team()
+        team = await load_team_async()
         return list(team.values())
     except HTTPException as e:
         raise e
@@ -33,24 +36,28 @@ async def add_to_team(
     current_user: str = Depends(verify_token)
 ):
     try:
-        team = load_team()
-
         if pokemon_id not in pokedex:
             raise HTTPException(status_code=404, detail=f"Invalid ID {pokemon_id}! Pokémon not found in Pokédex.")
 
-        if str(pokemon_id) in team:
-            raise HTTPException(status_code=409, detail=f"Invalid ID {pokemon_id}! Pokémon already in the team.")
+        def add(team):
+            if str(pokemon_id) in team:
+                raise HTTPException(status_code=409, detail=f"Invalid ID {pokemon_id}! Pokémon already in the team.")
+
+            if len(team) >= 6:
+                raise HTTPException(status_code=400, detail="Team Full! Maximum six Pokémon allowed.")
 
-        if len(team) >= 6:
-            raise HTTPException(status_code=400, detail="Team Full! Maximum six Pokémon allowed.")
+            team[str(pokemon_id)] = pokedex[pokemon_id]
+            return [dict(p) for p in team.values()]
 
-        team[str(pokemon_id)] = pokedex[pokemon_id]
-        save_team(team)
+        team_list = await team_writes.submit(add)
+        change_feed.publish("team", "insert", pokemon_id, dict(pokedex[pokemon_id]))
 
-        return {"Message": "Pokémon added to your team.", "Team": list(team.values())}
+        return {"Message": "Pokémon added to your team.", "Team": team_list}
 
     except HTTPException as e:
         raise e
+    except DocumentConflictError:
+        raise  # ⚔️ Handled globally → 409
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -64,21 +71,25 @@ async def remove_from_team(
     current_user: str = Depends(verify_token)
 ):
     try:
-        team = load_team()
         pid = str(pokemon_id)
 
-        if pid not in team:
-            error_logger.error(f"❌ Remove failed by {current_user} – ID {pid} not in team")
-            raise HTTPException(status_code=404, detail=f"Cannot remove! Pokémon ID {pid} is not in your team.")
+        def remove(team):
+            if pid not in team:
+                error_logger.error(f"❌ Remove failed by {current_user} – ID {pid} not in team")
+                raise HTTPException(status_code=404, detail=f"Cannot remove! Pokémon ID {pid} is not in your team.")
 
-        removed = team.pop(pid)
-        save_team(team)
+            return team.pop(pid), [dict(p) for p in team.values()]
+
+        removed, team_list = await team_writes.submit(remove)
+        change_feed.publish("team", "delete", pokemon_id)
 
         info_logger.info(f"❌ {removed.get('poke_name') or removed.get('name')} [ID {pid}] removed from team by {current_user}")
-        return {"Message": f"Pokémon {removed.get('poke_name') or removed.get('name')} removed from your team.", "Team": list(team.values())}
+        return {"Message": f"Pokémon {removed.get('poke_name') or removed.get('name')} removed from your team.", "Team": team_list}
 
     except HTTPException as e:
         raise e
+    except DocumentConflictError:
+        raise  # ⚔️ Handled globally → 409
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,7 +99,7 @@ async def remove_from_team(
 @limit_safe("10/minute") 
 async def average_team_level(request: Request, current_user: str = Depends(verify_token)):
     try:
-        team = load_team()
+        team = await load_team_async()
 
         if not team:
             error_logger.error(f"❌ Average level check failed by {current_user} – Team is empty")
@@ -123,25 +134,28 @@ async def upgrade_pokemon(
     current_user: str = Depends(verify_token)
 ):
     try:
-        team = load_team()
         pid = str(pokemon_id)
 
-        if pid not in team:
-            error_logger.error(f"❌ Upgrade failed by {current_user} – ID {pid} not in team")
-            raise HTTPException(status_code=404, detail=f"Pokémon ID {pid} is not in your team.")
+        def upgrade(team):
+            if pid not in team:
+                error_logger.error(f"❌ Upgrade failed by {current_user} – ID {pid} not in team")
+                raise HTTPException(status_code=404, detail=f"Pokémon ID {pid} is not in your team.")
+
+            pokemon = team[pid]
+            changes = []
 
-        pokemon = team[pid]
-        changes = []
+            if updates.level is not None:
+                pokemon["level"] = int(updates.level)
+                changes.append(f"Level {updates.level}")
+            if updates.nickname is not None:
+                pokemon["nickname"] = updates.nickname
+                changes.append(f"Nickname '{updates.nickname}'")
 
-        if updates.level is not None:
-            pokemon["level"] = int(updates.level)
-            changes.append(f"Level {updates.level}")
-        if updates.nickname is not None:
-            pokemon["nickname"] = updates.nickname
-            changes.append(f"Nickname '{updates.nickname}'")
+            team[pid] = pokemon
+            return dict(pokemon), changes
 
-        team[pid] = pokemon
-        save_team(team)
+        pokemon, changes = await team_writes.submit(upgrade)
+        change_feed.publish("team", "update", pokemon_id, pokemon)
 
         change_str = ", ".join(changes) if changes else "No changes"
         info_logger.info(f"🔧 {pokemon.get('poke_name') or pokemon.get('name')} [ID {pid}] upgraded by {current_user}: {change_str}")
@@ -150,5 +164,7 @@ async def upgrade_pokemon(
 
     except HTTPException as e:
         raise e
+    except DocumentConflictError:
+        raise  # ⚔️ Handled globally → 409
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
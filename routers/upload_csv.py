@@ -6,7 +6,8 @@ from custom_logger import info_logger, error_logger
 from utils.limiter_utils import limit_safe  # 🧪 Auto-disables during tests
 import csv
 from io import StringIO
-from utils.file_handler import load_pokedex, save_pokedex
+from utils.file_handler import allocate_pokemon_ids, load_pokedex, save_pokedex
+from utils.change_feed import change_feed
 
 router = APIRouter(tags=["Admin Actions"])
 
@@ -48,14 +49,21 @@ def upload_csv(
         )
 
     # 🔄 Step 3: Load Pokédex and add new Pokémon
+    rows = list(csv_reader)
     pokedex = load_pokedex()
     added = []
+    inserted = []  # (id, entry) for the change feed
 
-    for row in csv_reader:
+    # 🔢 One contiguous block of IDs for the whole file (no max() per row)
+    next_id = allocate_pokemon_ids(len(rows)) if rows else 1
+
+    for row in rows:
         try:
-            new_id = max(pokedex.keys(), default=0) + 1
+            new_id = next_id
+            next_id += 1
             pokedex[new_id] = row
             added.append(row.get("name", "Unknown"))
+            inserted.append((new_id, row))
         except Exception as e:
             error_logger.warning(f"⚠️ Skipped malformed row in '{file.filename}': {row} | Error: {e}")
             continue
@@ -63,6 +71,10 @@ def upload_csv(
     # 💾 Step 4: Save updates
     save_pokedex(pokedex)
 
+    # 📡 Announce the new rows on the change feed
+    for new_id, row in inserted:
+        change_feed.publish("pokemon", "insert", new_id, row)
+
     info_logger.info(
         f"📊 Trainer '{user['username']}' uploaded CSV '{file.filename}' → "
         f"{len(added)} Pokémon added: {added}"
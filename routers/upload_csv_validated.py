@@ -1,6 +1,8 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Request
 from auth.hybrid_auth import role_required  # 🔐 Role-based access control
 from utils.file_handler import load_pokedex, save_pokedex
+from utils.db_json_store import DocumentConflictError, run_in_store_executor
+from utils.change_feed import change_feed
 from custom_logger import info_logger, error_logger  # ✅ Loggers
 from utils.file_utils import validate_file_upload  # 🔐 Security validation
 from utils.limiter_utils import limit_safe  # ✅ Import safe limiter for test bypass
@@ -27,11 +29,12 @@ async def import_pokedex_csv(
         csv_reader = csv.DictReader(StringIO(decoded))
 
         # 🔄 Step 3: Load and process each row
-        pokedex = load_pokedex()
+        pokedex = await run_in_store_executor(load_pokedex)
         added = 0
         failed = 0
         duplicate_skipped = 0
         failed_details = []
+        inserted = []  # (id, entry) for the change feed
 
         for row in csv_reader:
             try:
@@ -60,6 +63,7 @@ async def import_pokedex_csv(
 
                 # ✅ Add to Pokédex
                 pokedex[poke_id] = {"name": name, "type": ptype, "level": level}
+                inserted.append((poke_id, pokedex[poke_id]))
                 added += 1
 
             except Exception as e:
@@ -70,7 +74,11 @@ async def import_pokedex_csv(
                 )
 
         # 💾 Save Pokédex
-        save_pokedex(pokedex)
+        await run_in_store_executor(save_pokedex, pokedex)
+
+        # 📡 Announce the new rows on the change feed
+        for poke_id, entry in inserted:
+            change_feed.publish("pokemon", "insert", poke_id, entry)
 
         # 📜 Log results
         info_logger.info(
@@ -87,8 +95,8 @@ async def import_pokedex_csv(
             "total_in_pokedex": len(pokedex)
         }
 
-    except HTTPException:
-        raise  # ✅ Pass through known exceptions
+    except (HTTPException, DocumentConflictError):
+        raise  # ✅ Pass through known exceptions (conflicts → 409)
 
     except Exception as e:
         error_logger.error(f"❌ Critical CSV parsing failure by {current_user}: {e}")
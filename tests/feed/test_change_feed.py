@@ -0,0 +1,160 @@
+# tests/feed/test_change_feed.py
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from core_app import core_app as app
+from utils.change_feed import ChangeFeed, InvalidFeedCursorError, change_feed
+from utils.file_handler import save_pokedex
+from utils.team_handler import save_team
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire"},
+}
+
+
+def _token(username, password):
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    return res.json()["access_token"]
+
+
+async def _drain(subscription, count):
+    return [await subscription.next(timeout=1) for _ in range(count)]
+
+
+# ⏩ A cursor replays exactly the missed events; stale or foreign cursors reset
+def test_resume_from_cursor():
+    async def scenario():
+        feed = ChangeFeed(retention=3, buffer=10)
+        first = feed.publish("pokemon", "insert", 1, {"name": "Bulbasaur"})
+        for pid in (2, 3):
+            feed.publish("pokemon", "insert", pid)
+
+        resumed = feed.subscribe(feed.cursor(first))
+        assert [e["id"] for e in await _drain(resumed, 2)] == [2, 3]
+
+        feed.publish("pokemon", "delete", 2)
+        live = await resumed.next(timeout=1)
+        assert (live["seq"], live["op"]) == (4, "delete")
+
+        stale = feed.subscribe(feed.cursor(0))  # seq 1 already left the ring
+        foreign = feed.subscribe("deadbeef:4")  # another process / restart
+        assert (await stale.next(timeout=1))["type"] == "reset"
+        assert (await foreign.next(timeout=1))["type"] == "reset"
+
+        with pytest.raises(InvalidFeedCursorError):
+            feed.subscribe("not-a-cursor")
+
+    asyncio.run(scenario())
+
+
+# 🐢 A client that falls behind is cut off, then catches up from its cursor
+def test_slow_client_overflow():
+    async def scenario():
+        feed = ChangeFeed(retention=100, buffer=2)
+        slow = feed.subscribe()
+        for pid in range(1, 6):
+            feed.publish("pokemon", "insert", pid)
+        await asyncio.sleep(0)  # let the loop deliver
+
+        cut = await slow.next(timeout=1)
+        assert cut["type"] == "overflow"
+        assert [event async for event in slow] == []  # stream is over
+        assert feed.feed_stats()["clients"] == 0
+
+        again = feed.subscribe(cut["cursor"])
+        assert [e["id"] for e in await _drain(again, 5)] == [1, 2, 3, 4, 5]
+
+    asyncio.run(scenario())
+
+
+# 🔌 WebSocket clients see Pokédex and team writes, in seq order
+def test_websocket_receives_route_changes():
+    save_pokedex(DEX)
+    save_team({})
+    admin = {"Authorization": f"Bearer {_token('professoroak', 'pallet123')}"}
+    trainer = _token("ashketchum", "pikapika")
+
+    with client.websocket_connect(f"/feed/ws?token={trainer}") as ws:
+        client.patch("/pokemon/4", json={"level": 16}, headers=admin)
+        client.delete("/pokemon/1", headers=admin)
+        added = client.post("/pokemon/", json={"poke_name": "Eevee", "level": 12, "ptype": "Normal"}, headers=admin)
+        client.post("/team/4", headers={"Authorization": f"Bearer {trainer}"})
+
+        events = [ws.receive_json() for _ in range(4)]
+
+    assert [(e["collection"], e["op"], e["id"]) for e in events] == [
+        ("pokemon", "update", 4),
+        ("pokemon", "delete", 1),
+        ("pokemon", "insert", added.json()["Data"]["id"]),
+        ("team", "insert", 4),
+    ]
+    assert events[0]["data"]["level"] == 16
+    assert [e["seq"] for e in events] == sorted({e["seq"] for e in events})
+
+
+# 🔐 No token or a malformed cursor → closed before the handshake completes
+def test_websocket_rejects_bad_requests():
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/feed/ws"):
+            pass
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/feed/ws?token={_token('ashketchum', 'pikapika')}&cursor=bogus"):
+            pass
+
+
+# 📡 SSE frames carry the cursor as id:, and Last-Event-ID resumes
+def test_sse_stream_and_resume():
+    token = _token("ashketchum", "pikapika")
+
+    async def open_stream(last_event_id=None):
+        headers = [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())]
+        if last_event_id:
+            headers.append((b"last-event-id", last_event_id.encode()))
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/feed/events", "raw_path": b"/feed/events", "query_string": b"",
+            "root_path": "", "headers": headers, "client": ("127.0.0.1", 5000), "server": ("testserver", 80),
+        }
+        body = []
+        requested = asyncio.Event()
+
+        async def receive():
+            if not requested.is_set():
+                requested.set()
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()  # client stays connected
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        task = asyncio.create_task(app(scope, receive, send))
+        while not body:  # ": connected" comment → subscribed
+            await asyncio.sleep(0.01)
+        return task, body
+
+    async def scenario():
+        task, body = await open_stream()
+        first = change_feed.cursor(change_feed.publish("pokemon", "insert", 150, {"name": "Mewtwo"}))
+        change_feed.publish("pokemon", "delete", 150)
+
+        resumed_task, resumed = await open_stream(last_event_id=first)
+        await asyncio.sleep(0.05)
+        change_feed.close()
+        await asyncio.wait_for(asyncio.gather(task, resumed_task), timeout=5)
+        return b"".join(body).decode(), b"".join(resumed).decode()
+
+    stream, resumed = asyncio.run(scenario())
+
+    assert "event: change\n" in stream and f"id: {change_feed.epoch}:" in stream
+    assert '"op":"insert","id":150' in stream and '"op":"delete","id":150' in stream
+    assert stream.rstrip().splitlines()[-2] == "event: closed"
+    assert '"op":"insert"' not in resumed and '"op":"delete","id":150' in resumed
@@ -0,0 +1,43 @@
+# tests/pokemon/test_pokedex_cache.py
+
+from config import settings
+from utils.file_handler import (
+    POKEDEX_PATH,
+    load_pokedex_cached,
+    pokedex_cache_stats,
+    save_pokedex,
+)
+
+
+# ✅ Repeated reads reuse the same normalized dict
+def test_cached_reads_reuse_normalized_pokedex():
+    first = load_pokedex_cached()
+    hits_before = pokedex_cache_stats()["hits"]
+
+    second = load_pokedex_cached()
+
+    assert second is first
+    assert pokedex_cache_stats()["hits"] == hits_before + 1
+
+
+# ✅ save_pokedex invalidates the cache
+def test_save_invalidates_cache():
+    before = load_pokedex_cached()
+    assert 1 in before
+
+    save_pokedex({"2": {"name": "Ivysaur", "level": 16, "ptype": "Grass", "id": 2}})
+    after = load_pokedex_cached()
+
+    assert after is not before
+    assert list(after.keys()) == [2]
+
+
+# ✅ Writes by another process (file edited directly) are picked up
+def test_external_file_change_is_detected(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "file")
+    load_pokedex_cached()
+
+    with open(POKEDEX_PATH, "w", encoding="utf-8") as f:
+        f.write('{"7": {"name": "Squirtle", "level": 10, "ptype": "Water", "id": 7}}\n')
+
+    assert list(load_pokedex_cached().keys()) == [7]
@@ -0,0 +1,127 @@
+# tests/pokemon/test_pokedex_index.py
+
+from utils.file_handler import (
+    delete_pokedex_entry,
+    insert_pokedex_entry,
+    load_pokedex_cached,
+    patch_pokedex_entry,
+    pokedex_cache_stats,
+    pokemon_records_page,
+    query_pokedex,
+    save_pokedex,
+)
+from utils.pokedex_index import PokedexIndex
+from utils.storage_backends import get_backend
+
+DEX = {
+    1: {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1},
+    4: {"name": "Charmander", "level": 8, "ptype": "Fire", "id": 4},
+    5: {"name": "Charmeleon", "level": 16, "ptype": "Fire", "id": 5},
+    6: {"name": "Charizard", "level": 36, "ptype": "Fire", "id": 6},
+    7: {"name": "Squirtle", "level": 10, "ptype": "Water", "id": 7},
+}
+
+
+def _names(entries):
+    return [p["name"] for p in entries]
+
+
+# 🔎 Type, level range and name prefix combine; results come back in id order
+def test_filters_combine():
+    index = PokedexIndex(dict(DEX))
+
+    assert _names(index.filter(ptype="fire")) == ["Charmander", "Charmeleon", "Charizard"]
+    assert index.filter_ids(min_level=8, max_level=16) == [4, 5, 7]
+    assert _names(index.filter(name_prefix="CHAR", min_level=10)) == ["Charmeleon", "Charizard"]
+    assert index.filter(ptype="water", max_level=5) == []
+    assert index.filter_ids() == [1, 4, 5, 6, 7]
+
+
+# ✏️ upsert/remove keep every index in step without a rebuild
+def test_incremental_updates():
+    index = PokedexIndex(dict(DEX))
+    snapshot = index.snapshot()
+
+    index.upsert(4, {**DEX[4], "level": 40, "ptype": "Dragon"})
+    index.remove(7)
+    index.upsert(25, {"name": "Pikachu", "level": 12, "ptype": "Electric", "id": 25})
+
+    assert index.filter_ids(ptype="fire") == [5, 6]
+    assert index.filter_ids(ptype="dragon", min_level=40) == [4]
+    assert index.filter_ids(name_prefix="squ") == []
+    assert index.filter_ids(min_level=10, max_level=12) == [25]
+
+    # Readers holding the old snapshot are unaffected
+    assert 7 in snapshot and 25 not in snapshot
+    assert 7 not in index.snapshot() and 25 in index.snapshot()
+
+
+# 📏 A point write edits the live dicts; nothing copies the whole Pokédex
+def test_point_writes_do_not_copy(monkeypatch):
+    index = PokedexIndex(dict(DEX), record=lambda pid, entry: pid)
+    entries, records = index.entries, index.records
+    copies = []
+    monkeypatch.setattr(index, "_snapshot", lambda name: copies.append(name))
+
+    index.upsert(25, {"name": "Pikachu", "level": 12, "ptype": "Electric", "id": 25})
+    index.remove(1)
+
+    assert index.entries is entries and index.records is records
+    assert 25 in entries and 1 not in records
+    assert copies == []
+
+
+# 📄 Pages come straight off the sorted indexes
+def test_ordered_pages():
+    index = PokedexIndex(dict(DEX))
+
+    ids, last = index.page("level", limit=2)
+    assert _names(DEX[pid] for pid in ids) == ["Bulbasaur", "Charmander"] and last == (8, 4)
+
+    ids, last = index.page("level", descending=True, after=(36, 6), limit=2)
+    assert _names(DEX[pid] for pid in ids) == ["Charmeleon", "Squirtle"]
+
+    ids, last = index.page("name", after=("charmander", 4))
+    assert _names(DEX[pid] for pid in ids) == ["Charmeleon", "Squirtle"] and last is None
+
+
+# 🗂️ Point writes update the cached indexes instead of forcing a reload
+def test_point_writes_update_cached_index():
+    save_pokedex({str(pid): entry for pid, entry in DEX.items()})
+    before = load_pokedex_cached()
+    stats = pokedex_cache_stats()
+
+    insert_pokedex_entry(25, {"name": "Pikachu", "level": 12, "ptype": "Electric"})
+    patch_pokedex_entry(7, {"level": 30})
+    delete_pokedex_entry(1)
+
+    assert _names(query_pokedex(min_level=12, max_level=30)) == ["Charmeleon", "Squirtle", "Pikachu"]
+    assert _names(query_pokedex(ptype="GRASS")) == []
+    page, _after = pokemon_records_page(sort_by="level", descending=True, limit=1)
+    assert [record.name for _pid, record in page] == ["Charizard"]
+
+    after = pokedex_cache_stats()
+    assert after["incremental_updates"] == stats["incremental_updates"] + 3
+    assert after["misses"] == stats["misses"]
+    assert 1 in before
+
+
+# 🏁 A write by someone else right after ours is never stamped as cached
+def test_point_write_does_not_stamp_a_foreign_write(monkeypatch):
+    save_pokedex({str(pid): entry for pid, entry in DEX.items()})
+    load_pokedex_cached()
+    backend = get_backend()
+    real_put, real_patch = backend.put, backend.patch
+
+    def put_then_foreign_patch(collection, entry_id, entry):
+        stored = real_put(collection, entry_id, entry)
+        real_patch(collection, 7, {"level": 99})  # another worker, between our write and the stamp
+        return stored
+
+    monkeypatch.setattr(backend, "put", put_then_foreign_patch)
+
+    insert_pokedex_entry(25, {"name": "Pikachu", "level": 12, "ptype": "Electric"})
+
+    cached = load_pokedex_cached()
+    assert cached[7]["level"] == 99
+    assert 25 in cached
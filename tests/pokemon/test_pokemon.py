@@ -59,3 +59,26 @@ def test_crud_pokemon():
     remaining = res.json()
     names_after = [p["name"] for p in remaining]
     assert "Garchomp" not in names_after
+
+
+def test_patch_and_delete_only_touch_one_entry():
+    res = client.post("/auth/login", json=admin_login)
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    # 🧪 Nickname set, then cleared, on the seeded Bulbasaur
+    res = client.patch("/pokemon/1", json={"nickname": "bulby"}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["Data"]["nickname"] == "bulby"
+    assert res.json()["Data"]["name"] == "Bulbasaur"
+
+    res = client.patch("/pokemon/1", json={"nickname": ""}, headers=headers)
+    assert res.status_code == 200
+    assert "nickname" not in res.json()["Data"]
+
+    # 🧪 Missing IDs are 404, not silent no-ops
+    assert client.patch("/pokemon/999", json={"level": 10}, headers=headers).status_code == 404
+    assert client.delete("/pokemon/999", headers=headers).status_code == 404
+
+    # 🧪 Bulbasaur is still there after the failed calls
+    res = client.get("/pokemon/1", headers=headers)
+    assert res.status_code == 200
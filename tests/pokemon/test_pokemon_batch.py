@@ -0,0 +1,78 @@
+# tests/pokemon/test_pokemon_batch.py
+
+from fastapi.testclient import TestClient
+
+import utils.file_handler as file_handler
+from core_app import core_app as app
+from utils.file_handler import load_pokedex, save_pokedex
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire", "nickname": "Ember"},
+    "7": {"name": "Squirtle", "level": 10, "ptype": "Water"},
+}
+
+
+def _admin_headers():
+    res = client.post("/auth/login", json={"username": "professoroak", "password": "pallet123"})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+# 📦 Creates, patches and deletes land together, with one save
+def test_batch_applies_all_operations(monkeypatch):
+    save_pokedex(DEX)
+    saves = []
+    real_save = file_handler.save_pokedex
+    monkeypatch.setattr(file_handler, "save_pokedex", lambda data: saves.append(1) or real_save(data))
+
+    res = client.post("/pokemon/batch", headers=_admin_headers(), json={"operations": [
+        {"op": "create", "pokemon": {"poke_name": "Eevee", "level": 12, "ptype": "Normal"}},
+        {"op": "create", "pokemon": {"poke_name": "Pidgey", "level": 6, "ptype": "Flying", "nickname": "Bird"}},
+        {"op": "patch", "id": 4, "changes": {"level": 16, "nickname": ""}},
+        {"op": "delete", "id": 7},
+    ]})
+
+    assert res.status_code == 200
+    results = res.json()["Data"]
+    assert [r["status"] for r in results] == ["created", "created", "updated", "deleted"]
+    eevee_id, pidgey_id = results[0]["id"], results[1]["id"]
+    assert pidgey_id == eevee_id + 1
+
+    pokedex = load_pokedex()
+    assert pokedex[eevee_id]["name"] == "Eevee"
+    assert pokedex[pidgey_id]["nickname"] == "Bird"
+    assert pokedex[4]["level"] == 16 and "nickname" not in pokedex[4]
+    assert 7 not in pokedex
+    assert len(saves) == 1
+
+
+# ❌ One bad operation rejects the batch; nothing is saved
+def test_batch_is_all_or_nothing():
+    save_pokedex(DEX)
+
+    res = client.post("/pokemon/batch", headers=_admin_headers(), json={"operations": [
+        {"op": "delete", "id": 1},
+        {"op": "patch", "id": 1, "changes": {"level": 50}},  # already deleted above
+        {"op": "patch", "id": 4, "changes": {"level": 50}},
+    ]})
+
+    assert res.status_code == 422
+    results = res.json()["detail"]["results"]
+    assert [r["status"] for r in results] == ["not_applied", "not_found", "not_applied"]
+
+    pokedex = load_pokedex()
+    assert pokedex[1]["name"] == "Bulbasaur"
+    assert pokedex[4]["level"] == 8
+
+
+# 🔐 Admins only; malformed operations fail validation up front
+def test_batch_requires_admin_and_valid_ops():
+    res = client.post("/auth/login", json={"username": "ashketchum", "password": "pikapika"})
+    trainer = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    body = {"operations": [{"op": "delete", "id": 1}]}
+
+    assert client.post("/pokemon/batch", headers=trainer, json=body).status_code == 403
+    assert client.post("/pokemon/batch", headers=_admin_headers(), json={"operations": [{"op": "rename", "id": 1}]}).status_code == 422
+    assert client.post("/pokemon/batch", headers=_admin_headers(), json={"operations": []}).status_code == 422
@@ -0,0 +1,87 @@
+# tests/pokemon/test_pokemon_etag.py
+
+from fastapi.testclient import TestClient
+
+import routers.pokemon as pokemon_router
+from core_app import core_app as app
+from utils.file_handler import patch_pokedex_entry, save_pokedex
+from utils.response_cache import ResponseCache, etag_matches
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire"},
+}
+
+
+def _headers(**extra):
+    res = client.post("/auth/login", json={"username": "ashketchum", "password": "pikapika"})
+    return {"Authorization": f"Bearer {res.json()['access_token']}", **extra}
+
+
+# 🏷️ Unchanged data → 304 with no body; a write → fresh 200 and a new ETag
+def test_if_none_match_round_trip():
+    save_pokedex(DEX)
+
+    first = client.get("/pokemon/4", headers=_headers())
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    again = client.get("/pokemon/4", headers=_headers(**{"If-None-Match": etag}))
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+    patch_pokedex_entry(4, {"level": 16})
+
+    changed = client.get("/pokemon/4", headers=_headers(**{"If-None-Match": etag}))
+    assert changed.status_code == 200
+    assert changed.json()["level"] == 16
+    assert changed.headers["ETag"] != etag
+
+
+# 🌐 Browser apps on another origin can read the ETag to send If-None-Match
+def test_etag_is_exposed_to_cors_clients():
+    save_pokedex(DEX)
+
+    res = client.get("/pokemon/4", headers=_headers(Origin="http://localhost:3000"))
+
+    exposed = res.headers["Access-Control-Expose-Headers"].lower().split(", ")
+    assert "etag" in exposed and res.headers["ETag"]
+
+
+# 🧊 Cache hits answer without loading or rendering records
+def test_cached_list_skips_storage(monkeypatch):
+    save_pokedex(DEX)
+    first = client.get("/pokemon/", params={"limit": 1}, headers=_headers())
+
+    async def boom(**_options):
+        raise AssertionError("page rebuilt on a cache hit")
+
+    monkeypatch.setattr(pokemon_router, "pokemon_records_page_async", boom)
+
+    hit = client.get("/pokemon/", params={"limit": 1}, headers=_headers())
+    assert hit.content == first.content
+    assert hit.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    not_modified = client.get("/pokemon/", params={"limit": 1}, headers=_headers(**{"If-None-Match": first.headers["ETag"]}))
+    assert not_modified.status_code == 304
+
+
+# 📦 LRU bound, version check and If-None-Match parsing
+def test_response_cache_rules():
+    cache = ResponseCache(max_entries=2)
+    a = cache.put("a", 1, b"[1]")
+    cache.put("b", 1, b"[2]")
+    cache.get("a", 1)
+    cache.put("c", 1, b"[3]")
+
+    assert cache.get("b", 1) is None          # least recently used, evicted
+    assert cache.get("a", 2) is None          # built for an older version
+    assert cache.get("a", 1) is None          # ... and dropped on sight
+    assert cache.get("c", 1).body == b"[3]"
+
+    assert etag_matches(f'"x", W/{a.etag}', a.etag)
+    assert etag_matches("*", a.etag)
+    assert not etag_matches('"other"', a.etag)
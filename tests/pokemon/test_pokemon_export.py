@@ -0,0 +1,71 @@
+# tests/pokemon/test_pokemon_export.py
+
+import csv
+import gzip
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+import routers.pokemon as pokemon_router
+from core_app import core_app as app
+from utils.file_handler import save_pokedex
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire", "nickname": "Ember"},
+    "6": {"name": "Charizard", "level": 36, "ptype": "Fire"},
+    "7": {"name": "Squirtle", "level": 10, "ptype": "Water"},
+    "9": {"name": "Blastoise", "level": 1, "ptype": "Water"},  # invalid level, left out
+}
+
+
+def _headers(**extra):
+    res = client.post("/auth/login", json={"username": "ashketchum", "password": "pikapika"})
+    return {"Authorization": f"Bearer {res.json()['access_token']}", **extra}
+
+
+# 📤 NDJSON: one object per line, with ids, across several chunks
+def test_ndjson_export(monkeypatch):
+    monkeypatch.setattr(pokemon_router, "EXPORT_BATCH_SIZE", 2)
+    save_pokedex(DEX)
+
+    res = client.get("/pokemon/export", headers=_headers(**{"Accept-Encoding": "identity"}))
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    assert "content-encoding" not in res.headers
+
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [(row["id"], row["name"]) for row in rows] == [(1, "Bulbasaur"), (4, "Charmander"), (6, "Charizard"), (7, "Squirtle")]
+    assert rows[1]["nickname"] == "Ember"
+
+
+# 📊 CSV with filters, gzip when the client asks for it
+def test_csv_export_gzip():
+    save_pokedex(DEX)
+
+    res = client.get(
+        "/pokemon/export",
+        params={"format": "csv", "ptype": "fire"},
+        headers=_headers(**{"Accept-Encoding": "gzip"}),
+    )
+
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["content-disposition"] == 'attachment; filename="pokedex.csv"'
+
+    rows = list(csv.DictReader(io.StringIO(res.text)))  # httpx already gunzipped it
+    assert [(r["id"], r["name"], r["nickname"]) for r in rows] == [("4", "Charmander", "Ember"), ("6", "Charizard", "")]
+
+
+# 🗜️ The raw stream is one valid gzip member; an empty export is just the header
+def test_gzip_stream_and_empty_csv():
+    save_pokedex({})
+
+    with client.stream("GET", "/pokemon/export", params={"format": "csv"}, headers=_headers(**{"Accept-Encoding": "gzip"})) as res:
+        raw = b"".join(res.iter_raw())
+
+    assert gzip.decompress(raw) == b"id,name,level,ptype,nickname\n"
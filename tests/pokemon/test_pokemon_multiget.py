@@ -0,0 +1,92 @@
+# tests/pokemon/test_pokemon_multiget.py
+
+import json
+
+from fastapi.testclient import TestClient
+
+from core_app import core_app as app
+from models.pokemon_record import RECORD_FIELDS
+from utils.file_handler import (
+    get_pokemon_records_many,
+    invalidate_pokedex_cache,
+    pokedex_cache_stats,
+    save_pokedex,
+)
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire", "nickname": "Ember"},
+    "7": {"name": "Squirtle", "level": 10, "ptype": "Water"},
+    "9": {"name": "Blastoise", "level": 1, "ptype": "Water"},  # invalid level
+}
+
+
+def _headers():
+    res = client.post("/auth/login", json={"username": "ashketchum", "password": "pikapika"})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+# 🎯 ids come back in request order; unknown ids are reported, not fatal
+def test_multi_get_by_ids():
+    save_pokedex(DEX)
+
+    res = client.get("/pokemon/", params={"ids": "7,1,404,7"}, headers=_headers())
+
+    assert res.status_code == 200
+    assert [p["name"] for p in res.json()] == ["Squirtle", "Bulbasaur"]
+    assert res.headers["X-Missing-Ids"] == "404"
+
+
+# ✂️ fields= trims every object, on lists, multi-gets and single reads
+def test_field_projection():
+    save_pokedex(DEX)
+    headers = _headers()
+
+    page = client.get("/pokemon/", params={"fields": "id,name", "limit": 2}, headers=headers).json()
+    assert page == [{"id": 1, "name": "Bulbasaur"}, {"id": 4, "name": "Charmander"}]
+
+    picked = client.get("/pokemon/", params={"ids": "4", "fields": "nickname,level"}, headers=headers).json()
+    assert picked == [{"nickname": "Ember", "level": 8}]
+
+    single = client.get("/pokemon/4", params={"fields": "ptype"}, headers=headers).json()
+    assert single == {"ptype": "Fire"}
+
+    assert client.get("/pokemon/4", params={"fields": "password"}, headers=headers).status_code == 422
+
+
+# 📘 The documented schema allows any projection: no attribute is required
+def test_projection_schema():
+    spec = app.openapi()
+    schema = spec["components"]["schemas"]["PokemonFields"]
+
+    assert set(schema["properties"]) == set(RECORD_FIELDS)
+    assert not schema.get("required")
+
+    for path in ("/pokemon/", "/pokemon/{pokemon_id}"):
+        body = spec["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert "PokemonFields" in json.dumps(body)
+
+
+# ❌ ids do not mix with paging/filters; bad entries are still a 500
+def test_multi_get_errors():
+    save_pokedex(DEX)
+    headers = _headers()
+
+    assert client.get("/pokemon/", params={"ids": "1", "limit": 5}, headers=headers).status_code == 400
+    assert client.get("/pokemon/", params={"ids": "1,x"}, headers=headers).status_code == 422
+    assert client.get("/pokemon/", params={"ids": "1,9"}, headers=headers).status_code == 500
+
+
+# 🧊 A cold cache is not rebuilt just to answer a handful of ids
+def test_cold_cache_uses_point_lookup():
+    save_pokedex(DEX)
+    invalidate_pokedex_cache()
+    misses = pokedex_cache_stats()["misses"]
+
+    records = get_pokemon_records_many([4, 1, 404])
+
+    assert [records[pid].name for pid in (4, 1)] == ["Charmander", "Bulbasaur"]
+    assert 404 not in records
+    assert pokedex_cache_stats()["misses"] == misses
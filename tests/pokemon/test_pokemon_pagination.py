@@ -0,0 +1,98 @@
+# tests/pokemon/test_pokemon_pagination.py
+
+from fastapi.testclient import TestClient
+
+from core_app import core_app as app
+from utils.file_handler import insert_pokedex_entry, save_pokedex
+from utils.pokedex_index import PokedexIndex
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire"},
+    "5": {"name": "Charmeleon", "level": 16, "ptype": "Fire"},
+    "6": {"name": "Charizard", "level": 36, "ptype": "Fire"},
+    "7": {"name": "Squirtle", "level": 8, "ptype": "Water"},
+    "25": {"name": "Pikachu", "level": 12, "ptype": "Electric"},
+}
+
+
+def _headers():
+    res = client.post("/auth/login", json={"username": "ashketchum", "password": "pikapika"})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def _walk(headers, **params):
+    """Follow X-Next-Cursor until the last page; returns the pages' names."""
+    pages = []
+    while True:
+        res = client.get("/pokemon/", params=params, headers=headers)
+        assert res.status_code == 200
+        pages.append([p["name"] for p in res.json()])
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        params = {**params, "cursor": cursor}
+
+
+# 📄 Cursors walk the whole list once, in order, for every sort
+def test_cursor_walks_every_sort():
+    save_pokedex(DEX)
+    headers = _headers()
+
+    assert _walk(headers, limit=4) == [
+        ["Bulbasaur", "Charmander", "Charmeleon", "Charizard"],
+        ["Squirtle", "Pikachu"],
+    ]
+    assert _walk(headers, limit=2, sort_by="level") == [
+        ["Bulbasaur", "Charmander"],
+        ["Squirtle", "Pikachu"],
+        ["Charmeleon", "Charizard"],
+    ]
+    assert _walk(headers, limit=5, sort_by="name", order="desc") == [
+        ["Squirtle", "Pikachu", "Charmeleon", "Charmander", "Charizard"],
+        ["Bulbasaur"],
+    ]
+
+
+# 🔎 Filters combine with paging
+def test_filters_with_cursor():
+    save_pokedex(DEX)
+    headers = _headers()
+
+    assert _walk(headers, limit=1, ptype="FIRE", min_level=8, max_level=20) == [["Charmander"], ["Charmeleon"]]
+    assert _walk(headers, name_prefix="char", sort_by="level", order="desc") == [["Charizard", "Charmeleon", "Charmander"]]
+
+
+# 🧷 A cursor stays valid while entries are added before it
+def test_cursor_is_stable_across_inserts():
+    save_pokedex(DEX)
+    headers = _headers()
+
+    res = client.get("/pokemon/", params={"limit": 2}, headers=headers)
+    insert_pokedex_entry(2, {"name": "Ivysaur", "level": 16, "ptype": "Grass"})
+
+    res = client.get("/pokemon/", params={"limit": 2, "cursor": res.headers["X-Next-Cursor"]}, headers=headers)
+    assert [p["name"] for p in res.json()] == ["Charmeleon", "Charizard"]
+
+
+# ❌ Garbage or mismatched cursors are a 400, not a 500
+def test_bad_cursor_rejected():
+    save_pokedex(DEX)
+    headers = _headers()
+
+    cursor = client.get("/pokemon/", params={"limit": 1}, headers=headers).headers["X-Next-Cursor"]
+
+    assert client.get("/pokemon/", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+    assert client.get("/pokemon/", params={"cursor": cursor, "sort_by": "level"}, headers=headers).status_code == 400
+
+
+# 🗂️ page() bisects from the previous position in either direction
+def test_index_page_positions():
+    index = PokedexIndex({int(pid): entry for pid, entry in DEX.items()})
+
+    ids, after = index.page("level", limit=3)
+    assert (ids, after) == ([1, 4, 7], (8, 7))
+    assert index.page("level", after=after) == ([25, 5, 6], None)
+    assert index.page("id", descending=True, after=(6,), limit=2) == ([5, 4], (4,))
@@ -0,0 +1,45 @@
+# tests/pokemon/test_pokemon_records.py
+
+import json
+
+import pytest
+
+from models.pokemon_model import Pokemon
+from models.pokemon_record import PokemonRecord, records_json
+from utils.file_handler import load_pokemon_records_cached, patch_pokedex_entry, save_pokedex
+
+
+# ✅ One validation; body matches what response_model would have rendered
+def test_record_body_matches_response_model():
+    record = PokemonRecord.from_entry(6, {"poke_name": "Charizard", "level": "36", "ptype": "Fire", "nickname": ""})
+
+    expected = Pokemon.model_validate({"name": "Charizard", "level": 36, "ptype": "Fire"}).model_dump()
+
+    assert (record.id, record.name, record.level, record.nickname) == (6, "Charizard", 36, None)
+    assert json.loads(record.body) == expected
+    assert json.loads(records_json([record, record])) == [expected, expected]
+
+
+# ❌ Bad entries fail at build time, like model_validate would
+def test_invalid_entry_raises():
+    with pytest.raises(ValueError):
+        PokemonRecord.from_entry(1, {"name": "Magikarp", "level": 2, "ptype": "Water"})
+
+
+# 🧊 Cached records are reused across reads; a point write rebuilds only its own
+def test_cached_records_are_built_once():
+    save_pokedex({
+        "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+        "4": {"name": "Charmander", "level": 8, "ptype": "Fire"},
+        "9": {"name": "Blastoise", "level": 1, "ptype": "Water"},
+    })
+
+    first = load_pokemon_records_cached()
+    assert load_pokemon_records_cached() is first
+    assert isinstance(first[9], Exception)
+
+    patch_pokedex_entry(4, {"level": 16})
+    second = load_pokemon_records_cached()
+
+    assert second[1] is first[1]
+    assert second[4].level == 16
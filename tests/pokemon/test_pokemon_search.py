@@ -0,0 +1,77 @@
+# tests/pokemon/test_pokemon_search.py
+
+from fastapi.testclient import TestClient
+
+from core_app import core_app as app
+from utils.file_handler import pokedex_cache_stats, save_pokedex
+from utils.trigram_index import TrigramIndex
+from utils.write_batcher import pokedex_writes
+
+client = TestClient(app)
+
+DEX = {
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire"},
+    "5": {"name": "Charmeleon", "level": 16, "ptype": "Fire"},
+    "6": {"name": "Charizard", "level": 36, "ptype": "Fire", "nickname": "Blaze"},
+    "25": {"name": "Pikachu", "level": 12, "ptype": "Electric", "nickname": "Sparky"},
+}
+
+
+def _login(username, password):
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def _search(headers, q, **params):
+    res = client.get("/pokemon/search", params={"q": q, **params}, headers=headers)
+    assert res.status_code == 200
+    return [hit["name"] for hit in res.json()]
+
+
+# 🔤 Typos, prefixes and nicknames rank by similarity; best k only
+def test_trigram_ranking():
+    index = TrigramIndex()
+    for pid, entry in DEX.items():
+        index.add(int(pid), [entry["name"], entry.get("nickname")])
+
+    assert index.search("charzard", k=1)[0][1] == 6
+    assert [pid for _score, pid in index.search("char", k=3)] == [6, 4, 5]
+    assert index.search("sparki", k=1)[0][1] == 25
+    assert index.search("zzz", min_score=0.2) == []
+
+    index.remove(6)
+    assert 6 not in [pid for _score, pid in index.search("charizard")]
+
+
+# 🔍 The endpoint returns scored records, best first
+def test_search_endpoint():
+    save_pokedex(DEX)
+    headers = _login("ashketchum", "pikapika")
+
+    res = client.get("/pokemon/search", params={"q": "pikchu"}, headers=headers)
+    top = res.json()[0]
+
+    assert (top["id"], top["name"], top["nickname"]) == (25, "Pikachu", "Sparky")
+    assert 0 < top["score"] <= 1
+    assert _search(headers, "char", limit=2) == ["Charizard", "Charmander"]
+
+
+# ✏️ Add / patch / delete through the API keep the index in step, no reload
+def test_search_follows_writes():
+    save_pokedex(DEX)
+    trainer = _login("ashketchum", "pikapika")
+    admin = _login("professoroak", "pallet123")
+
+    assert _search(trainer, "squirtle") == []  # index built here
+    misses = pokedex_cache_stats()["misses"]
+
+    client.post("/pokemon/", json={"poke_name": "Squirtle", "level": 10, "ptype": "Water"}, headers=admin)
+    client.patch("/pokemon/25", json={"nickname": "Thunderbolt"}, headers=admin)
+    client.delete("/pokemon/6", headers=admin)
+
+    assert _search(trainer, "squirtle") == ["Squirtle"]
+    assert _search(trainer, "thunderbolt") == ["Pikachu"]
+    assert _search(trainer, "sparky") == []
+    assert "Charizard" not in _search(trainer, "charizard")
+    if not pokedex_writes.enabled:  # coalesced writes save the whole Pokédex, which reloads
+        assert pokedex_cache_stats()["misses"] == misses
@@ -0,0 +1,67 @@
+# tests/pokemon/test_pokemon_stats.py
+
+from fastapi.testclient import TestClient
+
+from core_app import core_app as app
+from utils.file_handler import load_pokedex, pokedex_cache_stats, pokedex_stats, save_pokedex
+from utils.pokedex_index import PokedexIndex
+from utils.write_batcher import pokedex_writes
+
+client = TestClient(app)
+
+DEX = {
+    "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"},
+    "4": {"name": "Charmander", "level": 8, "ptype": "Fire", "nickname": "Ember"},
+    "6": {"name": "Charizard", "level": 36, "ptype": "Fire"},
+    "7": {"name": "Squirtle", "level": 10, "ptype": "Water"},
+}
+
+
+def _login(username, password):
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+# 📊 Counts, histogram, min/max/mean and nickname coverage
+def test_stats_endpoint():
+    save_pokedex(DEX)
+
+    res = client.get("/pokemon/stats", headers=_login("ashketchum", "pikapika"))
+    stats = res.json()
+
+    assert res.status_code == 200
+    assert stats["count"] == 4
+    assert stats["by_type"] == {"Fire": 2, "Grass": 1, "Water": 1}
+    assert (stats["level"]["min"], stats["level"]["max"], stats["level"]["mean"]) == (5, 36, 14.75)
+    assert stats["level"]["histogram"]["1-10"] == 3
+    assert stats["level"]["histogram"]["31-40"] == 1
+    assert stats["level"]["histogram"]["91-100"] == 0
+    assert stats["nicknames"] == {"count": 1, "coverage": 0.25}
+
+    again = client.get("/pokemon/stats", headers={**_login("ashketchum", "pikapika"), "If-None-Match": res.headers["ETag"]})
+    assert again.status_code == 304
+
+
+# ✏️ Running totals follow add / patch / delete and match a fresh rebuild
+def test_stats_follow_writes():
+    save_pokedex(DEX)
+    admin = _login("professoroak", "pallet123")
+
+    pokedex_stats()  # index built here
+    misses = pokedex_cache_stats()["misses"]
+
+    client.post("/pokemon/", json={"poke_name": "Pikachu", "level": 55, "ptype": "Electric", "nickname": "Sparky"}, headers=admin)
+    client.patch("/pokemon/6", json={"level": 40, "ptype": "Dragon"}, headers=admin)
+    client.patch("/pokemon/4", json={"nickname": ""}, headers=admin)
+    client.delete("/pokemon/1", headers=admin)
+
+    stats = pokedex_stats()
+    assert stats["by_type"] == {"Dragon": 1, "Electric": 1, "Fire": 1, "Water": 1}
+    assert (stats["level"]["min"], stats["level"]["max"]) == (8, 55)
+    assert stats["nicknames"]["count"] == 1
+
+    fresh = PokedexIndex()
+    fresh.rebuild(load_pokedex())
+    assert stats == fresh.stats()
+    if not pokedex_writes.enabled:  # coalesced writes save the whole Pokédex, which reloads
+        assert pokedex_cache_stats()["misses"] == misses
@@ -0,0 +1,194 @@
+# tests/storage/test_backend_conformance.py
+#
+# 🧪 Every storage backend must pass the same checks. A new backend only
+# needs a branch in the `backend` fixture below.
+
+import pytest
+
+from config import settings
+from utils import sqlite_store
+from utils.db_json_store import DocumentConflictError, db_enabled
+from utils.storage_backends import (
+    FileBackend,
+    FileCollection,
+    MemoryBackend,
+    PostgresBackend,
+    SqliteBackend,
+    StorageBackend,
+)
+
+BULBASAUR = {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1}
+IVYSAUR = {"name": "Ivysaur", "level": 16, "ptype": "Grass", "id": 2}
+SQUIRTLE = {"name": "Squirtle", "level": 10, "ptype": "Water", "id": 7}
+
+
+@pytest.fixture(params=["memory", "file", "sqlite", "postgres"])
+def backend(request, tmp_path, monkeypatch):
+    name = request.param
+
+    if name == "memory":
+        store = MemoryBackend()
+    elif name == "file":
+        store = FileBackend(collections={
+            "pokedex": FileCollection(
+                path=str(tmp_path / "pokedex.json"),
+                journal_path=str(tmp_path / "pokedex.journal"),
+                binary_path=str(tmp_path / "pokedex.bin"),
+            ),
+        })
+    elif name == "sqlite":
+        monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "pokemon.sqlite3"))
+        request.addfinalizer(sqlite_store.close_connection)
+        store = SqliteBackend()
+    else:
+        if not db_enabled():
+            pytest.skip("needs a live PostgreSQL (DATABASE_URL outside TESTING)")
+        store = PostgresBackend()
+
+    store.replace("pokedex", {})
+    return store
+
+
+# 🧩 A backend missing part of the protocol fails when built, not on first use
+def test_incomplete_backend_cannot_be_built():
+    class ReadOnlyBackend(StorageBackend):
+        name = "read-only"
+
+        def get(self, collection, entry_id):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        ReadOnlyBackend()
+
+
+# ✅ Full save then full read gives the same entries
+def test_replace_then_scan_round_trips(backend):
+    backend.replace("pokedex", {"1": BULBASAUR, "2": IVYSAUR})
+
+    assert backend.scan("pokedex") == {"1": BULBASAUR, "2": IVYSAUR}
+
+
+# 🔎 Point reads; missing ids are simply left out
+def test_get_and_get_many(backend):
+    backend.replace("pokedex", {"1": BULBASAUR, "2": IVYSAUR})
+
+    assert backend.get("pokedex", 1) == BULBASAUR
+    assert backend.get("pokedex", "2") == IVYSAUR
+    assert backend.get("pokedex", 99) is None
+    assert backend.get_many("pokedex", [2, 99, 1]) == {"2": IVYSAUR, "1": BULBASAUR}
+
+
+# ✏️ Point writes, including dropping a field
+def test_put_patch_delete(backend):
+    backend.put("pokedex", 7, SQUIRTLE)
+    assert backend.get("pokedex", 7) == SQUIRTLE
+
+    patched = backend.patch("pokedex", 7, {"level": 16, "nickname": "squirt"})
+    assert patched["level"] == 16
+    assert backend.get("pokedex", 7)["nickname"] == "squirt"
+
+    cleared = backend.patch("pokedex", 7, {}, remove_fields=("nickname",))
+    assert "nickname" not in cleared
+
+    assert backend.delete("pokedex", 7)["name"] == "Squirtle"
+    assert backend.get("pokedex", 7) is None
+
+
+# ❌ Writes to unknown ids report None
+def test_missing_entries_return_none(backend):
+    assert backend.patch("pokedex", 404, {"level": 50}) is None
+    assert backend.delete("pokedex", 404) is None
+
+
+# 🔁 Reads never move the version; writes always do
+def test_version_moves_on_writes_only(backend):
+    backend.replace("pokedex", {"1": BULBASAUR})
+    before = backend.version("pokedex")
+
+    backend.get("pokedex", 1)
+    backend.scan("pokedex")
+    assert backend.version("pokedex") == before
+
+    backend.patch("pokedex", 1, {"level": 6})
+    after_patch = backend.version("pokedex")
+    assert after_patch != before
+
+    backend.delete("pokedex", 1)
+    assert backend.version("pokedex") != after_patch
+
+
+# 🏷️ version_after_write names our own write's version, never a later one
+def test_version_after_write(backend):
+    backend.replace("pokedex", {"1": BULBASAUR})
+    before = backend.version("pokedex")
+
+    backend.put("pokedex", 2, IVYSAUR)
+    ours = backend.version("pokedex")
+    assert backend.version_after_write("pokedex", before) == ours
+
+    backend.patch("pokedex", 2, {"level": 17})  # someone else's write
+    assert backend.version_after_write("pokedex", before) in (ours, None)
+    assert backend.version_after_write("pokedex", before) != backend.version("pokedex")
+
+
+# 🧊 Mutating a returned entry never leaks into the store
+def test_returned_entries_are_copies(backend):
+    backend.put("pokedex", 1, BULBASAUR)
+
+    backend.get("pokedex", 1)["level"] = 99
+    backend.scan("pokedex")["1"]["level"] = 99
+
+    assert backend.get("pokedex", 1)["level"] == 5
+
+
+# 🔢 Allocated ids are fresh, contiguous, never reused and above every stored id
+def test_allocate_ids(backend):
+    backend.replace("pokedex", {"1": BULBASAUR, "2": IVYSAUR})
+
+    assert backend.allocate_ids("pokedex", 3) == 3
+    assert backend.allocate_ids("pokedex") == 6
+
+    backend.put("pokedex", 50, SQUIRTLE)
+    assert backend.allocate_ids("pokedex") == 51
+
+    backend.delete("pokedex", 50)
+    assert backend.allocate_ids("pokedex") == 52
+
+    backend.replace("pokedex", {"100": {**SQUIRTLE, "id": 100}})
+    assert backend.allocate_ids("pokedex", 2) == 101
+    assert backend.allocate_ids("pokedex") == 103
+
+
+# ⚔️ CAS backends merge disjoint saves and reject same-entry edits
+def test_concurrent_replace_merges_or_conflicts(backend):
+    if not backend.supports_cas:
+        pytest.skip(f"{backend.name} saves are last-writer-wins")
+
+    backend.replace("pokedex", {"1": BULBASAUR, "2": IVYSAUR})
+
+    base, version = backend.load("pokedex")
+    other, _ = backend.load("pokedex")
+
+    other["2"] = {**IVYSAUR, "level": 20}
+    backend.replace("pokedex", other)
+
+    ours = {**base, "7": SQUIRTLE}
+    backend.replace("pokedex", ours, expected_version=version, base=base)
+
+    merged = backend.scan("pokedex")
+    assert merged["2"]["level"] == 20
+    assert "7" in merged
+
+    base, version = backend.load("pokedex")
+    backend.replace("pokedex", {**base, "1": {**BULBASAUR, "level": 30}})
+
+    with pytest.raises(DocumentConflictError):
+        backend.replace("pokedex", {**base, "1": {**BULBASAUR, "level": 40}}, expected_version=version, base=base)
+
+    # A stale save without a base cannot tell our deletes from their inserts
+    base, version = backend.load("pokedex")
+    backend.replace("pokedex", {**base, "2": {**IVYSAUR, "level": 21}})
+
+    with pytest.raises(DocumentConflictError):
+        backend.replace("pokedex", {"1": BULBASAUR}, expected_version=version)
+    assert "2" in backend.scan("pokedex")
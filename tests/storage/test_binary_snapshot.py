@@ -0,0 +1,69 @@
+# tests/storage/test_binary_snapshot.py
+
+import json
+
+import pytest
+
+from utils import binary_snapshot
+from utils.json_journal import JsonJournal
+
+pytestmark = pytest.mark.skipif(not binary_snapshot.available(), reason="orjson not installed")
+
+DEX = {"1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1}}
+
+
+def _paths(tmp_path):
+    source = tmp_path / "dex.json"
+    source.write_text(json.dumps(DEX), encoding="utf-8")
+    return str(tmp_path / "dex.bin"), str(source)
+
+
+# ✅ Round trip while the JSON snapshot is unchanged
+def test_round_trip(tmp_path):
+    path, source = _paths(tmp_path)
+
+    assert binary_snapshot.write(path, source, DEX)
+    assert binary_snapshot.read(path, source) == DEX
+
+
+# 🔁 JSON edited after the binary was built → binary is ignored
+def test_stale_when_json_changes(tmp_path):
+    path, source = _paths(tmp_path)
+    binary_snapshot.write(path, source, DEX)
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("\n")
+
+    assert binary_snapshot.read(path, source) is None
+
+
+# 💥 Damaged payload fails the checksum
+def test_corrupt_payload_is_rejected(tmp_path):
+    path, source = _paths(tmp_path)
+    binary_snapshot.write(path, source, DEX)
+
+    with open(path, "r+b") as f:
+        f.seek(-2, 2)
+        f.write(b"!!")
+
+    assert binary_snapshot.read(path, source) is None
+
+
+# ⚡ Journal loads prefer the binary snapshot and still replay the tail
+def test_journal_prefers_binary_snapshot(tmp_path):
+    journal = JsonJournal(
+        str(tmp_path / "dex.json"),
+        str(tmp_path / "dex.journal"),
+        compact_bytes=lambda: 1_000_000,
+        fsync=lambda: False,
+        binary_path=str(tmp_path / "dex.bin"),
+        binary_enabled=lambda: True,
+    )
+    journal.rewrite(dict(DEX))
+    journal.put(2, {"name": "Ivysaur", "level": 16, "ptype": "Grass", "id": 2})
+
+    data, from_binary = journal.load_with_source()
+
+    assert from_binary
+    assert sorted(data) == ["1", "2"]
+    assert journal.stats["binary_loads"] == 1
@@ -0,0 +1,252 @@
+# tests/storage/test_db_pool.py
+#
+# 🐘 Connection pool behaviour of utils/db_json_store, against a fake pool
+# (no PostgreSQL needed).
+
+import os
+import threading
+import time
+
+import pytest
+
+import utils.db_json_store as store
+from config import settings
+
+
+class FakeConnection:
+    """Counts commits/rollbacks; `alive=False` makes the health-check ping fail."""
+
+    pool_last_used = None  # same default as store.PooledConnection
+
+    def __init__(self, alive=True, closed=0, last_used=None):
+        self.alive = alive
+        self.closed = closed
+        self.pool_last_used = last_used
+        self.commits = 0
+        self.rollbacks = 0
+        self.pings = 0
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                conn.pings += 1
+                if not conn.alive:
+                    raise ConnectionError("server closed the connection unexpectedly")
+
+            def fetchone(self):
+                return (1,)
+
+        return Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool:
+    """
+    Behaves like psycopg2's pool: getconn() reuses an idle connection or
+    opens the next of `connections`; putconn() keeps a connection only while
+    fewer than `minconn` are idle and closes it otherwise.
+    """
+
+    def __init__(self, connections, minconn=1):
+        self.connections = list(connections)
+        self.minconn = minconn
+        self.idle = []
+        self.returned = []
+        self.closed_all = 0
+
+    def getconn(self):
+        return self.idle.pop() if self.idle else self.connections.pop(0)
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+        if len(self.idle) < self.minconn and not close and not conn.closed:
+            self.idle.append(conn)
+        else:
+            conn.close()
+
+    def closeall(self):
+        self.closed_all += 1
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """_get_connection() wired to a FakePool (fill pool.connections per test)."""
+    fake = FakePool([])
+    monkeypatch.setattr(store, "_get_pool", lambda: fake)
+    monkeypatch.setattr(store, "_POOL_SLOTS", threading.BoundedSemaphore(3))
+    monkeypatch.setattr(store, "_POOL_WARM", store.weakref.WeakSet())
+    monkeypatch.setattr(store, "_POOL_STATS", dict.fromkeys(store._POOL_STATS, 0))
+    monkeypatch.setattr(settings, "DB_POOL_IDLE_CHECK_SECONDS", 30.0)
+    monkeypatch.setattr(settings, "DB_JSONB_ORJSON", False)  # fakes are not real psycopg2 connections
+    return fake
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    """Connections that got the orjson JSONB loader."""
+    calls = []
+    monkeypatch.setattr(store, "register_default_jsonb", lambda conn_or_curs, loads: calls.append(conn_or_curs))
+    return calls
+
+
+# ⚡ orjson is set up on each new pooled connection, never process-wide
+def test_orjson_jsonb_is_per_connection(pool, monkeypatch, registered):
+    if store.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(settings, "DB_JSONB_ORJSON", True)
+    conn = FakeConnection()
+    pool.connections = [conn]
+
+    with store._get_connection():
+        pass
+    with store._get_connection() as again:  # reused from the pool → not registered twice
+        assert again is conn
+
+    assert registered == [conn]
+
+
+# 🔕 DB_JSONB_ORJSON=0 leaves psycopg2's default decoder alone
+def test_orjson_jsonb_can_be_turned_off(pool, registered):
+    pool.connections = [FakeConnection()]
+
+    with store._get_connection():
+        pass
+
+    assert registered == []
+
+
+# ✅ Success commits and returns the connection to the pool for reuse
+def test_connection_commits_on_success(pool):
+    conn = FakeConnection()
+    pool.connections = [conn]
+
+    with store._get_connection() as got:
+        assert got is conn
+
+    assert (conn.commits, conn.rollbacks) == (1, 0)
+    assert pool.returned == [(conn, False)] and pool.idle == [conn]
+    assert conn.pool_last_used is not None
+    assert store.pool_stats()["warm_connections"] == 1
+    assert store._POOL_STATS["in_use"] == 0
+
+
+# ↩️ An error rolls back, is re-raised, and the connection still goes back
+def test_connection_rolls_back_on_error(pool):
+    conn = FakeConnection()
+    pool.connections = [conn]
+
+    with pytest.raises(ValueError):
+        with store._get_connection():
+            raise ValueError("bad write")
+
+    assert (conn.commits, conn.rollbacks) == (0, 1)
+    assert pool.returned == [(conn, False)]
+
+
+# 💥 A connection that dies mid-request is closed, not handed back out
+def test_connection_broken_during_use_is_discarded(pool):
+    conn = FakeConnection()
+    pool.connections = [conn]
+
+    with pytest.raises(ConnectionError):
+        with store._get_connection():
+            conn.closed = 2
+            raise ConnectionError("connection reset")
+
+    assert pool.returned == [(conn, True)] and pool.idle == []
+    assert store.pool_stats()["warm_connections"] == 0
+    assert store._POOL_STATS["broken_discarded"] == 1
+
+
+# 🔥 Only DB_POOL_MIN_SIZE connections stay warm after a burst; the rest are
+# closed by the pool and neither tracked nor mistaken for warm ones later
+def test_connections_above_min_are_closed_and_forgotten(pool, monkeypatch, registered):
+    monkeypatch.setattr(settings, "DB_JSONB_ORJSON", True)
+    first, second, third = FakeConnection(), FakeConnection(), FakeConnection()
+    pool.connections = [first, second, third]
+
+    with store._get_connection():
+        with store._get_connection():
+            pass  # second goes back first and is kept (nothing idle yet)
+    # first comes back while one is idle → closed
+
+    assert pool.idle == [second] and first.closed
+    assert store.pool_stats()["warm_connections"] == 1
+    assert store._POOL_STATS["closed_above_min"] == 1
+
+    with store._get_connection() as warm:
+        with store._get_connection() as fresh:
+            assert (warm, fresh) == (second, third)
+
+    # A brand-new connection is always prepared, whatever id() it got
+    assert registered == [first, second, third]
+    assert store._POOL_STATS["connections_opened"] == 3
+
+
+# 🩺 Only connections idle past DB_POOL_IDLE_CHECK_SECONDS are pinged
+def test_idle_connections_are_health_checked(pool):
+    recent = FakeConnection(last_used=time.monotonic())
+    idle = FakeConnection(last_used=time.monotonic() - 60)
+
+    assert store._checkout(FakePool([recent])) is recent
+    assert store._checkout(FakePool([idle])) is idle
+
+    assert (recent.pings, idle.pings) == (0, 1)
+    assert store._POOL_STATS["health_checks"] == 1
+
+
+# 🧟 Closed or dead idle connections are discarded and replaced
+def test_broken_connections_are_replaced_on_checkout(pool):
+    closed = FakeConnection(closed=1, last_used=time.monotonic())
+    dead = FakeConnection(alive=False, last_used=time.monotonic() - 60)
+    fresh = FakeConnection()
+    pool.connections = [closed, dead, fresh]
+
+    with store._get_connection() as got:
+        assert got is fresh
+
+    assert pool.returned == [(closed, True), (dead, True), (fresh, False)]
+    assert store._POOL_STATS["broken_discarded"] == 1
+    assert store._POOL_STATS["stale_discarded"] == 1
+
+
+# 🔒 close_pool closes this process's pool once, and is safe to repeat
+def test_close_pool(monkeypatch):
+    fake = FakePool([])
+    warm = store.weakref.WeakSet([FakeConnection()])
+    monkeypatch.setattr(store, "_POOL", fake)
+    monkeypatch.setattr(store, "_POOL_PID", os.getpid())
+    monkeypatch.setattr(store, "_POOL_SLOTS", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(store, "_POOL_WARM", warm)
+
+    store.close_pool()
+    store.close_pool()
+
+    assert fake.closed_all == 1
+    assert (store._POOL, store._POOL_PID, store._POOL_SLOTS) == (None, None, None)
+    assert len(warm) == 0
+
+    # A pool inherited across fork() belongs to the parent: forget it, don't close it
+    inherited = FakePool([])
+    monkeypatch.setattr(store, "_POOL", inherited)
+    monkeypatch.setattr(store, "_POOL_PID", os.getpid() + 1)
+
+    store.close_pool()
+
+    assert inherited.closed_all == 0 and store._POOL is None
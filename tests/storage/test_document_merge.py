@@ -0,0 +1,132 @@
+# tests/storage/test_document_merge.py
+
+from contextlib import contextmanager
+
+import pytest
+
+import utils.db_json_store as store
+from config import settings
+from utils.db_json_store import DocumentConflictError, merge_documents
+
+BASE = {
+    "1": {"name": "Bulbasaur", "level": 5},
+    "2": {"name": "Ivysaur", "level": 16},
+}
+
+
+# ✅ Different Pokémon changed by each writer → both changes survive
+def test_merge_keeps_both_writers_changes():
+    ours = {**BASE, "1": {"name": "Bulbasaur", "level": 6}, "3": {"name": "Venusaur", "level": 32}}
+    theirs = {**BASE, "2": {"name": "Ivysaur", "level": 20}}
+
+    merged = merge_documents("pokedex", BASE, ours, theirs)
+
+    assert merged["1"]["level"] == 6
+    assert merged["2"]["level"] == 20
+    assert "3" in merged
+
+
+# ✅ Our delete of an untouched entry is applied
+def test_merge_applies_our_delete():
+    ours = {"2": BASE["2"]}
+    theirs = dict(BASE)
+
+    assert merge_documents("pokedex", BASE, ours, theirs) == {"2": BASE["2"]}
+
+
+# ❌ Same Pokémon changed differently on both sides → conflict
+def test_merge_conflict_on_same_entry():
+    ours = {**BASE, "1": {"name": "Bulbasaur", "level": 6}}
+    theirs = {**BASE, "1": {"name": "Bulbasaur", "level": 7}}
+
+    with pytest.raises(DocumentConflictError) as exc:
+        merge_documents("pokedex", BASE, ours, theirs)
+
+    assert exc.value.entry_keys == ["1"]
+
+
+# ❌ No base → conflict, never a merge against {} that resurrects deletes
+def test_merge_without_base_is_a_conflict():
+    with pytest.raises(DocumentConflictError):
+        merge_documents("pokedex", None, {"2": BASE["2"]}, dict(BASE))
+
+
+@pytest.fixture
+def cas_db(monkeypatch):
+    """
+    save_json_document against a scripted PostgreSQL: each CAS write pops
+    its answer from `writes` (None = the version moved), and the re-read
+    after a miss finds `current` as (data, version).
+    """
+    state = {"writes": [], "current": None, "sent": []}
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params=None):
+            pass
+
+        def fetchone(self):
+            return state["current"]
+
+    @contextmanager
+    def connection():
+        class Conn:
+            def cursor(self):
+                return Cursor()
+        yield Conn()
+
+    def write_document(cur, key, data, data_hash, expected_version, verify):
+        state["sent"].append((data, expected_version))
+        return state["writes"].pop(0)
+
+    monkeypatch.setattr(store, "db_enabled", lambda: True)
+    monkeypatch.setattr(store, "init_db", lambda: None)
+    monkeypatch.setattr(store, "_get_connection", connection)
+    monkeypatch.setattr(store, "_write_document", write_document)
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", "off")
+    return state
+
+
+# 🔁 A CAS miss re-reads, merges and retries against the new version
+def test_save_retries_with_merge_after_cas_miss(cas_db):
+    theirs = {**BASE, "2": {"name": "Ivysaur", "level": 20}}
+    cas_db["writes"] = [None, (None, 9)]
+    cas_db["current"] = (theirs, 8)
+
+    assert store.save_json_document("pokedex", {"2": BASE["2"]}, expected_version=7, base=BASE) is True
+
+    assert cas_db["sent"][1] == ({"2": theirs["2"]}, 8)  # our delete of "1" + their edit of "2"
+
+
+# 🧹 Legacy stored entries are normalized like ours before the merge
+def test_save_normalizes_base_and_theirs(cas_db):
+    def with_ids(raw):
+        return {key: {**entry, "id": int(key)} for key, entry in raw.items()}
+
+    ours = with_ids({**BASE, "1": {"name": "Bulbasaur", "level": 6}})
+    theirs = {**BASE, "2": {"name": "Ivysaur", "level": 20}}
+    cas_db["writes"] = [None, (None, 9)]
+    cas_db["current"] = (theirs, 8)
+
+    store.save_json_document("pokedex", ours, expected_version=7, base=BASE, normalize=with_ids)
+
+    assert cas_db["sent"][1][0] == {
+        "1": {"name": "Bulbasaur", "level": 6, "id": 1},
+        "2": {"name": "Ivysaur", "level": 20, "id": 2},
+    }
+
+
+# ❌ A CAS miss without a base is a conflict; nothing is written blindly
+def test_save_without_base_conflicts_on_cas_miss(cas_db):
+    cas_db["writes"] = [None]
+    cas_db["current"] = (dict(BASE), 8)
+
+    with pytest.raises(DocumentConflictError):
+        store.save_json_document("pokedex", {"2": BASE["2"]}, expected_version=7)
+
+    assert len(cas_db["sent"]) == 1
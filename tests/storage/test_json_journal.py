@@ -0,0 +1,92 @@
+# tests/storage/test_json_journal.py
+
+import json
+import os
+
+from config import settings
+from utils.file_handler import (
+    POKEDEX_JOURNAL_PATH,
+    POKEDEX_PATH,
+    load_pokedex,
+    patch_pokedex_entry,
+    save_pokedex,
+)
+from utils.json_journal import JsonJournal
+
+
+def _journal(tmp_path, compact_bytes=1_000_000):
+    return JsonJournal(
+        str(tmp_path / "dex.json"),
+        str(tmp_path / "dex.journal"),
+        compact_bytes=lambda: compact_bytes,
+        fsync=lambda: False,
+    )
+
+
+# ✅ Appended records are replayed over the snapshot
+def test_journal_replays_over_snapshot(tmp_path):
+    journal = _journal(tmp_path)
+    journal.rewrite({"1": {"name": "Bulbasaur"}, "2": {"name": "Ivysaur"}})
+
+    journal.put(3, {"name": "Venusaur"})
+    journal.delete(1)
+    journal.put(2, {"name": "Ivysaur", "level": 20})
+
+    assert journal.load() == {"2": {"name": "Ivysaur", "level": 20}, "3": {"name": "Venusaur"}}
+
+
+# 💥 A half-written last record (crash mid-append) is skipped
+def test_torn_tail_is_ignored(tmp_path):
+    journal = _journal(tmp_path)
+    journal.rewrite({})
+    journal.put(1, {"name": "Bulbasaur"})
+
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op":"put","id":"2","entr')
+
+    assert journal.load() == {"1": {"name": "Bulbasaur"}}
+
+
+# 🔁 Snapshot replaced behind our back → old journal is not replayed
+def test_stale_journal_is_ignored_and_restarted(tmp_path):
+    journal = _journal(tmp_path)
+    journal.rewrite({})
+    journal.put(1, {"name": "Bulbasaur"})
+
+    with open(journal.snapshot_path, "w", encoding="utf-8") as f:
+        f.write('{"7": {"name": "Squirtle"}}\n')
+
+    assert journal.load() == {"7": {"name": "Squirtle"}}
+
+    journal.put(8, {"name": "Wartortle"})
+    assert journal.load() == {"7": {"name": "Squirtle"}, "8": {"name": "Wartortle"}}
+
+
+# 🧹 Compaction folds the journal into a new snapshot
+def test_compaction_rewrites_snapshot(tmp_path):
+    journal = _journal(tmp_path)
+    journal.rewrite({})
+    journal.put(1, {"name": "Bulbasaur"})
+
+    journal.compact()
+
+    assert not os.path.exists(journal.journal_path)
+    with open(journal.snapshot_path, encoding="utf-8") as f:
+        assert json.load(f) == {"1": {"name": "Bulbasaur"}}
+
+
+# ✅ File-mode PATCH appends a record instead of rewriting pokedex.json
+def test_patch_appends_to_pokedex_journal(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "file")
+    monkeypatch.setattr(settings, "FILE_JOURNAL_COMPACT_BYTES", 1_000_000)
+    save_pokedex({"1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1}})
+
+    with open(POKEDEX_PATH, encoding="utf-8") as f:
+        snapshot_before = f.read()
+
+    patch_pokedex_entry(1, {"level": 42})
+
+    with open(POKEDEX_PATH, encoding="utf-8") as f:
+        assert f.read() == snapshot_before
+    assert os.path.exists(POKEDEX_JOURNAL_PATH)
+    assert load_pokedex()[1]["level"] == 42
@@ -0,0 +1,107 @@
+# tests/storage/test_rows_seed.py
+#
+# 🌱 DB_STORAGE_LAYOUT=rows: whichever write reaches a collection first
+# must seed it from the app_json_store document (or the JSON file), not just
+# create its app_json_collections row and leave it empty forever.
+
+from contextlib import contextmanager
+
+import pytest
+
+import utils.db_json_store as store
+from config import settings
+
+LEGACY = {"1": {"name": "Bulbasaur", "level": 5}, "4": {"name": "Charmander", "level": 8}}
+
+
+class ScriptedCursor:
+    """Answers fetchone()/fetchall() in order and records the SQL it ran."""
+
+    def __init__(self, fetchone=(), fetchall=(), rowcount=1):
+        self.fetchone_results = list(fetchone)
+        self.fetchall_results = list(fetchall)
+        self.rowcount = rowcount
+        self.sql = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.sql.append(" ".join(sql.split()))
+
+    def fetchone(self):
+        return self.fetchone_results.pop(0)
+
+    def fetchall(self):
+        return self.fetchall_results.pop(0)
+
+
+@pytest.fixture
+def rows_db(monkeypatch):
+    """Fake connection + execute_values; `upserts` collects every row written."""
+    state = {"cursor": None, "upserts": []}
+
+    @contextmanager
+    def connection():
+        class Conn:
+            def cursor(self):
+                return state["cursor"]
+        yield Conn()
+
+    def execute_values(cur, sql, values, template=None, fetch=False):
+        state["upserts"].extend(row_key for _collection, row_key, _data, _hash in values)
+
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", "off")
+    monkeypatch.setattr(store, "init_db", lambda: None)
+    monkeypatch.setattr(store, "db_enabled", lambda: True)
+    monkeypatch.setattr(store, "_get_connection", connection)
+    monkeypatch.setattr(store, "execute_values", execute_values)
+    monkeypatch.setattr(store, "Json", lambda value: value)
+    return state
+
+
+def _won_marker_then_legacy(**extra):
+    # INSERT ... RETURNING collection → we created it; the legacy document exists
+    return ScriptedCursor(fetchone=[("pokedex",), (LEGACY,)], **extra)
+
+
+# ✅ First row upsert copies the legacy document before writing its own row
+def test_upsert_json_row_seeds(rows_db):
+    rows_db["cursor"] = _won_marker_then_legacy()
+
+    store.upsert_json_row("pokedex", 7, {"name": "Squirtle"}, fallback_loader=dict)
+
+    assert rows_db["upserts"] == ["1", "4", "7"]
+
+
+# ✅ First row delete seeds too, so the other Pokémon are not lost
+def test_delete_json_row_seeds(rows_db):
+    rows_db["cursor"] = _won_marker_then_legacy()
+
+    assert store.delete_json_row("pokedex", 4, fallback_loader=dict) is True
+
+    assert rows_db["upserts"] == ["1", "4"]
+    assert rows_db["cursor"].sql[-2].startswith("DELETE FROM app_json_rows")
+
+
+# ✅ A first full save seeds, then diffs against what was seeded
+def test_save_json_rows_seeds(rows_db):
+    stored_hashes = [(key, store.content_hash(entry)) for key, entry in LEGACY.items()]
+    rows_db["cursor"] = _won_marker_then_legacy(fetchall=[stored_hashes])
+
+    store.save_json_rows("pokedex", {"1": LEGACY["1"]}, fallback_loader=dict)
+
+    assert rows_db["upserts"] == ["1", "4"]  # only the seed; "1" is unchanged
+    assert any(sql.startswith("DELETE FROM app_json_rows") for sql in rows_db["cursor"].sql)
+
+
+# 🚫 A collection that already exists is not seeded again
+def test_existing_collection_is_not_reseeded(rows_db):
+    rows_db["cursor"] = ScriptedCursor(fetchone=[None])
+
+    store.upsert_json_row("pokedex", 7, {"name": "Squirtle"}, fallback_loader=lambda: pytest.fail("seeded twice"))
+
+    assert rows_db["upserts"] == ["7"]
@@ -0,0 +1,148 @@
+# tests/storage/test_save_verify.py
+#
+# 🔏 STORAGE_VERIFY_MODE: "hash" must compare what PostgreSQL actually stored
+# (md5(data::text)) with what we sent, "full" re-reads, "off" trusts the commit.
+
+from contextlib import contextmanager
+
+import pytest
+
+import utils.db_json_store as store
+from config import settings
+from utils.db_json_store import jsonb_md5, jsonb_text
+from utils.file_handler import save_pokedex
+from utils.storage_backends import get_backend
+
+DEX = {"1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1}}
+
+
+class FakeCursor:
+    """Records SQL and answers fetchone() from a script."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.sql = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.sql.append(sql)
+
+    def fetchone(self):
+        return self.results.pop(0)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Route db_json_store to a fake connection; returns the cursor factory."""
+    state = {"cursor": None, "rolled_back": 0}
+
+    @contextmanager
+    def connection():
+        class Conn:
+            def cursor(self):
+                return state["cursor"]
+        try:
+            yield Conn()
+        except Exception:
+            state["rolled_back"] += 1
+            raise
+
+    monkeypatch.setattr(store, "db_enabled", lambda: True)
+    monkeypatch.setattr(store, "init_db", lambda: None)
+    monkeypatch.setattr(store, "_get_connection", connection)
+    return state
+
+
+# 🧾 jsonb_text reproduces PostgreSQL's data::text for the values we store
+def test_jsonb_text_matches_postgres_output():
+    # SELECT '{"ptype":"Grass","level":5,"name":"Bulbasaur","id":1}'::jsonb::text
+    assert jsonb_text({"ptype": "Grass", "level": 5, "name": "Bulbasaur", "id": 1}) == (
+        '{"id": 1, "name": "Bulbasaur", "level": 5, "ptype": "Grass"}'
+    )
+    assert jsonb_text({"é": [1.5, 1e20, True, None], "b": {}}) == '{"b": {}, "é": [1.5, 100000000000000000000, true, null]}'
+    assert jsonb_text('say "hi"\n') == '"say \\"hi\\"\\n"'
+
+
+# ⚙️ Unknown modes fall back to the default "hash"
+@pytest.mark.parametrize("raw, mode", [("off", "off"), ("FULL", "full"), (" hash ", "hash"), ("bogus", "hash")])
+def test_verify_mode_setting(monkeypatch, raw, mode):
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", raw)
+
+    assert store.verify_mode() == mode
+
+
+# ❌ hash mode: a stored document that differs from ours fails and rolls back
+def test_hash_mode_rejects_a_different_stored_document(monkeypatch, fake_db):
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", "hash")
+    tampered = {"1": {**DEX["1"], "level": 50}}
+
+    fake_db["cursor"] = FakeCursor([(jsonb_md5(tampered), 2)])
+    with pytest.raises(RuntimeError, match="verification failed"):
+        store.save_json_document("pokedex", DEX)
+    assert fake_db["rolled_back"] == 1
+    assert "RETURNING md5(data::text), version" in fake_db["cursor"].sql[0]
+
+    fake_db["cursor"] = FakeCursor([(jsonb_md5(DEX), 3)])
+    assert store.save_json_document("pokedex", DEX) is True
+
+
+# 🙈 off mode asks PostgreSQL for no hash and checks nothing
+def test_off_mode_skips_the_hash(monkeypatch, fake_db):
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", "off")
+    fake_db["cursor"] = FakeCursor([(None, 2)])
+
+    assert store.save_json_document("pokedex", DEX) is True
+    assert "md5" not in fake_db["cursor"].sql[0]
+
+
+# ❌ rows layout: each row's stored md5 is checked the same way
+def test_hash_mode_rejects_a_different_stored_row(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", "hash")
+    calls = []
+
+    def execute_values(cur, sql, values, template=None, fetch=False):
+        calls.append((sql, fetch))
+        return [("1", jsonb_md5({**DEX["1"], "nickname": "Sneaky"}))] if fetch else None
+
+    monkeypatch.setattr(store, "execute_values", execute_values)
+    monkeypatch.setattr(store, "Json", lambda value: value)
+
+    with pytest.raises(RuntimeError, match="verification failed"):
+        store._upsert_rows(None, "pokedex", DEX)
+    assert "RETURNING row_key, md5(data::text)" in calls[0][0]
+
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", "off")
+    store._upsert_rows(None, "pokedex", DEX)
+    assert calls[1][1] is False and "RETURNING" not in calls[1][0]
+
+
+# 🔁 full mode re-reads the saved Pokédex; off and hash do not
+@pytest.mark.parametrize("mode, reads", [("full", 1), ("hash", 0), ("off", 0)])
+def test_full_mode_rereads(monkeypatch, mode, reads):
+    monkeypatch.setattr(settings, "STORAGE_VERIFY_MODE", mode)
+    backend = get_backend()
+    loads = []
+    real_load = backend.load
+    monkeypatch.setattr(backend, "load", lambda collection: loads.append(collection) or real_load(collection))
+
+    save_pokedex(DEX)
+
+    assert len(loads) == reads
+
+
+# 🐘 Live check that PostgreSQL's md5(data::text) agrees with jsonb_md5
+def test_jsonb_md5_matches_live_postgres():
+    if not store.db_enabled():
+        pytest.skip("needs a live PostgreSQL (DATABASE_URL outside TESTING)")
+
+    value = {"ptype": "Grass", "level": 5, "name": "Bulbasaür", "nickname": 'a "b"\n', "ratio": 0.25, "tags": [1, None, True]}
+
+    with store._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT md5(%s::jsonb::text);", (store.Json(value),))
+            assert cur.fetchone()[0] == jsonb_md5(value)
@@ -0,0 +1,116 @@
+# tests/storage/test_sqlite_store.py
+
+import sqlite3
+
+import pytest
+
+from config import settings
+from utils import sqlite_store
+from utils.db_json_store import DocumentConflictError
+from utils.storage_backends import get_backend
+from utils.file_handler import (
+    delete_pokedex_entry,
+    get_pokedex_entry,
+    insert_pokedex_entry,
+    invalidate_pokedex_cache,
+    load_pokedex,
+    patch_pokedex_entry,
+    pokedex_version,
+    save_pokedex,
+)
+from utils.team_handler import load_team, save_team
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch, tmp_path):
+    # 📓 A fresh SQLite file seeds itself from the JSON file
+    get_backend("file").replace("pokedex", {"1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1}})
+
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "pokemon.sqlite3"))
+    invalidate_pokedex_cache()
+    yield
+    sqlite_store.close_connection()
+    invalidate_pokedex_cache()
+
+
+# ✅ First load seeds SQLite from the JSON file
+def test_seeds_from_json_file(sqlite_backend):
+    pokedex = load_pokedex()
+
+    assert pokedex[1]["name"] == "Bulbasaur"
+    assert pokedex.version == 1
+
+
+# ✅ Point writes land in the table and bump the version probe
+def test_point_ops_bump_version(sqlite_backend):
+    load_pokedex()
+    before = pokedex_version()
+
+    insert_pokedex_entry(2, {"name": "Ivysaur", "level": 16, "ptype": "Grass"})
+    patch_pokedex_entry(2, {"level": 20, "nickname": "ivy"})
+
+    assert pokedex_version() != before
+    assert get_pokedex_entry(2)["level"] == 20
+
+    patch_pokedex_entry(2, {"nickname": None})
+    assert "nickname" not in get_pokedex_entry(2)
+
+    assert delete_pokedex_entry(2)["name"] == "Ivysaur"
+    assert get_pokedex_entry(2) is None
+
+
+# 🧹 Databases from older schemas lose the secondary indexes nothing queried
+def test_unused_indexes_are_dropped(monkeypatch, tmp_path):
+    path = tmp_path / "old.sqlite3"
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE pokemon (id INTEGER PRIMARY KEY, name TEXT, level INTEGER, ptype TEXT, nickname TEXT, data TEXT NOT NULL)")
+    old.execute("CREATE INDEX idx_pokemon_ptype ON pokemon (ptype)")
+    old.commit()
+    old.close()
+
+    sqlite_store.close_connection()
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(path))
+    try:
+        indexes = sqlite_store._connect().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'pokemon' AND sql IS NOT NULL"
+        ).fetchall()
+    finally:
+        sqlite_store.close_connection()
+
+    assert indexes == []
+
+
+# ⚔️ Concurrent saves merge; same-entry edits conflict
+def test_concurrent_saves_merge_or_conflict(sqlite_backend):
+    first = load_pokedex()
+    second = load_pokedex()
+
+    first[1]["level"] = 6
+    save_pokedex(first)
+
+    second[7] = {"name": "Squirtle", "level": 10, "ptype": "Water"}
+    save_pokedex(second)
+
+    merged = load_pokedex()
+    assert merged[1]["level"] == 6
+    assert 7 in merged
+
+    stale = load_pokedex()
+    fresh = load_pokedex()
+    fresh[1]["level"] = 50
+    save_pokedex(fresh)
+    stale[1]["level"] = 60
+
+    with pytest.raises(DocumentConflictError):
+        save_pokedex(stale)
+
+
+# ✅ Team keeps its order through the team table
+def test_team_round_trip(sqlite_backend):
+    save_team({
+        "4": {"name": "Charmander", "level": 8, "ptype": "Fire", "id": 4},
+        "1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass", "id": 1},
+    })
+
+    assert list(load_team().keys()) == ["4", "1"]
@@ -0,0 +1,77 @@
+# tests/storage/test_store_executor.py
+#
+# 🧵 Async routes run storage calls through run_in_store_executor, so one
+# slow query holds up only its own request — never the event loop.
+
+import asyncio
+import threading
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from core_app import core_app as app
+from utils.db_json_store import run_in_store_executor
+from utils.file_handler import save_pokedex
+from utils.storage_backends import get_backend
+
+DEX = {"1": {"name": "Bulbasaur", "level": 5, "ptype": "Grass"}}
+
+
+# ⏳ The loop keeps ticking while a storage call blocks its worker thread
+def test_executor_does_not_block_the_loop():
+    release = threading.Event()
+
+    async def scenario():
+        slow = asyncio.create_task(run_in_store_executor(release.wait, 5))
+        started = time.monotonic()
+        await asyncio.sleep(0.05)  # would only return after 5 s if the call ran on the loop
+        ticked = time.monotonic() - started
+        release.set()
+        return ticked, await slow
+
+    ticked, result = asyncio.run(scenario())
+
+    assert ticked < 1 and result is True
+
+
+# 🐢 A request stuck on a slow backend does not hold up the next request
+def test_slow_storage_call_does_not_block_other_requests(monkeypatch):
+    save_pokedex(DEX)
+    res = TestClient(app).post("/auth/login", json={"username": "ashketchum", "password": "pikapika"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    backend = get_backend()
+    real_version = backend.version
+    entered, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_first_version(collection):
+        calls.append(collection)
+        if len(calls) == 1:
+            entered.set()
+            release.wait(5)  # safety net: never hang the suite
+        return real_version(collection)
+
+    monkeypatch.setattr(backend, "version", slow_first_version)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            stuck = asyncio.create_task(client.get("/pokemon/stats", headers=headers))
+            while not entered.is_set():
+                await asyncio.sleep(0.01)
+
+            started = time.monotonic()
+            other = await client.get("/pokemon/stats", headers=headers)
+            elapsed = time.monotonic() - started
+            stuck_done = stuck.done()
+
+            release.set()
+            return other, elapsed, stuck_done, await stuck
+
+    other, elapsed, stuck_done, stuck = asyncio.run(scenario())
+
+    assert other.status_code == 200 and other.json()["count"] == 1
+    assert elapsed < 2 and not stuck_done
+    assert stuck.status_code == 200
@@ -0,0 +1,95 @@
+# tests/storage/test_tracing.py
+
+import queue
+
+import pytest
+
+from config import settings
+from utils import tracing
+from utils.tracing import flush_traces, get_tracer, trace_stats
+
+
+@pytest.fixture
+def trace_settings(monkeypatch, capsys):
+    # Drain breadcrumbs queued by the reset fixture before the test starts
+    flush_traces()
+    capsys.readouterr()
+
+    monkeypatch.setattr(settings, "TRACE_LEVEL", "info")
+    monkeypatch.setattr(settings, "TRACE_LEVELS", "")
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 1.0)
+    return settings
+
+
+def _written(capsys):
+    flush_traces()
+    return capsys.readouterr().out.splitlines()
+
+
+# 🎚️ Levels come from the event name and can be overridden per tag
+def test_level_gating(trace_settings, capsys, monkeypatch):
+    trace = get_tracer("TEST_BC")
+
+    trace("LOAD_ENTER", n=1)
+    trace("LOAD_OK", n=2)
+    trace("LOAD_ERR", n=3)
+    assert _written(capsys) == ["[TEST_BC] LOAD_OK n=2", "[TEST_BC] LOAD_ERR n=3"]
+
+    monkeypatch.setattr(settings, "TRACE_LEVELS", "TEST_BC=error,OTHER_BC=debug")
+    trace("LOAD_OK")
+    trace.error("LOAD_FAILED")
+    assert _written(capsys) == ["[TEST_BC] LOAD_FAILED"]
+
+
+# ⏳ Lambda fields are only built when the event is written
+def test_lazy_fields(trace_settings, capsys):
+    trace = get_tracer("TEST_BC")
+    calls = []
+
+    def summary():
+        calls.append(1)
+        return {"1": "Sparky"}
+
+    trace.debug("SAVE_OK", nicknames=summary)
+    assert calls == []
+
+    trace("SAVE_OK", nicknames=summary)
+    assert _written(capsys) == ["[TEST_BC] SAVE_OK nicknames={'1': 'Sparky'}"]
+    assert calls == [1]
+
+
+# 🙈 Redacted keys are hidden, long values clipped
+def test_redact_and_clip(trace_settings, capsys):
+    get_tracer("TEST_DB_BC", redact=("url",))("CONNECT_OK", database_url="postgres://secret", pool=2)
+    get_tracer("TEST_CLIP_BC", clip=5)("LONG_OK", value="abcdefgh")
+
+    assert _written(capsys) == [
+        "[TEST_DB_BC] CONNECT_OK database_url='***hidden***' pool=2",
+        "[TEST_CLIP_BC] LONG_OK value='abcd…",
+    ]
+
+
+# 🎲 Sampling drops info/debug events but never errors
+def test_sampling_keeps_errors(trace_settings, capsys, monkeypatch):
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+    trace = get_tracer("TEST_BC")
+    sampled_out = trace_stats()["sampled_out"]
+
+    trace("LOAD_OK")
+    trace("LOAD_ERR")
+
+    assert _written(capsys) == ["[TEST_BC] LOAD_ERR"]
+    assert trace_stats()["sampled_out"] == sampled_out + 1
+
+
+# 🚰 A full queue drops lines instead of blocking the caller
+def test_full_queue_drops(trace_settings, monkeypatch):
+    full = queue.Queue(maxsize=1)
+    full.put_nowait("pending")
+    monkeypatch.setattr(tracing, "_queue", lambda: full)
+    dropped = trace_stats()["dropped"]
+
+    get_tracer("TEST_BC")("LOAD_OK")
+
+    assert trace_stats()["dropped"] == dropped + 1
+    assert full.qsize() == 1
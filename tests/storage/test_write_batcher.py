@@ -0,0 +1,92 @@
+# tests/storage/test_write_batcher.py
+
+import asyncio
+
+import pytest
+
+from utils.write_batcher import WriteBatcher
+
+
+def _memory_batcher(window_ms=20, max_batch=100):
+    store = {"doc": {}, "saves": 0}
+
+    async def load():
+        return dict(store["doc"])
+
+    async def save(doc):
+        store["saves"] += 1
+        store["doc"] = dict(doc)
+
+    return WriteBatcher("test", load, save, window_ms=window_ms, max_batch=max_batch), store
+
+
+def _put(key, value):
+    def mutation(doc):
+        doc[key] = value
+        return key
+    return mutation
+
+
+# ✅ Writes inside one window → one save, every caller gets its own result
+def test_concurrent_writes_share_one_save():
+    batcher, store = _memory_batcher()
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(_put(i, i * 10)) for i in range(10)))
+
+    results = asyncio.run(run())
+
+    assert results == list(range(10))
+    assert store["saves"] == 1
+    assert store["doc"] == {i: i * 10 for i in range(10)}
+
+
+# ❌ A failing mutation only fails its own caller
+def test_failed_mutation_does_not_sink_batch():
+    batcher, store = _memory_batcher()
+
+    def boom(doc):
+        raise ValueError("bad write")
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(_put("a", 1)),
+            batcher.submit(boom),
+            batcher.submit(_put("b", 2)),
+            return_exceptions=True,
+        )
+
+    ok_a, failed, ok_b = asyncio.run(run())
+
+    assert (ok_a, ok_b) == ("a", "b")
+    assert isinstance(failed, ValueError)
+    assert store["doc"] == {"a": 1, "b": 2}
+    assert store["saves"] == 1
+
+
+# 🚪 Window of 0 → plain load / mutate / save per call
+def test_disabled_batcher_saves_every_write():
+    batcher, store = _memory_batcher(window_ms=0)
+
+    async def run():
+        for i in range(3):
+            await batcher.submit(_put(i, i))
+
+    asyncio.run(run())
+
+    assert not batcher.enabled
+    assert store["saves"] == 3
+
+
+# 🧺 Hitting max_batch flushes without waiting for the window
+def test_full_batch_flushes_early():
+    batcher, store = _memory_batcher(window_ms=60_000, max_batch=2)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit(_put("x", 1)), batcher.submit(_put("y", 2))),
+            timeout=5,
+        )
+
+    assert asyncio.run(run()) == ["x", "y"]
+    assert store["saves"] == 1
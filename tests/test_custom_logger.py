@@ -0,0 +1,72 @@
+# tests/test_custom_logger.py
+
+import logging
+import queue
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from core_app import core_app
+from custom_logger import _BoundedQueueHandler, _Listener, _parse_levels, flush_logs, logging_stats
+
+
+class _StalledHandler(logging.Handler):
+    """Stands in for a log disk that stops responding."""
+
+    def __init__(self):
+        super().__init__()
+        self.unstall = threading.Event()
+
+    def emit(self, record):
+        self.unstall.wait(5)
+
+
+def _isolated_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+# 🚰 A stalled writer fills the queue; callers drop records instead of waiting
+def test_stalled_disk_never_blocks_callers():
+    log_queue = queue.Queue(maxsize=5)
+    stalled = _StalledHandler()
+    listener = _Listener(log_queue, stalled)
+    listener.start()
+    logger = _isolated_logger("test_stalled_logger", _BoundedQueueHandler(log_queue))
+    dropped = logging_stats()["dropped"]
+
+    try:
+        start = time.perf_counter()
+        for i in range(50):
+            logger.info("record %s", i)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1
+        assert logging_stats()["dropped"] > dropped
+    finally:
+        stalled.unstall.set()
+        listener.stop()
+
+
+# 🎚️ LOG_LEVELS overrides single loggers and ignores junk
+def test_level_overrides():
+    levels = _parse_levels("api_info=DEBUG, uvicorn=warning,broken,api_error=LOUD")
+
+    assert levels["api_info"] == logging.DEBUG
+    assert levels["uvicorn"] == logging.WARNING
+    assert levels["api_error"] == logging.ERROR
+    assert "broken" not in levels
+
+
+# 🌐 Request lines still reach logs/middleware_logs.txt, via the writer thread
+def test_middleware_line_written():
+    client = TestClient(core_app)
+    client.get("/pokemon/1?logcheck=1")
+    flush_logs()
+
+    with open("logs/middleware_logs.txt", encoding="utf-8") as f:
+        assert "GET /pokemon/1 |" in f.read().splitlines()[-1]
@@ -106,3 +106,25 @@ def test_upload_as_trainer():
 
     assert response.status_code == 403
     assert response.json()["detail"].lower() in ["forbidden", "not authorized"]
+
+# 🔢 Test 5: Imported rows get one contiguous block of fresh IDs
+def test_upload_csv_allocates_id_block(monkeypatch):
+    token = get_admin_token()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    store = {5: {"name": "Charmeleon", "level": 16, "ptype": "Fire", "id": 5}}
+    monkeypatch.setattr("routers.upload_csv.load_pokedex", lambda: dict(store))
+    monkeypatch.setattr("routers.upload_csv.save_pokedex", store.update)
+    monkeypatch.setattr("routers.upload_csv.allocate_pokemon_ids", lambda count: 6)
+
+    csv_content = b"name,type,level\nPidgey,Normal,4\nRattata,Normal,3\nSpearow,Normal,5\n"
+
+    response = client.post(
+        "/upload/csv",
+        headers=headers,
+        files={"file": ("three.csv", BytesIO(csv_content), "text/csv")}
+    )
+
+    assert response.status_code == 201
+    assert sorted(store) == [5, 6, 7, 8]
+    assert store[8]["name"] == "Spearow"
@@ -0,0 +1,103 @@
+import os
+import struct
+import zlib
+from typing import Any, Optional
+
+try:
+    import orjson
+except Exception as import_error:
+    orjson = None
+    ORJSON_IMPORT_ERROR = import_error
+else:
+    ORJSON_IMPORT_ERROR = None
+
+# 📦 Binary sidecar for a JSON snapshot (e.g. data/pokedex.json → data/pokedex.bin)
+#
+# Layout: header + orjson payload
+#   magic        8s   b"PDXSNAP\0"
+#   format       H    FORMAT_VERSION
+#   src_mtime_ns q    mtime of the JSON snapshot this was built from
+#   src_size     q    size  of the JSON snapshot this was built from
+#   payload_len  Q
+#   crc32        I    of the payload
+#
+# The JSON file stays the source of truth. The sidecar is used only while
+# its stamp matches the JSON file's stat and the checksum holds; anything
+# else (edited JSON, torn write, old format, no orjson) falls back to JSON.
+
+MAGIC = b"PDXSNAP\0"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHqqQI")
+
+
+def available() -> bool:
+    return orjson is not None
+
+
+def _source_stamp(source_path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(source_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write(path: str, source_path: str, data: Any, fsync: bool = False) -> bool:
+    """
+    Write `data` as a binary snapshot stamped with `source_path`'s current stat.
+    Call it right after the JSON snapshot was written. Returns False when
+    orjson is missing or the source does not exist.
+    """
+    stamp = _source_stamp(source_path)
+    if orjson is None or stamp is None:
+        return False
+
+    payload = orjson.dumps(data)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, stamp[0], stamp[1], len(payload), zlib.crc32(payload))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+
+def read(path: str, source_path: str) -> Optional[Any]:
+    """
+    Return the decoded snapshot, or None when it is missing, stale or damaged.
+    """
+    if orjson is None:
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return None
+
+    if len(blob) < _HEADER.size:
+        return None
+
+    magic, fmt, src_mtime_ns, src_size, payload_len, crc = _HEADER.unpack_from(blob)
+
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        return None
+    if _source_stamp(source_path) != (src_mtime_ns, src_size):
+        return None
+
+    payload = memoryview(blob)[_HEADER.size:]
+    if len(payload) != payload_len or zlib.crc32(payload) != crc:
+        return None
+
+    return orjson.loads(payload)
+
+
+def remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
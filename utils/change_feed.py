@@ -0,0 +1,211 @@
+import asyncio
+import itertools
+import secrets
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from config import settings
+from utils.tracing import get_tracer
+
+# 📡 Change feed: insert / update / delete events for the Pokédex and the team,
+# pushed to SSE and WebSocket clients (routers/feed.py) instead of polling.
+#
+#   seq      one counter for every event of this process, strictly increasing
+#   cursor   "<epoch>:<seq>" — the epoch changes on restart, so a client never
+#            resumes against a counter that started over
+#   ring     the last FEED_RETENTION events; a client reconnecting with a
+#            cursor still in the ring gets exactly the events it missed
+#   buffer   FEED_CLIENT_BUFFER undelivered events per client. A client that
+#            falls further behind is cut off with an "overflow" event and
+#            resumes from its cursor — a slow reader never grows memory.
+#
+# Events are published by the routes after their write is saved. The feed is
+# per process: with several workers each one only sees its own writes.
+
+_feed_bc = get_tracer("FEED_BC")
+
+
+class InvalidFeedCursorError(ValueError):
+    """The cursor is not "<epoch>:<seq>"."""
+
+
+class Subscription:
+    """
+    One client's view of the feed: the replay backlog (events it missed)
+    followed by live events, through a bounded buffer.
+
+    Iterate with `async for`; the control events "reset" (cursor too old or
+    from another process — refetch everything) and "overflow" (fell behind —
+    reconnect with the last cursor) are yielded like any other event.
+    """
+
+    def __init__(self, feed: "ChangeFeed", buffer: int, loop: asyncio.AbstractEventLoop):
+        self._feed = feed
+        self._replay: Deque[dict] = deque()  # missed events; not counted against the buffer
+        self._buffer: Deque[dict] = deque()
+        self._max = buffer
+        self._loop = loop
+        self._ready = asyncio.Event()
+        self._cut: Optional[dict] = None  # overflow / shutdown event that ends the stream
+        self._done = False
+        self.last_seq = 0
+
+    def _offer(self, event: dict) -> None:
+        # Runs on the subscriber's loop (call_soon_threadsafe from publish)
+        if self._cut is not None:
+            return
+        if len(self._buffer) >= self._max:
+            self._buffer.clear()
+            self._cut = self._feed._control("overflow", self.last_seq)
+            self._feed._forget(self)
+            _feed_bc("FEED_CLIENT_OVERFLOW", buffer=self._max, resume_after=self.last_seq)
+        else:
+            self._buffer.append(event)
+        self._ready.set()
+
+    def end(self) -> None:
+        """Finish the stream with a "closed" event (shutdown, client gone)."""
+        if self._cut is None:
+            self._cut = self._feed._control("closed", self.last_seq)
+        self._ready.set()
+
+    def close(self) -> None:
+        self._feed._forget(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        while not self._replay and not self._buffer:
+            if self._done:
+                raise StopAsyncIteration
+            if self._cut is not None:
+                self._done = True
+                return self._cut
+            self._ready.clear()
+            await self._ready.wait()
+
+        event = (self._replay or self._buffer).popleft()
+        self.last_seq = event.get("seq", self.last_seq)
+        return event
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """Next event, or None after `timeout` seconds of silence (heartbeat)."""
+        try:
+            return await asyncio.wait_for(self.__anext__(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """
+    Sequenced change events with a retention ring for resumable cursors.
+
+    publish() is thread-safe (sync routes run in the threadpool, TestClient
+    runs each request on its own loop); every subscriber receives events on
+    its own loop, in seq order.
+    """
+
+    def __init__(self, retention: Optional[int] = None, buffer: Optional[int] = None):
+        self.retention = max(1, int(retention if retention is not None else settings.FEED_RETENTION))
+        self.buffer = max(1, int(buffer if buffer is not None else settings.FEED_CLIENT_BUFFER))
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._ring: Deque[dict] = deque(maxlen=self.retention)
+        self._subscribers: Set[Subscription] = set()
+        self.epoch = secrets.token_hex(4)
+        self.stats = {"published": 0, "overflows": 0, "resets": 0}
+
+    def cursor(self, seq: int) -> str:
+        return f"{self.epoch}:{seq}"
+
+    def parse_cursor(self, cursor: str) -> Tuple[str, int]:
+        epoch, sep, seq = str(cursor).partition(":")
+        if not sep or not epoch or not seq.isdigit():
+            raise InvalidFeedCursorError(f"Invalid feed cursor {cursor!r}")
+        return epoch, int(seq)
+
+    def _control(self, kind: str, resume_after: int) -> dict:
+        if kind == "overflow":
+            self.stats["overflows"] += 1
+        elif kind == "reset":
+            self.stats["resets"] += 1
+        return {"type": kind, "cursor": self.cursor(resume_after)}
+
+    def publish(self, collection: str, op: str, pid: Any, data: Optional[dict] = None) -> int:
+        """Record one change and push it to every subscriber. Returns its seq."""
+        with self._lock:
+            seq = next(self._seq)
+            self._last_seq = seq
+            event = {
+                "type": "change",
+                "seq": seq,
+                "cursor": self.cursor(seq),
+                "collection": collection,
+                "op": op,
+                "id": pid,
+                "data": data,
+            }
+            self._ring.append(event)
+            self.stats["published"] += 1
+
+            # Scheduled under the lock, so every loop sees events in seq order
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber._loop.call_soon_threadsafe(subscriber._offer, event)
+                except RuntimeError:  # that client's loop is gone
+                    self._subscribers.discard(subscriber)
+
+        _feed_bc("FEED_PUBLISH", seq=seq, collection=collection, op=op, pid=pid)
+        return seq
+
+    def subscribe(self, cursor: Optional[str] = None) -> Subscription:
+        """
+        Start a subscription. With a cursor, first replay the retained events
+        after it; a cursor from another epoch or older than the ring starts
+        with a "reset" event instead (the client must refetch).
+
+        Raises InvalidFeedCursorError for a malformed cursor.
+        """
+        after = self.parse_cursor(cursor) if cursor else None
+        subscription = Subscription(self, self.buffer, asyncio.get_running_loop())
+
+        with self._lock:
+            if after is None:
+                subscription.last_seq = self._last_seq
+            else:
+                epoch, seq = after
+                oldest = self._ring[0]["seq"] if self._ring else self._last_seq + 1
+                if epoch != self.epoch or seq > self._last_seq or seq < oldest - 1:
+                    subscription._replay.append(self._control("reset", self._last_seq))
+                    subscription.last_seq = self._last_seq
+                else:
+                    subscription._replay.extend(event for event in self._ring if event["seq"] > seq)
+                    subscription.last_seq = seq
+            self._subscribers.add(subscription)
+
+        _feed_bc("FEED_SUBSCRIBE", cursor=cursor, backlog=len(subscription._replay), clients=len(self._subscribers))
+        return subscription
+
+    def _forget(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def close(self) -> None:
+        """End every open stream (shutdown)."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscriber in subscribers:
+            try:
+                subscriber._loop.call_soon_threadsafe(subscriber.end)
+            except RuntimeError:
+                pass
+
+    def feed_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "last_seq": self._last_seq, "retained": len(self._ring), "clients": len(self._subscribers)}
+
+
+# 📡 The process-wide feed
+change_feed = ChangeFeed()
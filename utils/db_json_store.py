@@ -1,81 +1,285 @@
+import asyncio
+import functools
+import hashlib
+import json
 import os
+import threading
+import time
 import traceback
-from typing import Any, Callable, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import settings
+from utils.tracing import get_tracer
 
 try:
     import psycopg2
-    from psycopg2.extras import Json
+    from psycopg2.extensions import connection as _PgConnection
+    from psycopg2.extras import Json, execute_values, register_default_jsonb
+    from psycopg2.pool import ThreadedConnectionPool
 except Exception as import_error:
     psycopg2 = None
+    _PgConnection = object
     Json = None
+    execute_values = None
+    register_default_jsonb = None
+    ThreadedConnectionPool = None
     PSYCOPG_IMPORT_ERROR = import_error
 else:
     PSYCOPG_IMPORT_ERROR = None
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 
 STORE_TABLE = "app_json_store"
+ROWS_TABLE = "app_json_rows"
+COLLECTIONS_TABLE = "app_json_collections"
+ID_COUNTERS_TABLE = "app_id_counters"
 _INIT_DONE = False
 
+STORAGE_LAYOUTS = ("document", "rows")
+STORAGE_BACKENDS = ("auto", "postgres", "sqlite", "file", "memory")
+VERIFY_MODES = ("off", "hash", "full")
 
-def _db_log(message: str) -> None:
-    """
-    Test-safe DB logger.
-    In pytest, stay quiet.
-    In Render/local app runs, print breadcrumbs.
-    """
-    if os.getenv("TESTING") != "1":
-        print(message, flush=True)
+# ✅ Process-wide connection pool (created lazily on first DB use)
+_POOL = None
+_POOL_PID: Optional[int] = None
+_POOL_SLOTS: Optional[threading.BoundedSemaphore] = None
+_POOL_LOCK = threading.Lock()
 
+# Connections the pool kept open when they were handed back (see _get_connection)
+_POOL_WARM: "weakref.WeakSet" = weakref.WeakSet()
+
+# ✅ Dedicated executor for async callers (see run_in_store_executor)
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+_POOL_STATS: Dict[str, int] = {
+    "connections_opened": 0,
+    "checkouts": 0,
+    "in_use": 0,
+    "health_checks": 0,
+    "stale_discarded": 0,
+    "broken_discarded": 0,
+    "closed_above_min": 0,
+    "wait_timeouts": 0,
+}
 
-def _db_bc(event: str, **fields) -> None:
-    """
-    Database breadcrumb logger.
 
-    These breadcrumbs prove:
-    - whether DATABASE_URL is being used
-    - whether data is loading from Neon
-    - whether data is saving to Neon
-    - whether the app fell back to JSON files
+class PooledConnection(_PgConnection):
+    """
+    psycopg2 connection that carries its own pool bookkeeping, so a new
+    connection can never inherit a closed one's state through a reused id().
     """
-    try:
-        safe_fields = {}
 
-        for key, value in fields.items():
-            if "url" in key.lower() or "password" in key.lower() or "secret" in key.lower():
-                safe_fields[key] = "***hidden***"
-            else:
-                safe_fields[key] = value
+    pool_last_used: Optional[float] = None  # None = just opened, not prepared yet
 
-        parts = " ".join(f"{k}={repr(v)}" for k, v in safe_fields.items())
-        _db_log(f"[DB_BC] {event}" + (f" {parts}" if parts else ""))
 
-    except Exception as e:
-        _db_log(f"[DB_BC] {event} breadcrumb_error={type(e).__name__}:{e}")
+# 🧵 Database breadcrumbs (utils/tracing) — prove whether Neon or the JSON
+# fallback is in use. Connection strings and secrets are never printed.
+_db_bc = get_tracer("DB_BC", redact=("url", "password", "secret"))
 
 
 def _database_url() -> str:
     return os.getenv("DATABASE_URL", "").strip()
 
 
+def storage_backend() -> str:
+    """
+    Which backend stores the Pokédex/team, from STORAGE_BACKEND:
+    - 'auto' (default): PostgreSQL when DATABASE_URL is set, JSON files otherwise
+    - 'postgres': same as auto (falls back to files without DATABASE_URL)
+    - 'sqlite': embedded SQLite file (SQLITE_PATH), no server needed
+    - 'file': JSON files even if DATABASE_URL is set
+    - 'memory': per-process dicts, nothing persisted (tests/benchmarks)
+
+    PostgreSQL is never used under pytest; SQLite/file may be chosen explicitly.
+    """
+    choice = (settings.STORAGE_BACKEND or "auto").strip().lower()
+
+    if choice not in STORAGE_BACKENDS:
+        _db_bc("STORAGE_BACKEND_UNKNOWN", backend=choice, using="auto")
+        choice = "auto"
+
+    if choice in ("sqlite", "file", "memory"):
+        return choice
+
+    if _database_url() and os.getenv("TESTING") != "1":
+        return "postgres"
+
+    return "file"
+
+
 def db_enabled() -> bool:
     """
-    DB is enabled only when DATABASE_URL exists and we are not in pytest mode.
+    PostgreSQL is enabled only when DATABASE_URL exists, we are not in
+    pytest mode and STORAGE_BACKEND does not pick another backend.
 
     This preserves your local/test behavior:
     - Local without DATABASE_URL: old JSON files still work
     - Render with DATABASE_URL: Neon DB is used
     - Pytest: JSON/test files stay isolated
     """
-    return bool(_database_url()) and os.getenv("TESTING") != "1"
+    return storage_backend() == "postgres"
 
 
-def _get_connection():
+def _create_pool():
+    """
+    Build the ThreadedConnectionPool for the current process.
+
+    Called under _POOL_LOCK. A forked worker never reuses its parent's
+    sockets, so the pool is rebuilt whenever the PID changes.
+
+    psycopg2 keeps at most `minconn` idle connections: a connection handed
+    back while that many are already idle is closed. Only DB_POOL_MIN_SIZE
+    connections stay warm; bursts above it reconnect.
+    """
+    global _POOL, _POOL_PID, _POOL_SLOTS
+
+    min_size = max(0, int(settings.DB_POOL_MIN_SIZE))
+    max_size = max(1, int(settings.DB_POOL_MAX_SIZE), min_size)
+
+    try:
+        _POOL = ThreadedConnectionPool(
+            min_size,
+            max_size,
+            _database_url(),
+            connect_timeout=settings.DB_CONNECT_TIMEOUT,
+            connection_factory=PooledConnection,
+        )
+        _POOL_PID = os.getpid()
+        _POOL_SLOTS = threading.BoundedSemaphore(max_size)
+        _POOL_WARM.clear()
+
+        _db_bc("DB_POOL_CREATED", min_size=min_size, max_size=max_size)
+        return _POOL
+
+    except Exception as e:
+        _db_bc(
+            "DB_CONNECT_ERR",
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def storage_layout() -> str:
+    """
+    Which PostgreSQL layout is active:
+    - 'document': one JSONB row per collection in app_json_store (original)
+    - 'rows': one JSONB row per Pokémon / team slot in app_json_rows
+    """
+    layout = (settings.DB_STORAGE_LAYOUT or "document").strip().lower()
+
+    if layout not in STORAGE_LAYOUTS:
+        _db_bc("DB_STORAGE_LAYOUT_UNKNOWN", layout=layout, using="document")
+        return "document"
+
+    return layout
+
+
+def verify_mode() -> str:
+    """
+    How saves are verified after a successful DB write:
+    - 'off': trust the commit
+    - 'hash': the write itself RETURNs md5(data::text) of what PostgreSQL
+      stored, compared with jsonb_md5() of what we sent (no extra read)
+    - 'full': re-load and re-normalize the whole document (old behavior, slow)
+    """
+    mode = (settings.STORAGE_VERIFY_MODE or "hash").strip().lower()
+
+    if mode not in VERIFY_MODES:
+        _db_bc("STORAGE_VERIFY_MODE_UNKNOWN", mode=mode, using="hash")
+        return "hash"
+
+    return mode
+
+
+def jsonb_text(value: Any) -> str:
+    """
+    The text PostgreSQL prints for `value` stored as JSONB (data::text).
+
+    jsonb keeps no key order or whitespace of its own: keys are ordered by
+    byte length, then bytewise, and printed as {"k": v, ...}; numbers are
+    printed as PostgreSQL numerics (no exponent).
+    """
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return str(int(value))
+    if isinstance(value, float):
+        return format(Decimal(repr(abs(value) if value == 0 else value)), "f")
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, dict):
+        items = sorted(
+            ((_jsonb_key(k).encode("utf-8"), v) for k, v in value.items()),
+            key=lambda item: (len(item[0]), item[0]),
+        )
+        return "{" + ", ".join(
+            f"{json.dumps(k.decode('utf-8'), ensure_ascii=False)}: {jsonb_text(v)}" for k, v in items
+        ) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(jsonb_text(v) for v in value) + "]"
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _jsonb_key(key: Any) -> str:
+    # Same key conversion as json.dumps (what psycopg2's Json adapter sends)
+    return key if isinstance(key, str) else json.dumps(key)
+
+
+def jsonb_md5(value: Any) -> str:
+    """md5 PostgreSQL computes for md5(data::text) once `value` is stored."""
+    return hashlib.md5(jsonb_text(value).encode("utf-8")).hexdigest()
+
+
+def _check_returned_hashes(what: str, expected: Dict[str, str], returned: Dict[str, str]) -> None:
     """
-    Open a fresh PostgreSQL connection.
+    Raise if the hashes of what PostgreSQL stored (RETURNING md5(data::text))
+    differ from jsonb_md5() of what we sent. Raising inside the connection
+    block rolls the write back.
+    """
+    mismatched = [k for k, h in expected.items() if returned.get(k) != h]
+
+    if mismatched:
+        _db_bc("SAVE_VERIFY_HASH_MISMATCH", what=what, keys=mismatched[:20])
+        raise RuntimeError(f"Save verification failed for {what}: {len(mismatched)} mismatched")
+
+
+def rows_layout_enabled() -> bool:
+    return db_enabled() and storage_layout() == "rows"
 
-    We intentionally open short-lived connections for safety on Render Free.
-    This avoids long stale connections after sleep/wake cycles.
+
+def content_hash(data: Any) -> str:
+    """
+    Stable hash of a JSON value.
+
+    Keys are sorted and whitespace is stripped, so two dicts with the same
+    content always hash the same regardless of insertion order.
     """
+    encoded = json.dumps(
+        data,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _get_pool():
     if not db_enabled():
         raise RuntimeError("DATABASE_URL is not configured, DB storage is disabled.")
 
@@ -89,19 +293,231 @@ def _get_connection():
             "psycopg2-binary is missing. Add psycopg2-binary==2.9.10 to requirements.txt"
         )
 
+    if _POOL is not None and _POOL_PID == os.getpid():
+        return _POOL
+
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_PID == os.getpid():
+            return _POOL
+        return _create_pool()
+
+
+def _connection_is_healthy(conn) -> bool:
+    """
+    Ping a connection that has been idle for a while.
+
+    Render Free sleeps the service and Neon suspends idle computes, so a
+    pooled socket can be dead after a sleep/wake cycle even though
+    conn.closed still reports 0.
+    """
+    _POOL_STATS["health_checks"] += 1
+
     try:
-        conn = psycopg2.connect(_database_url(), connect_timeout=10)
-        _db_bc("DB_CONNECT_OK")
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1;")
+            cur.fetchone()
+        conn.rollback()
+        return True
+    except Exception as e:
+        _db_bc("DB_POOL_HEALTH_CHECK_FAILED", err_type=type(e).__name__, err=str(e))
+        return False
+
+
+def _prepare_connection(conn) -> None:
+    """
+    One-time setup of a connection the pool just opened.
+
+    ⚡ JSONB is decoded with orjson (same values, faster parse) when it is
+    installed and DB_JSONB_ORJSON is on. The loader is registered on this
+    connection only, so any other psycopg2 user in the process keeps the
+    default json.loads.
+    """
+    if orjson is not None and settings.DB_JSONB_ORJSON:
+        register_default_jsonb(conn_or_curs=conn, loads=orjson.loads)
+
+
+def _checkout(pool):
+    """
+    Take a usable connection out of the pool.
+
+    Closed or stale connections are discarded and replaced, up to one full
+    pool's worth of attempts. A connection with no pool_last_used yet was
+    just opened by the pool and gets _prepare_connection() first.
+    """
+    idle_limit = float(settings.DB_POOL_IDLE_CHECK_SECONDS)
+    attempts = max(1, int(settings.DB_POOL_MAX_SIZE)) + 1
+
+    for _ in range(attempts):
+        conn = pool.getconn()
+        last_used = conn.pool_last_used
+
+        if last_used is None:
+            _POOL_STATS["connections_opened"] += 1
+            _prepare_connection(conn)
+            _db_bc("DB_CONNECT_OK")
+            return conn
+
+        if conn.closed:
+            _POOL_STATS["broken_discarded"] += 1
+            _POOL_WARM.discard(conn)
+            pool.putconn(conn, close=True)
+            continue
+
+        if time.monotonic() - last_used >= idle_limit and not _connection_is_healthy(conn):
+            _POOL_STATS["stale_discarded"] += 1
+            _POOL_WARM.discard(conn)
+            pool.putconn(conn, close=True)
+            continue
+
         return conn
 
-    except Exception as e:
-        _db_bc(
-            "DB_CONNECT_ERR",
-            err_type=type(e).__name__,
-            err=str(e),
-            traceback=traceback.format_exc(),
-        )
-        raise
+    raise RuntimeError("Could not obtain a healthy PostgreSQL connection from the pool.")
+
+
+@contextmanager
+def _get_connection():
+    """
+    Borrow a pooled PostgreSQL connection for one unit of work.
+
+    Commits when the block succeeds, rolls back when it raises, and always
+    hands the connection back to the pool. Broken connections are closed
+    instead of being returned.
+    """
+    pool = _get_pool()
+    slots = _POOL_SLOTS
+
+    if not slots.acquire(timeout=float(settings.DB_POOL_TIMEOUT_SECONDS)):
+        _POOL_STATS["wait_timeouts"] += 1
+        _db_bc("DB_POOL_WAIT_TIMEOUT", max_size=settings.DB_POOL_MAX_SIZE)
+        raise RuntimeError("Timed out waiting for a free PostgreSQL connection.")
+
+    conn = None
+    discard = False
+
+    try:
+        try:
+            conn = _checkout(pool)
+        except Exception as e:
+            _db_bc(
+                "DB_CONNECT_ERR",
+                err_type=type(e).__name__,
+                err=str(e),
+                traceback=traceback.format_exc(),
+            )
+            raise
+
+        _POOL_STATS["checkouts"] += 1
+        _POOL_STATS["in_use"] += 1
+
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            raise
+
+    finally:
+        if conn is not None:
+            _POOL_STATS["in_use"] -= 1
+            discard = discard or bool(conn.closed)
+
+            if discard:
+                _POOL_STATS["broken_discarded"] += 1
+            else:
+                # Set before putconn: once back in the pool another thread may take it
+                conn.pool_last_used = time.monotonic()
+                _POOL_WARM.add(conn)
+
+            try:
+                pool.putconn(conn, close=discard)
+            except Exception as e:
+                _db_bc("DB_POOL_PUTCONN_ERR", err_type=type(e).__name__, err=str(e))
+
+            if conn.closed:
+                # Broken, or returned while DB_POOL_MIN_SIZE were already idle
+                _POOL_WARM.discard(conn)
+                if not discard:
+                    _POOL_STATS["closed_above_min"] += 1
+
+        slots.release()
+
+
+def close_pool() -> None:
+    """
+    Close every pooled connection. Safe to call when no pool exists.
+    """
+    global _POOL, _POOL_PID, _POOL_SLOTS
+
+    with _POOL_LOCK:
+        if _POOL is None:
+            return
+
+        try:
+            if _POOL_PID == os.getpid():
+                _POOL.closeall()
+            _db_bc("DB_POOL_CLOSED")
+        except Exception as e:
+            _db_bc("DB_POOL_CLOSE_ERR", err_type=type(e).__name__, err=str(e))
+        finally:
+            _POOL = None
+            _POOL_PID = None
+            _POOL_SLOTS = None
+            _POOL_WARM.clear()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+
+    if _EXECUTOR is not None:
+        return _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # One thread per pooled connection: storage calls never queue
+            # inside the pool, they queue here instead, off the event loop.
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, int(settings.DB_POOL_MAX_SIZE)),
+                thread_name_prefix="json-store",
+            )
+        return _EXECUTOR
+
+
+async def run_in_store_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking storage call without blocking the event loop.
+
+    psycopg2 and file I/O are synchronous; async routes await this instead
+    of calling them directly, so one slow query only holds up its own
+    request.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_store_executor() -> None:
+    global _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=True)
+            _EXECUTOR = None
+
+
+def pool_stats() -> dict:
+    """
+    Snapshot of pool counters for storage_debug() and health endpoints.
+    """
+    return {
+        "active": _POOL is not None and _POOL_PID == os.getpid(),
+        "min_size": settings.DB_POOL_MIN_SIZE,
+        "max_size": settings.DB_POOL_MAX_SIZE,
+        "idle_check_seconds": settings.DB_POOL_IDLE_CHECK_SECONDS,
+        "warm_connections": len(_POOL_WARM),
+        **_POOL_STATS,
+    }
 
 
 def init_db() -> None:
@@ -114,6 +530,13 @@ def init_db() -> None:
 
     This keeps the migration low-risk and dynamic.
     Future fields inside Pokémon/team objects will persist automatically.
+
+    The row layout tables are created alongside, so switching
+    DB_STORAGE_LAYOUT never needs a manual migration:
+    - app_json_rows holds one row per (collection, row_key)
+    - app_json_collections records which collections have been seeded,
+      plus a version counter bumped on every row write (cheap cache probe)
+    - app_id_counters holds the next free id per collection (allocate_ids)
     """
     global _INIT_DONE
 
@@ -134,6 +557,34 @@ def init_db() -> None:
                         data JSONB NOT NULL,
                         updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
                     );
+
+                    ALTER TABLE {STORE_TABLE}
+                        ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+                    ALTER TABLE {STORE_TABLE}
+                        ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+
+                    CREATE TABLE IF NOT EXISTS {ROWS_TABLE} (
+                        collection TEXT NOT NULL,
+                        row_key TEXT NOT NULL,
+                        data JSONB NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                        PRIMARY KEY (collection, row_key)
+                    );
+
+                    CREATE TABLE IF NOT EXISTS {COLLECTIONS_TABLE} (
+                        collection TEXT PRIMARY KEY,
+                        seeded_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    );
+
+                    ALTER TABLE {COLLECTIONS_TABLE}
+                        ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+
+                    CREATE TABLE IF NOT EXISTS {ID_COUNTERS_TABLE} (
+                        collection TEXT PRIMARY KEY,
+                        next_id BIGINT NOT NULL
+                    );
                     """
                 )
 
@@ -150,16 +601,100 @@ def init_db() -> None:
         raise
 
 
-def load_json_document(
+class VersionedDocument(dict):
+    """
+    A loaded collection that remembers where it came from.
+
+    - version: app_json_store.version at load time (document layout)
+    - base: the raw stored data at load time, used for three-way merges
+
+    Both are None when loaded from the local JSON file. Plain dict copies
+    drop them, which simply turns the next save back into a blind write.
+    """
+
+    __slots__ = ("version", "base")
+
+    def __init__(self, data=(), version: Optional[int] = None, base: Optional[dict] = None):
+        super().__init__(data)
+        self.version = version
+        self.base = base
+
+
+class DocumentConflictError(Exception):
+    """
+    Raised when a compare-and-swap save cannot be merged automatically:
+    the same entries were changed differently by us and by another writer.
+    """
+
+    def __init__(self, key: str, entry_keys):
+        self.key = key
+        self.entry_keys = sorted(str(k) for k in entry_keys)
+        super().__init__(
+            f"Concurrent update conflict on {key!r} for entries {self.entry_keys[:20]}"
+        )
+
+
+_MISSING = object()
+
+
+def merge_documents(
+    key: str,
+    base: Optional[Dict[str, Any]],
+    ours: Dict[str, Any],
+    theirs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Three-way merge at entry granularity.
+
+    Entries we did not touch (ours == base) keep theirs. Entries only we
+    changed take ours. Entries both sides changed to different values are
+    a conflict. All three must be in the same (storage) form, or untouched
+    entries look changed.
+
+    Without a base there is no telling our deletes from their inserts, so
+    that is a conflict too rather than a merge against {}.
+    """
+    if base is None:
+        _db_bc("JSON_DOC_MERGE_NO_BASE", key=key)
+        raise DocumentConflictError(key, [])
+
+    merged = dict(theirs)
+    conflicts = []
+
+    for entry_key in set(base) | set(ours):
+        b = base.get(entry_key, _MISSING)
+        o = ours.get(entry_key, _MISSING)
+        t = theirs.get(entry_key, _MISSING)
+
+        if o == b:
+            continue
+
+        if t == b or t == o:
+            if o is _MISSING:
+                merged.pop(entry_key, None)
+            else:
+                merged[entry_key] = o
+            continue
+
+        conflicts.append(entry_key)
+
+    if conflicts:
+        raise DocumentConflictError(key, conflicts)
+
+    return merged
+
+
+def load_json_document_versioned(
     key: str,
     fallback_loader: Callable[[], Any],
     expected_empty: Optional[Any] = None,
-) -> Any:
+) -> Tuple[Any, Optional[int]]:
     """
-    Load one JSON document from Neon.
+    Load one JSON document from Neon together with its version.
 
     If DATABASE_URL is not present:
         Use fallback_loader(), which means old JSON files still work locally.
+        The version is None.
 
     If DATABASE_URL is present but the DB has no row yet:
         Seed Neon once from the existing local JSON file.
@@ -169,7 +704,7 @@ def load_json_document(
 
     if not db_enabled():
         _db_bc("JSON_DOC_LOAD_FALLBACK_DB_DISABLED", key=key)
-        return fallback_loader()
+        return fallback_loader(), None
 
     init_db()
 
@@ -177,20 +712,21 @@ def load_json_document(
         with _get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    f"SELECT data FROM {STORE_TABLE} WHERE key = %s;",
+                    f"SELECT data, version FROM {STORE_TABLE} WHERE key = %s;",
                     (key,),
                 )
                 row = cur.fetchone()
 
         if row is not None:
-            data = row[0]
+            data, version = row
             _db_bc(
                 "JSON_DOC_LOAD_DB_OK",
                 key=key,
+                version=version,
                 data_type=type(data).__name__,
                 size=len(data) if hasattr(data, "__len__") else None,
             )
-            return data
+            return data, version
 
         fallback_data = fallback_loader()
 
@@ -204,9 +740,25 @@ def load_json_document(
             fallback_size=len(fallback_data) if hasattr(fallback_data, "__len__") else None,
         )
 
-        save_json_document(key, fallback_data)
+        # Seed only if nobody else did in the meantime; either way return
+        # what is actually stored now.
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    INSERT INTO {STORE_TABLE} (key, data, content_hash, updated_at)
+                    VALUES (%s, %s, %s, NOW())
+                    ON CONFLICT (key) DO NOTHING;
+                    """,
+                    (key, Json(fallback_data), content_hash(fallback_data)),
+                )
+                cur.execute(
+                    f"SELECT data, version FROM {STORE_TABLE} WHERE key = %s;",
+                    (key,),
+                )
+                data, version = cur.fetchone()
 
-        return fallback_data
+        return data, version
 
     except Exception as e:
         _db_bc(
@@ -219,7 +771,65 @@ def load_json_document(
         raise
 
 
-def save_json_document(key: str, data: Any) -> bool:
+def load_json_document(
+    key: str,
+    fallback_loader: Callable[[], Any],
+    expected_empty: Optional[Any] = None,
+) -> Any:
+    """
+    Load one JSON document from Neon (see load_json_document_versioned).
+    """
+    data, _version = load_json_document_versioned(key, fallback_loader, expected_empty)
+    return data
+
+
+def _write_document(cur, key: str, data: Any, data_hash: str, expected_version: Optional[int], verify: bool):
+    """
+    One upsert attempt. Returns (md5 of the stored data, version) — the md5
+    is NULL unless `verify` — or None when expected_version no longer
+    matches (compare-and-swap miss).
+    """
+    stored_md5 = "md5(data::text)" if verify else "NULL"
+
+    if expected_version is None:
+        cur.execute(
+            f"""
+            INSERT INTO {STORE_TABLE} (key, data, content_hash, updated_at)
+            VALUES (%s, %s, %s, NOW())
+            ON CONFLICT (key)
+            DO UPDATE SET
+                data = EXCLUDED.data,
+                content_hash = EXCLUDED.content_hash,
+                version = {STORE_TABLE}.version + 1,
+                updated_at = NOW()
+            RETURNING {stored_md5}, version;
+            """,
+            (key, Json(data), data_hash),
+        )
+    else:
+        cur.execute(
+            f"""
+            UPDATE {STORE_TABLE}
+            SET data = %s,
+                content_hash = %s,
+                version = version + 1,
+                updated_at = NOW()
+            WHERE key = %s AND version = %s
+            RETURNING {stored_md5}, version;
+            """,
+            (Json(data), data_hash, key, expected_version),
+        )
+
+    return cur.fetchone()
+
+
+def save_json_document(
+    key: str,
+    data: Any,
+    expected_version: Optional[int] = None,
+    base: Optional[Dict[str, Any]] = None,
+    normalize: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> bool:
     """
     Save one JSON document to Neon.
 
@@ -231,6 +841,20 @@ def save_json_document(key: str, data: Any) -> bool:
     If DATABASE_URL is configured but DB save fails, this raises.
     We do not silently fall back to local JSON in production because that
     would bring back the same disappearing-data bug.
+
+    Compare-and-swap:
+    With expected_version, the write only lands if nobody saved since we
+    loaded. On a miss the current document is merged with ours against
+    `base` (see merge_documents) and the swap is retried, up to
+    STORAGE_CAS_RETRIES times. DocumentConflictError is raised when the
+    same entries were changed on both sides, or when there is no `base` to
+    merge against. `normalize` turns the stored document (base and the
+    current one) into the form `data` is in, e.g. legacy entries without
+    an "id", before they are compared.
+
+    With STORAGE_VERIFY_MODE=hash the upsert RETURNs md5(data::text) of
+    what PostgreSQL stored and it is checked against jsonb_md5() of ours
+    before commit.
     """
     if not db_enabled():
         _db_bc("JSON_DOC_SAVE_SKIPPED_DB_DISABLED", key=key)
@@ -238,26 +862,68 @@ def save_json_document(key: str, data: Any) -> bool:
 
     init_db()
 
+    retries = max(0, int(settings.STORAGE_CAS_RETRIES))
+    merges = 0
+    verify = verify_mode() == "hash"
+
     try:
-        with _get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    f"""
-                    INSERT INTO {STORE_TABLE} (key, data, updated_at)
-                    VALUES (%s, %s, NOW())
-                    ON CONFLICT (key)
-                    DO UPDATE SET
-                        data = EXCLUDED.data,
-                        updated_at = NOW();
-                    """,
-                    (key, Json(data)),
-                )
+        while True:
+            data_hash = content_hash(data)
+            current = None
+
+            with _get_connection() as conn:
+                with conn.cursor() as cur:
+                    returned = _write_document(cur, key, data, data_hash, expected_version, verify)
+
+                    if returned is None:
+                        cur.execute(
+                            f"SELECT data, version FROM {STORE_TABLE} WHERE key = %s;",
+                            (key,),
+                        )
+                        current = cur.fetchone()
+                    elif verify:
+                        _check_returned_hashes(key, {key: jsonb_md5(data)}, {key: returned[0]})
+
+            if returned is not None:
+                break
+
+            if current is None:
+                # Row vanished: nothing to merge against, write ours.
+                expected_version = None
+                continue
+
+            theirs, their_version = current
+            _db_bc(
+                "JSON_DOC_SAVE_CAS_MISS",
+                key=key,
+                expected_version=expected_version,
+                current_version=their_version,
+                merges=merges,
+            )
+
+            if merges >= retries:
+                raise DocumentConflictError(key, [])
+
+            if not isinstance(data, dict) or not isinstance(theirs, dict):
+                raise DocumentConflictError(key, [])
+
+            if normalize is not None:
+                theirs = normalize(theirs)
+                base = normalize(base) if base is not None else None
+
+            data = merge_documents(key, base, data, theirs)
+            base = theirs
+            expected_version = their_version
+            merges += 1
 
         _db_bc(
             "JSON_DOC_SAVE_DB_OK",
             key=key,
+            version=returned[1],
+            merges=merges,
             data_type=type(data).__name__,
             size=len(data) if hasattr(data, "__len__") else None,
+            content_hash=data_hash,
         )
         return True
 
@@ -272,15 +938,776 @@ def save_json_document(key: str, data: Any) -> bool:
         raise
 
 
+def _upsert_rows(cur, collection: str, rows: Dict[str, Any]) -> None:
+    """
+    Bulk upsert rows inside an existing transaction.
+
+    With STORAGE_VERIFY_MODE=hash PostgreSQL hashes each stored row
+    (RETURNING md5(data::text)) and the hashes are checked against what we
+    sent before the transaction commits.
+    """
+    values = [
+        (collection, str(row_key), Json(data), content_hash(data))
+        for row_key, data in rows.items()
+    ]
+
+    if not values:
+        return
+
+    verify = verify_mode() == "hash"
+    returned = execute_values(
+        cur,
+        f"""
+        INSERT INTO {ROWS_TABLE} (collection, row_key, data, content_hash, updated_at)
+        VALUES %s
+        ON CONFLICT (collection, row_key)
+        DO UPDATE SET
+            data = EXCLUDED.data,
+            content_hash = EXCLUDED.content_hash,
+            updated_at = NOW()
+        {"RETURNING row_key, md5(data::text)" if verify else ""};
+        """,
+        values,
+        template="(%s, %s, %s, %s, NOW())",
+        fetch=verify,
+    )
+
+    if verify:
+        expected = {str(row_key): jsonb_md5(data) for row_key, data in rows.items()}
+        _check_returned_hashes(collection, expected, dict(returned))
+
+
+def _bump_collection_version(cur, collection: str) -> None:
+    """
+    Register the collection if needed and bump its version counter.
+    Must run inside the same transaction as the row write it describes.
+    """
+    cur.execute(
+        f"""
+        INSERT INTO {COLLECTIONS_TABLE} (collection, version)
+        VALUES (%s, 1)
+        ON CONFLICT (collection)
+        DO UPDATE SET version = {COLLECTIONS_TABLE}.version + 1;
+        """,
+        (collection,),
+    )
+
+
+def _seed_rows(cur, collection: str, fallback_loader: Callable[[], Any]) -> None:
+    """
+    Seed a collection the first time the row layout sees it.
+
+    Prefers the existing app_json_store document so switching layouts on a
+    live database keeps its data; otherwise uses the local JSON file.
+    Only the worker that wins the app_json_collections insert does the seeding.
+
+    Every write path must start with this instead of inserting the
+    app_json_collections row itself: once that row exists the collection
+    counts as seeded and the document/file data would never be copied.
+    """
+    cur.execute(
+        f"""
+        INSERT INTO {COLLECTIONS_TABLE} (collection)
+        VALUES (%s)
+        ON CONFLICT (collection) DO NOTHING
+        RETURNING collection;
+        """,
+        (collection,),
+    )
+
+    if cur.fetchone() is None:
+        return
+
+    cur.execute(f"SELECT data FROM {STORE_TABLE} WHERE key = %s;", (collection,))
+    legacy = cur.fetchone()
+
+    if legacy is not None and isinstance(legacy[0], dict):
+        seed = legacy[0]
+        source = "document"
+    else:
+        seed = fallback_loader() or {}
+        source = "file"
+
+    if not isinstance(seed, dict):
+        raise TypeError(f"Cannot seed rows for {collection!r} from {type(seed).__name__}")
+
+    _upsert_rows(cur, collection, seed)
+    _db_bc("JSON_ROWS_SEEDED", collection=collection, source=source, count=len(seed))
+
+
+def load_json_rows(collection: str, fallback_loader: Callable[[], Any]) -> Dict[str, Any]:
+    """
+    Load every row of a collection as {row_key: data}.
+
+    If DATABASE_URL is not present:
+        Use fallback_loader(), same as load_json_document().
+    """
+    if not db_enabled():
+        _db_bc("JSON_ROWS_LOAD_FALLBACK_DB_DISABLED", collection=collection)
+        return fallback_loader()
+
+    init_db()
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                _seed_rows(cur, collection, fallback_loader)
+                cur.execute(
+                    f"SELECT row_key, data FROM {ROWS_TABLE} WHERE collection = %s;",
+                    (collection,),
+                )
+                rows = {row_key: data for row_key, data in cur.fetchall()}
+
+        _db_bc("JSON_ROWS_LOAD_DB_OK", collection=collection, count=len(rows))
+        return rows
+
+    except Exception as e:
+        _db_bc(
+            "JSON_ROWS_LOAD_DB_ERR",
+            collection=collection,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def get_json_row(collection: str, row_key: Any) -> Optional[Any]:
+    """
+    Point read of a single row. Returns None when the row does not exist.
+    """
+    init_db()
+
+    with _get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT data FROM {ROWS_TABLE} WHERE collection = %s AND row_key = %s;",
+                (collection, str(row_key)),
+            )
+            row = cur.fetchone()
+
+    _db_bc("JSON_ROW_GET_DB_OK", collection=collection, row_key=row_key, found=row is not None)
+    return row[0] if row is not None else None
+
+
+def get_json_rows_many(collection: str, row_keys) -> Dict[str, Any]:
+    """
+    Point read of several rows in one round trip. Missing keys are left out.
+    """
+    keys = [str(k) for k in row_keys]
+    if not keys:
+        return {}
+
+    init_db()
+
+    with _get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT row_key, data FROM {ROWS_TABLE} WHERE collection = %s AND row_key = ANY(%s);",
+                (collection, keys),
+            )
+            found = {row_key: data for row_key, data in cur.fetchall()}
+
+    _db_bc("JSON_ROWS_GET_MANY_DB_OK", collection=collection, asked=len(keys), found=len(found))
+    return {key: found[key] for key in keys if key in found}
+
+
+def upsert_json_row(collection: str, row_key: Any, data: Any, fallback_loader: Callable[[], Any]) -> None:
+    """
+    Point write of a single row (seeds the collection first, see _seed_rows).
+    """
+    init_db()
+
+    with _get_connection() as conn:
+        with conn.cursor() as cur:
+            _seed_rows(cur, collection, fallback_loader)
+            _upsert_rows(cur, collection, {str(row_key): data})
+            _bump_collection_version(cur, collection)
+
+    _db_bc("JSON_ROW_UPSERT_DB_OK", collection=collection, row_key=row_key)
+
+
+def delete_json_row(collection: str, row_key: Any, fallback_loader: Callable[[], Any]) -> bool:
+    """
+    Point delete of a single row. Returns True when a row was removed.
+    A seeded-but-missing row counts as not removed (see _seed_rows).
+    """
+    init_db()
+
+    with _get_connection() as conn:
+        with conn.cursor() as cur:
+            _seed_rows(cur, collection, fallback_loader)
+            cur.execute(
+                f"DELETE FROM {ROWS_TABLE} WHERE collection = %s AND row_key = %s;",
+                (collection, str(row_key)),
+            )
+            deleted = cur.rowcount > 0
+
+            if deleted:
+                _bump_collection_version(cur, collection)
+
+    _db_bc("JSON_ROW_DELETE_DB_OK", collection=collection, row_key=row_key, deleted=deleted)
+    return deleted
+
+
+def _rows_changed_since_base(
+    cur,
+    collection: str,
+    wanted: Dict[str, Any],
+    base: Dict[str, Any],
+    normalize: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Any], list]:
+    """
+    Work out what to write when we know what the rows looked like at load.
+
+    Only rows we changed relative to `base` are locked and compared with
+    what is stored now. Rows nobody else touched (or that already hold our
+    value) are applied; a row changed differently by another writer is a
+    conflict. Rows we never touched are left alone, so concurrent writers
+    to different Pokémon merge naturally.
+    """
+    touched = [
+        row_key
+        for row_key in set(base) | set(wanted)
+        if wanted.get(row_key, _MISSING) != base.get(row_key, _MISSING)
+    ]
+
+    if not touched:
+        return {}, []
+
+    cur.execute(
+        f"""
+        SELECT row_key, data FROM {ROWS_TABLE}
+        WHERE collection = %s AND row_key = ANY(%s)
+        FOR UPDATE;
+        """,
+        (collection, touched),
+    )
+    stored = dict(cur.fetchall())
+    if normalize is not None:
+        stored = normalize(stored)
+
+    changed: Dict[str, Any] = {}
+    removed = []
+    conflicts = []
+
+    for row_key in touched:
+        b = base.get(row_key, _MISSING)
+        o = wanted.get(row_key, _MISSING)
+        t = stored.get(row_key, _MISSING)
+
+        if t == o:
+            continue
+
+        if t != b:
+            conflicts.append(row_key)
+            continue
+
+        if o is _MISSING:
+            removed.append(row_key)
+        else:
+            changed[row_key] = o
+
+    if conflicts:
+        raise DocumentConflictError(collection, conflicts)
+
+    return changed, removed
+
+
+def save_json_rows(
+    collection: str,
+    rows: Dict[Any, Any],
+    fallback_loader: Callable[[], Any],
+    base: Optional[Dict[str, Any]] = None,
+    normalize: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> bool:
+    """
+    Make a collection match `rows`, writing only what changed.
+
+    Without `base` the stored content hashes are compared against the
+    incoming rows, so unchanged rows cost a few bytes of hash instead of a
+    full rewrite (last writer wins for the whole collection).
+
+    With `base` (the rows as they were loaded) only rows we changed are
+    written, each checked against its stored value, and
+    DocumentConflictError is raised if another writer changed the same row.
+    `normalize` puts base and the stored rows into the form of `rows`
+    first, as in save_json_document. A collection saved for the first time
+    is seeded before the diff (see _seed_rows).
+
+    Returns:
+    - True when saved to DB
+    - False only when DB is disabled
+    """
+    if not db_enabled():
+        _db_bc("JSON_ROWS_SAVE_SKIPPED_DB_DISABLED", collection=collection)
+        return False
+
+    init_db()
+
+    wanted = {str(row_key): data for row_key, data in rows.items()}
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                _seed_rows(cur, collection, fallback_loader)
+
+                if base is not None:
+                    base_rows = {str(row_key): data for row_key, data in base.items()}
+                    changed, removed = _rows_changed_since_base(
+                        cur,
+                        collection,
+                        wanted,
+                        normalize(base_rows) if normalize is not None else base_rows,
+                        normalize,
+                    )
+                else:
+                    cur.execute(
+                        f"""
+                        SELECT row_key, content_hash FROM {ROWS_TABLE}
+                        WHERE collection = %s
+                        FOR UPDATE;
+                        """,
+                        (collection,),
+                    )
+                    stored_hashes = dict(cur.fetchall())
+
+                    changed = {
+                        row_key: data
+                        for row_key, data in wanted.items()
+                        if stored_hashes.get(row_key) != content_hash(data)
+                    }
+                    removed = [row_key for row_key in stored_hashes if row_key not in wanted]
+
+                _upsert_rows(cur, collection, changed)
+
+                if removed:
+                    cur.execute(
+                        f"DELETE FROM {ROWS_TABLE} WHERE collection = %s AND row_key = ANY(%s);",
+                        (collection, removed),
+                    )
+
+                if changed or removed:
+                    _bump_collection_version(cur, collection)
+
+        _db_bc(
+            "JSON_ROWS_SAVE_DB_OK",
+            collection=collection,
+            count=len(wanted),
+            changed=len(changed),
+            removed=len(removed),
+            merged=base is not None,
+        )
+        return True
+
+    except Exception as e:
+        _db_bc(
+            "JSON_ROWS_SAVE_DB_ERR",
+            collection=collection,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def _ensure_document(cur, key: str, fallback_loader: Callable[[], Any]) -> None:
+    """
+    Make sure the document row exists and lock it for this transaction.
+
+    Seeds from fallback_loader() exactly like load_json_document() would,
+    so a partial update never starts from an empty document by accident.
+    """
+    cur.execute(f"SELECT 1 FROM {STORE_TABLE} WHERE key = %s FOR UPDATE;", (key,))
+
+    if cur.fetchone() is not None:
+        return
+
+    seed = fallback_loader() or {}
+    cur.execute(
+        f"""
+        INSERT INTO {STORE_TABLE} (key, data, content_hash, updated_at)
+        VALUES (%s, %s, %s, NOW())
+        ON CONFLICT (key) DO NOTHING;
+        """,
+        (key, Json(seed), content_hash(seed)),
+    )
+    cur.execute(f"SELECT 1 FROM {STORE_TABLE} WHERE key = %s FOR UPDATE;", (key,))
+    _db_bc("JSON_DOC_SEEDED_FOR_PARTIAL_WRITE", key=key, count=len(seed))
+
+
+def _lock_row(cur, collection: str, row_key: str) -> Optional[Any]:
+    cur.execute(
+        f"""
+        SELECT data FROM {ROWS_TABLE}
+        WHERE collection = %s AND row_key = %s
+        FOR UPDATE;
+        """,
+        (collection, row_key),
+    )
+    row = cur.fetchone()
+    return row[0] if row is not None else None
+
+
+def insert_entry(
+    key: str,
+    entry_id: Any,
+    entry: Any,
+    fallback_loader: Callable[[], Any],
+) -> Any:
+    """
+    Add (or replace) one entry without rewriting the whole document.
+
+    - document layout: jsonb_set(data, '{id}', entry) on the single row
+    - rows layout: one row upsert
+
+    Returns the stored entry.
+    """
+    init_db()
+    entry_key = str(entry_id)
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                if storage_layout() == "rows":
+                    _seed_rows(cur, key, fallback_loader)
+                    _upsert_rows(cur, key, {entry_key: entry})
+                    _bump_collection_version(cur, key)
+                    stored = entry
+                else:
+                    _ensure_document(cur, key, fallback_loader)
+                    cur.execute(
+                        f"""
+                        UPDATE {STORE_TABLE}
+                        SET data = jsonb_set(data, ARRAY[%s], %s, true),
+                            content_hash = NULL,
+                            version = version + 1,
+                            updated_at = NOW()
+                        WHERE key = %s
+                        RETURNING data -> %s;
+                        """,
+                        (entry_key, Json(entry), key, entry_key),
+                    )
+                    stored = cur.fetchone()[0]
+
+                    if verify_mode() == "hash":
+                        _check_returned_hashes(
+                            f"{key}[{entry_key}]",
+                            {entry_key: content_hash(entry)},
+                            {entry_key: content_hash(stored)},
+                        )
+
+        _db_bc("JSON_ENTRY_INSERT_DB_OK", key=key, entry_id=entry_key, layout=storage_layout())
+        return stored
+
+    except Exception as e:
+        _db_bc(
+            "JSON_ENTRY_INSERT_DB_ERR",
+            key=key,
+            entry_id=entry_key,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def patch_entry(
+    key: str,
+    entry_id: Any,
+    fields: Dict[str, Any],
+    fallback_loader: Callable[[], Any],
+    remove_fields: Tuple[str, ...] = (),
+) -> Optional[Any]:
+    """
+    Merge `fields` into one entry and drop `remove_fields` from it.
+
+    - document layout: jsonb_set(data, '{id}', (data->id) - removed || fields),
+      so only the changed fields travel to PostgreSQL
+    - rows layout: the single row is locked, merged and rewritten
+
+    Returns the updated entry, or None when the entry does not exist.
+    """
+    init_db()
+    entry_key = str(entry_id)
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                if storage_layout() == "rows":
+                    _seed_rows(cur, key, fallback_loader)
+                    current = _lock_row(cur, key, entry_key)
+
+                    if current is None:
+                        updated = None
+                    else:
+                        updated = {k: v for k, v in current.items() if k not in remove_fields}
+                        updated.update(fields)
+                        _upsert_rows(cur, key, {entry_key: updated})
+                        _bump_collection_version(cur, key)
+                else:
+                    _ensure_document(cur, key, fallback_loader)
+                    cur.execute(
+                        f"""
+                        UPDATE {STORE_TABLE}
+                        SET data = jsonb_set(
+                                data,
+                                ARRAY[%s],
+                                ((data -> %s) - %s::text[]) || %s::jsonb
+                            ),
+                            content_hash = NULL,
+                            version = version + 1,
+                            updated_at = NOW()
+                        WHERE key = %s AND data ? %s
+                        RETURNING data -> %s;
+                        """,
+                        (
+                            entry_key,
+                            entry_key,
+                            list(remove_fields),
+                            Json(fields),
+                            key,
+                            entry_key,
+                            entry_key,
+                        ),
+                    )
+                    row = cur.fetchone()
+                    updated = row[0] if row is not None else None
+
+                if updated is not None and verify_mode() == "hash":
+                    stale = [
+                        k for k, v in fields.items() if content_hash(updated.get(k)) != content_hash(v)
+                    ] + [k for k in remove_fields if k in updated]
+
+                    if stale:
+                        _db_bc("SAVE_VERIFY_PATCH_MISMATCH", key=key, entry_id=entry_key, fields=stale)
+                        raise RuntimeError(f"Patch verification failed for {key}[{entry_key}]")
+
+        _db_bc(
+            "JSON_ENTRY_PATCH_DB_OK",
+            key=key,
+            entry_id=entry_key,
+            found=updated is not None,
+            fields=sorted(fields),
+            removed=list(remove_fields),
+        )
+        return updated
+
+    except Exception as e:
+        _db_bc(
+            "JSON_ENTRY_PATCH_DB_ERR",
+            key=key,
+            entry_id=entry_key,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def delete_entry(
+    key: str,
+    entry_id: Any,
+    fallback_loader: Callable[[], Any],
+) -> Optional[Any]:
+    """
+    Remove one entry without rewriting the whole document.
+
+    - document layout: data - 'id'
+    - rows layout: one row delete
+
+    Returns the removed entry, or None when it did not exist.
+    """
+    init_db()
+    entry_key = str(entry_id)
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                if storage_layout() == "rows":
+                    _seed_rows(cur, key, fallback_loader)
+                    cur.execute(
+                        f"""
+                        DELETE FROM {ROWS_TABLE}
+                        WHERE collection = %s AND row_key = %s
+                        RETURNING data;
+                        """,
+                        (key, entry_key),
+                    )
+                    row = cur.fetchone()
+
+                    if row is not None:
+                        _bump_collection_version(cur, key)
+                else:
+                    _ensure_document(cur, key, fallback_loader)
+                    cur.execute(
+                        f"""
+                        UPDATE {STORE_TABLE} AS store
+                        SET data = store.data - %s,
+                            content_hash = NULL,
+                            version = store.version + 1,
+                            updated_at = NOW()
+                        FROM (
+                            SELECT data -> %s AS entry
+                            FROM {STORE_TABLE}
+                            WHERE key = %s
+                        ) AS old
+                        WHERE store.key = %s AND old.entry IS NOT NULL
+                        RETURNING old.entry;
+                        """,
+                        (entry_key, entry_key, key, key),
+                    )
+                    row = cur.fetchone()
+
+        deleted = row[0] if row is not None else None
+        _db_bc("JSON_ENTRY_DELETE_DB_OK", key=key, entry_id=entry_key, found=deleted is not None)
+        return deleted
+
+    except Exception as e:
+        _db_bc(
+            "JSON_ENTRY_DELETE_DB_ERR",
+            key=key,
+            entry_id=entry_key,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def allocate_ids(collection: str, count: int, floor_loader: Callable[[], int]) -> int:
+    """
+    Reserve `count` consecutive ids for a collection and return the first.
+
+    One UPDATE ... RETURNING on the counter row: the row lock makes blocks
+    from concurrent callers (other workers, other instances) disjoint, and
+    a rolled-back caller simply leaves a gap. Only the very first call per
+    collection pays for floor_loader() (max existing id + 1) to seed the
+    counter; raise_id_floor() keeps it ahead of explicitly written ids.
+    """
+    init_db()
+
+    if count < 1:
+        raise ValueError("allocate_ids() needs count >= 1")
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    UPDATE {ID_COUNTERS_TABLE}
+                    SET next_id = next_id + %s
+                    WHERE collection = %s
+                    RETURNING next_id - %s;
+                    """,
+                    (count, collection, count),
+                )
+                row = cur.fetchone()
+
+                if row is None:
+                    # First allocation for this collection: seed from the data
+                    cur.execute(
+                        f"""
+                        INSERT INTO {ID_COUNTERS_TABLE} (collection, next_id)
+                        VALUES (%s, %s)
+                        ON CONFLICT (collection) DO UPDATE
+                            SET next_id = GREATEST({ID_COUNTERS_TABLE}.next_id, EXCLUDED.next_id - %s) + %s
+                        RETURNING next_id - %s;
+                        """,
+                        (collection, int(floor_loader()) + count, count, count, count),
+                    )
+                    row = cur.fetchone()
+
+        first_id = int(row[0])
+        _db_bc("ID_ALLOCATE_DB_OK", collection=collection, first_id=first_id, count=count)
+        return first_id
+
+    except Exception as e:
+        _db_bc(
+            "ID_ALLOCATE_DB_ERR",
+            collection=collection,
+            count=count,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def raise_id_floor(collection: str, floor: int) -> None:
+    """
+    Make sure allocate_ids() never returns an id below `floor`.
+
+    Called after writes that brought their own ids (full saves, imports).
+    A collection that has not allocated yet has no counter row; its first
+    allocation seeds from the data, so there is nothing to raise.
+    """
+    init_db()
+
+    with _get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"UPDATE {ID_COUNTERS_TABLE} SET next_id = GREATEST(next_id, %s) WHERE collection = %s;",
+                (int(floor), collection),
+            )
+
+
+def document_version(key: str) -> Optional[Any]:
+    """
+    Cheap version probe for one collection.
+
+    Returns an opaque token that changes whenever the stored data changes:
+    - document layout: the row's version counter
+    - rows layout: the collection's version counter
+
+    Returns None when DB storage is disabled (callers probe the file instead)
+    or when nothing has been stored yet.
+    """
+    if not db_enabled():
+        return None
+
+    init_db()
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                if storage_layout() == "rows":
+                    cur.execute(
+                        f"SELECT version FROM {COLLECTIONS_TABLE} WHERE collection = %s;",
+                        (key,),
+                    )
+                else:
+                    cur.execute(
+                        f"SELECT version FROM {STORE_TABLE} WHERE key = %s;",
+                        (key,),
+                    )
+                row = cur.fetchone()
+
+        return (storage_layout(), row[0]) if row is not None else None
+
+    except Exception as e:
+        _db_bc(
+            "JSON_DOC_VERSION_DB_ERR",
+            key=key,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
 def storage_debug() -> dict:
     """
     Small helper for logs/debugging.
     Does not expose DATABASE_URL.
     """
     return {
+        "backend": storage_backend(),
         "db_enabled": db_enabled(),
         "database_url_present": bool(_database_url()),
         "testing": os.getenv("TESTING") == "1",
         "table": STORE_TABLE,
+        "layout": storage_layout(),
         "psycopg2_loaded": psycopg2 is not None,
+        "pool": pool_stats(),
     }
\ No newline at end of file
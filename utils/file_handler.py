@@ -1,42 +1,62 @@
 import os
-import json
+import threading
 import traceback
-from typing import Dict, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
 
-from utils.db_json_store import load_json_document, save_json_document, storage_debug
+from utils.db_json_store import (
+    VersionedDocument,
+    run_in_store_executor,
+    storage_debug,
+    verify_mode,
+)
+from models.pokemon_record import PokemonRecord
+from utils.pokedex_index import PokedexIndex
+from utils.tracing import get_tracer
+from utils.storage_backends import FileCollection, get_backend, register_file_collection
 
 
 # ✅ Old local fallback path
 # Used only when DATABASE_URL is missing or during local/test mode.
 POKEDEX_PATH = os.path.join("data", "pokedex.json")
+POKEDEX_JOURNAL_PATH = os.path.join("data", "pokedex.journal")
+POKEDEX_BINARY_PATH = os.path.join("data", "pokedex.bin")
+POKEDEX_IDS_PATH = os.path.join("data", "pokedex.ids")
 
 # ✅ Ensure local fallback directory exists
 os.makedirs(os.path.dirname(POKEDEX_PATH), exist_ok=True)
 
+# ✅ Process-local read-through cache for the normalized Pokédex.
+# (version_token, index) — the index holds the Pokédex, keeps it filterable
+# and is patched in place by point writes (readers use its snapshots).
+_POKEDEX_CACHE: Optional[Tuple[Any, PokedexIndex]] = None
+_POKEDEX_CACHE_LOCK = threading.Lock()
 
-def _log(message: str):
-    """
-    Quiet during pytest, visible in Render/local logs otherwise.
-    """
-    if os.getenv("TESTING") != "1":
-        print(message, flush=True)
+# Bumped by every save in this process so our own writes invalidate
+# immediately, even if the store's version token has coarse resolution.
+_POKEDEX_GENERATION = 0
 
+_POKEDEX_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "invalidations": 0, "incremental_updates": 0}
 
-def _fh_bc(event: str, **fields) -> None:
-    """
-    Pokédex storage breadcrumb logger.
 
-    These logs prove:
-    - whether Neon DB is active
-    - whether local JSON fallback is being used
-    - what nickname values were loaded/saved
-    - whether save verification succeeded
-    """
-    try:
-        parts = " ".join(f"{k}={repr(v)}" for k, v in fields.items())
-        _log(f"[FH_BC] {event}" + (f" {parts}" if parts else ""))
-    except Exception as e:
-        _log(f"[FH_BC] {event} breadcrumb_error={type(e).__name__}:{e}")
+# 🧵 Pokédex storage breadcrumbs (utils/tracing): which store is active,
+# what was loaded/saved, whether save verification succeeded.
+_fh_bc = get_tracer("FH_BC")
+
+
+# 📓 Where the file backend keeps the Pokédex: JSON snapshot + append-only
+# journal + binary sidecar + next-id counter. Other backends seed themselves
+# from these files.
+register_file_collection(
+    "pokedex",
+    FileCollection(
+        path=POKEDEX_PATH,
+        journal_path=POKEDEX_JOURNAL_PATH,
+        binary_path=POKEDEX_BINARY_PATH,
+        prepare=lambda raw: _pokedex_storage_form(raw),
+        breadcrumb=_fh_bc,
+        ids_path=POKEDEX_IDS_PATH,
+    ),
+)
 
 
 def _normalize_pokedex(raw_data: Any) -> Dict[int, dict]:
@@ -116,94 +136,406 @@ def _normalize_pokedex(raw_data: Any) -> Dict[int, dict]:
     _fh_bc(
         "NORMALIZE_POKEDEX_OK",
         count=len(pokedex),
-        nicknames={str(pid): entry.get("nickname") for pid, entry in pokedex.items()},
+        nicknames=lambda: {str(pid): entry.get("nickname") for pid, entry in pokedex.items()},
     )
 
     return pokedex
 
 
-def _load_pokedex_from_file() -> Dict[int, dict]:
+def _prepare_entry(poke_id: int, raw_entry: Any) -> dict:
+    """
+    Storage form of one Pokédex entry: id forced to int, empty nickname dropped.
+    """
+    if not isinstance(raw_entry, dict):
+        raise TypeError(f"Pokédex entry {poke_id} is not a dict")
+
+    entry = dict(raw_entry)
+    entry["id"] = int(entry.get("id", poke_id))
+
+    # ✅ Keep old clean behavior:
+    # None/blank nickname is removed.
+    # Real nickname survives.
+    if entry.get("nickname") is None or entry.get("nickname") == "":
+        entry.pop("nickname", None)
+
+    return entry
+
+
+def _pokedex_storage_form(raw_data: Any) -> Dict[str, dict]:
     """
-    Old local JSON loader.
+    Raw Pokédex (any supported shape) → what the snapshot files store.
+    """
+    return {
+        str(poke_id): _prepare_entry(poke_id, entry)
+        for poke_id, entry in _normalize_pokedex(raw_data).items()
+    }
 
-    This is now used only as:
-    - local fallback when DATABASE_URL is missing
-    - initial seed source when Neon DB row does not exist yet
+
+def _from_storage(raw_data: Any, backend) -> Dict[int, dict]:
     """
-    _fh_bc(
-        "FILE_LOAD_POKEDEX_ENTER",
-        path=POKEDEX_PATH,
-        exists=os.path.exists(POKEDEX_PATH),
-    )
+    Backend contents → int-keyed Pokédex (always fresh dicts).
 
-    if not os.path.exists(POKEDEX_PATH):
-        _fh_bc("FILE_LOAD_POKEDEX_MISSING", path=POKEDEX_PATH)
-        return {}
+    Backends that hand back exactly what we stored skip the per-entry
+    normalize walk; PostgreSQL may still hold legacy shapes, so it does not.
+    """
+    if backend.returns_storage_form and isinstance(raw_data, dict):
+        return {int(pid): dict(entry) for pid, entry in raw_data.items()}
+    return _normalize_pokedex(raw_data)
 
-    try:
-        with open(POKEDEX_PATH, "r", encoding="utf-8") as file:
-            raw_data = json.load(file)
 
-        pokedex = _normalize_pokedex(raw_data)
+def load_pokedex() -> Dict[int, dict]:
+    """
+    Main Pokédex loader used by the app.
+
+    Reads from whichever backend STORAGE_BACKEND selects
+    (utils/storage_backends):
+
+    Render production:
+        DATABASE_URL present → load from Neon PostgreSQL.
+
+    Single node:
+        STORAGE_BACKEND=sqlite → load from the SQLite file (SQLITE_PATH).
+
+    Local/dev/test:
+        DATABASE_URL missing or TESTING=1 → load from data/pokedex.json.
+    """
+    _fh_bc("LOAD_POKEDEX_ENTER", storage=storage_debug)
+
+    try:
+        backend = get_backend()
+        raw_data, version = backend.load("pokedex")
+
+        # ✅ Remember version + raw stored data so save_pokedex() can do a
+        # compare-and-swap with merge (not for the file, it has no version).
+        pokedex = VersionedDocument(
+            _from_storage(raw_data, backend),
+            version=version if backend.supports_cas else None,
+            base=raw_data if backend.supports_cas and isinstance(raw_data, dict) else None,
+        )
 
         _fh_bc(
-            "FILE_LOAD_POKEDEX_OK",
+            "LOAD_POKEDEX_RETURN_OK",
             count=len(pokedex),
-            nicknames={str(pid): entry.get("nickname") for pid, entry in pokedex.items()},
+            storage=storage_debug,
+            nicknames=lambda: {str(pid): entry.get("nickname") for pid, entry in pokedex.items()},
         )
 
         return pokedex
 
     except Exception as e:
         _fh_bc(
-            "FILE_LOAD_POKEDEX_ERR",
+            "LOAD_POKEDEX_ERR",
             err_type=type(e).__name__,
             err=str(e),
             traceback=traceback.format_exc(),
+            storage=storage_debug,
         )
-        return {}
+        raise
 
 
-def _save_pokedex_to_file(data: Dict[int, dict]) -> None:
+def pokedex_version() -> Tuple[int, Any]:
     """
-    Old local JSON saver.
+    Cheap probe of the current Pokédex version.
 
-    Used only when DATABASE_URL is missing.
-    In Render production, we do NOT want this path.
+    DB mode asks PostgreSQL for the document / collection version counter,
+    SQLite mode reads its store_meta version.
+    File mode uses the stat of the snapshot and the journal, so edits by
+    another process or a test fixture writing the file directly are still
+    noticed.
     """
-    try:
-        normalized = {}
+    backend = get_backend()
+    return _POKEDEX_GENERATION, (backend.name, backend.version("pokedex"))
 
-        for raw_key, raw_entry in data.items():
-            poke_id = int(raw_key)
 
-            if not isinstance(raw_entry, dict):
-                raise TypeError(f"Pokédex entry {raw_key} is not a dict")
+def invalidate_pokedex_cache() -> None:
+    global _POKEDEX_CACHE, _POKEDEX_GENERATION
+
+    _POKEDEX_GENERATION += 1
+    _POKEDEX_CACHE = None
+    _POKEDEX_CACHE_STATS["invalidations"] += 1
+
+
+def _cached_index() -> PokedexIndex:
+    global _POKEDEX_CACHE
+
+    version = pokedex_version()
+    cached = _POKEDEX_CACHE
+
+    if cached is not None and cached[0] == version:
+        _POKEDEX_CACHE_STATS["hits"] += 1
+        return cached[1]
+
+    with _POKEDEX_CACHE_LOCK:
+        # Another request may have refreshed it while we waited.
+        cached = _POKEDEX_CACHE
+        if cached is not None and cached[0] == version:
+            _POKEDEX_CACHE_STATS["hits"] += 1
+            return cached[1]
+
+        _POKEDEX_CACHE_STATS["misses"] += 1
+        _fh_bc("POKEDEX_CACHE_MISS", version=version)
+
+        # Version is probed BEFORE loading: if a write lands in between,
+        # the next probe sees a newer version and reloads.
+        index = PokedexIndex(load_pokedex(), record=PokemonRecord.from_entry)
+        _POKEDEX_CACHE = (version, index)
+        return index
+
+
+def load_pokedex_cached() -> Dict[int, dict]:
+    """
+    Read-through cached Pokédex for read paths.
+
+    Every call does a version probe; the full load + normalize only runs
+    when the version moved. The returned dict is shared between requests,
+    so callers must NOT mutate it — use load_pokedex() or copy first.
+    """
+    return _cached_index().snapshot()
+
+
+def load_pokemon_records_cached() -> Dict[int, Union[PokemonRecord, Exception]]:
+    """
+    The cached Pokédex as PokemonRecords, validated once when the entry
+    entered the cache (full load or point write), in the same order as
+    load_pokedex_cached(). An entry that failed validation maps to the
+    exception it raised. Shared — do not mutate.
+    """
+    return _cached_index().records_snapshot()
+
+
+def query_pokedex(
+    ptype: Optional[str] = None,
+    min_level: Optional[int] = None,
+    max_level: Optional[int] = None,
+    name_prefix: Optional[str] = None,
+) -> List[dict]:
+    """
+    Cached Pokémon matching every given filter (type is case-insensitive,
+    levels inclusive, name prefix case-insensitive), in id order.
+
+    Answered from the cache's secondary indexes (utils/pokedex_index) in
+    O(log n + k). Entries are shared with the cache — do not mutate.
+    """
+    return _cached_index().filter(
+        ptype=ptype,
+        min_level=min_level,
+        max_level=max_level,
+        name_prefix=name_prefix,
+    )
+
+
+def get_pokemon_records_many(pokemon_ids: Iterable[int]) -> Dict[int, Union[PokemonRecord, Exception]]:
+    """
+    Records for just these ids (missing ones are left out), like
+    get_pokedex_entry() for several at once.
+
+    A current cache answers straight from memory. Otherwise backends with
+    point reads fetch only these entries in one get_many() call (SQLite
+    IN query, rows-layout SELECT, file lookups) instead of loading and
+    validating the whole Pokédex; the PostgreSQL document layout still
+    goes through the cache.
+    """
+    ids = list(dict.fromkeys(int(pid) for pid in pokemon_ids))
+    backend = get_backend()
+    cached = _POKEDEX_CACHE
+
+    if not backend.point_reads or (cached is not None and cached[0] == pokedex_version()):
+        index = _cached_index()
+        with index.lock:
+            records = index.records
+            return {pid: records[pid] for pid in ids if pid in records}
+
+    raw_entries = backend.get_many("pokedex", ids)
+    entries = _normalize_pokedex(raw_entries) if raw_entries else {}
+    _fh_bc("GET_POKEDEX_ENTRIES_OK", requested=len(ids), found=len(entries))
+
+    found = {}
+    for pid in ids:
+        if pid in entries:
+            try:
+                found[pid] = PokemonRecord.from_entry(pid, entries[pid])
+            except Exception as e:
+                found[pid] = e  # same contract as the cached records
+    return found
+
+
+def search_pokemon_records(
+    query: str,
+    k: int = 10,
+    min_score: float = 0.0,
+) -> List[Tuple[float, int, Union[PokemonRecord, Exception]]]:
+    """
+    Best `k` cached Pokémon for a fuzzy name query, as (score, id, record),
+    highest similarity first. See PokedexIndex.search.
+    """
+    index = _cached_index()
+
+    with index.lock:
+        hits = index.search(query, k=k, min_score=min_score)
+        records = index.records
+        return [(score, pid, records[pid]) for score, pid in hits]
+
+
+def pokedex_stats() -> dict:
+    """
+    Counts by type, level histogram and min/max/mean, nickname coverage —
+    read off the index's running totals (see PokedexIndex.stats).
+    """
+    return _cached_index().stats()
+
+
+def pokemon_records_page(
+    sort_by: str = "id",
+    descending: bool = False,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    **filters: Any,
+) -> Tuple[List[Tuple[int, Union[PokemonRecord, Exception]]], Optional[tuple]]:
+    """
+    One keyset page of cached PokemonRecords as (id, record) pairs, plus
+    the position to continue after (None on the last page).
+
+    See PokedexIndex.page for ordering and `after`; `filters` are the
+    query_pokedex() ones.
+    """
+    index = _cached_index()
+
+    with index.lock:
+        ids, next_after = index.page(by=sort_by, descending=descending, after=after, limit=limit, **filters)
+        records = index.records
+        return [(pid, records[pid]) for pid in ids], next_after
+
+
+def iter_pokemon_records(
+    batch_size: int = 500,
+    **filters: Any,
+) -> Iterator[List[Tuple[int, Union[PokemonRecord, Exception]]]]:
+    """
+    Every cached record matching `filters`, in id order, one keyset page
+    of up to `batch_size` at a time — for exports that must not build the
+    whole Pokédex in memory. Writes landing mid-walk are seen from the next
+    page on; no surviving entry is skipped or repeated.
+    """
+    after = None
+    while True:
+        page, after = pokemon_records_page(after=after, limit=batch_size, **filters)
+        if page:
+            yield page
+        if after is None:
+            return
+
+
+def _apply_point_write(before: Optional[Tuple[int, Any]], poke_id: int, entry: Optional[dict]) -> None:
+    """
+    Fold one successful point write into the cache and its indexes instead
+    of dropping them (entry=None means deleted).
+
+    Only done when the cache was current right before the write and the
+    backend can say which version this write produced. Re-probing here
+    could pick up another writer's change that the patched index does not
+    contain; anything else falls back to a full invalidation and reload.
+    """
+    global _POKEDEX_CACHE
+
+    with _POKEDEX_CACHE_LOCK:
+        cached = _POKEDEX_CACHE
+
+        if before is None or cached is None or cached[0] != before:
+            invalidate_pokedex_cache()
+            return
+
+        generation, (backend_name, version) = before
+        backend = get_backend()
+        after = backend.version_after_write("pokedex", version) if backend.name == backend_name else None
+
+        if after is None:
+            _fh_bc("POKEDEX_CACHE_STAMP_UNKNOWN", pokemon_id=poke_id, backend=backend_name)
+            invalidate_pokedex_cache()
+            return
+
+        index = cached[1]
+        if entry is None:
+            index.remove(poke_id)
+        else:
+            index.upsert(poke_id, dict(entry))
+
+        _POKEDEX_CACHE = ((generation, (backend_name, after)), index)
+        _POKEDEX_CACHE_STATS["incremental_updates"] += 1
+
+
+def _version_if_cached() -> Optional[Tuple[int, Any]]:
+    # Only worth a probe when there is a cache to keep.
+    return pokedex_version() if _POKEDEX_CACHE is not None else None
+
 
-            entry = dict(raw_entry)
-            entry["id"] = int(entry.get("id", poke_id))
+def pokedex_cache_stats() -> dict:
+    cached = _POKEDEX_CACHE
+    return {
+        "cached": cached is not None,
+        "count": len(cached[1]) if cached is not None else 0,
+        "generation": _POKEDEX_GENERATION,
+        **_POKEDEX_CACHE_STATS,
+    }
+
+
+def get_pokedex_entry(pokemon_id: int) -> Optional[dict]:
+    """
+    Fetch one Pokémon by id.
+
+    Backends with cheap point reads (SQLite, file, DB_STORAGE_LAYOUT=rows)
+    fetch just this entry. The PostgreSQL document layout stores one
+    document, so it goes through the cache and picks the entry.
+    """
+    try:
+        backend = get_backend()
 
-            # ✅ Keep old clean behavior:
-            # If nickname is None/blank, don't store it.
-            # If nickname is real, like "bulby", keep it.
-            if entry.get("nickname") is None or entry.get("nickname") == "":
-                entry.pop("nickname", None)
+        if backend.point_reads:
+            raw_entry = backend.get("pokedex", int(pokemon_id))
 
-            normalized[str(poke_id)] = entry
+            if raw_entry is None:
+                _fh_bc("GET_POKEDEX_ENTRY_MISSING", pokemon_id=pokemon_id)
+                return None
 
-        with open(POKEDEX_PATH, "w", encoding="utf-8") as file:
-            json.dump(normalized, file, indent=4, ensure_ascii=False)
+            entry = _normalize_pokedex({str(pokemon_id): raw_entry})[int(pokemon_id)]
+        else:
+            cached_entry = load_pokedex_cached().get(int(pokemon_id))
+            entry = dict(cached_entry) if cached_entry is not None else None
 
+        _fh_bc("GET_POKEDEX_ENTRY_OK", pokemon_id=pokemon_id, found=entry is not None)
+        return entry
+
+    except Exception as e:
         _fh_bc(
-            "FILE_SAVE_POKEDEX_OK",
-            path=POKEDEX_PATH,
-            count=len(normalized),
-            nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
+            "GET_POKEDEX_ENTRY_ERR",
+            pokemon_id=pokemon_id,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
         )
+        raise
+
+
+def allocate_pokemon_ids(count: int = 1) -> int:
+    """
+    Reserve `count` consecutive Pokémon ids and return the first one.
+
+    Backed by the storage backend's persistent counter (PostgreSQL counter
+    row, SQLite id_counters table, data/pokedex.ids for the file backend),
+    so creating a Pokémon never needs max() over the whole Pokédex and a
+    CSV import gets its whole block in one call. Ids are not reused after
+    a delete.
+    """
+    try:
+        backend = get_backend()
+        first_id = backend.allocate_ids("pokedex", count)
+
+        _fh_bc("ALLOCATE_POKEMON_IDS_OK", backend=backend.name, first_id=first_id, count=count)
+        return first_id
 
     except Exception as e:
         _fh_bc(
-            "FILE_SAVE_POKEDEX_ERR",
+            "ALLOCATE_POKEMON_IDS_ERR",
+            count=count,
             err_type=type(e).__name__,
             err=str(e),
             traceback=traceback.format_exc(),
@@ -211,56 +543,151 @@ def _save_pokedex_to_file(data: Dict[int, dict]) -> None:
         raise
 
 
-def load_pokedex() -> Dict[int, dict]:
+def insert_pokedex_entry(pokemon_id: int, entry: dict) -> dict:
     """
-    Main Pokédex loader used by the app.
+    Add one Pokémon without rewriting the whole Pokédex in the DB.
 
-    Render production:
-        DATABASE_URL present → load from Neon PostgreSQL.
-
-    Local/dev/test:
-        DATABASE_URL missing or TESTING=1 → load from data/pokedex.json.
+    DB mode ships only this entry (jsonb_set or a single row upsert),
+    SQLite writes one row, and file mode appends one journal record (or
+    rewrites the file when FILE_JOURNAL_COMPACT_BYTES=0).
     """
-    _fh_bc("LOAD_POKEDEX_ENTER", storage=storage_debug())
+    poke_id = int(pokemon_id)
+    prepared = _prepare_entry(poke_id, entry)
+
+    _fh_bc("INSERT_POKEDEX_ENTRY_ENTER", pokemon_id=poke_id, storage=storage_debug)
+    before = _version_if_cached()
 
     try:
-        raw_data = load_json_document(
-            key="pokedex",
-            fallback_loader=_load_pokedex_from_file,
-            expected_empty={},
+        stored = get_backend().put("pokedex", poke_id, prepared)
+
+        _fh_bc("INSERT_POKEDEX_ENTRY_OK", pokemon_id=poke_id, nickname=stored.get("nickname"))
+        result = _normalize_pokedex({str(poke_id): stored})[poke_id]
+
+    except Exception as e:
+        _fh_bc(
+            "INSERT_POKEDEX_ENTRY_ERR",
+            pokemon_id=poke_id,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
         )
+        # Even a failed write may have partially landed.
+        invalidate_pokedex_cache()
+        raise
+
+    # 🗂️ Keep the cache and its indexes instead of reloading everything
+    _apply_point_write(before, poke_id, result)
+    return result
+
+
+def patch_pokedex_entry(pokemon_id: int, fields: Dict[str, Any]) -> Optional[dict]:
+    """
+    Update some fields of one Pokémon.
+
+    Only the changed fields are sent to the DB. A None/blank nickname
+    removes the nickname, same as a full save would.
+    Returns the updated Pokémon, or None if it does not exist.
+    """
+    poke_id = int(pokemon_id)
+    updates = dict(fields)
+    remove_fields = ()
+
+    if "nickname" in updates and (updates["nickname"] is None or updates["nickname"] == ""):
+        updates.pop("nickname")
+        remove_fields = ("nickname",)
+
+    _fh_bc(
+        "PATCH_POKEDEX_ENTRY_ENTER",
+        pokemon_id=poke_id,
+        fields=updates,
+        removed=remove_fields,
+        storage=storage_debug,
+    )
+    before = _version_if_cached()
+
+    try:
+        updated = get_backend().patch("pokedex", poke_id, updates, remove_fields=remove_fields)
 
-        pokedex = _normalize_pokedex(raw_data)
+        if updated is None:
+            _fh_bc("PATCH_POKEDEX_ENTRY_MISSING", pokemon_id=poke_id)
+            return None
 
+        _fh_bc("PATCH_POKEDEX_ENTRY_OK", pokemon_id=poke_id, nickname=updated.get("nickname"))
+        result = _normalize_pokedex({str(poke_id): updated})[poke_id]
+
+    except Exception as e:
         _fh_bc(
-            "LOAD_POKEDEX_RETURN_OK",
-            count=len(pokedex),
-            storage=storage_debug(),
-            nicknames={str(pid): entry.get("nickname") for pid, entry in pokedex.items()},
+            "PATCH_POKEDEX_ENTRY_ERR",
+            pokemon_id=poke_id,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
         )
+        # Even a failed write may have partially landed.
+        invalidate_pokedex_cache()
+        raise
 
-        return pokedex
+    # 🗂️ Keep the cache and its indexes instead of reloading everything
+    _apply_point_write(before, poke_id, result)
+    return result
+
+
+def delete_pokedex_entry(pokemon_id: int) -> Optional[dict]:
+    """
+    Remove one Pokémon without rewriting the whole Pokédex in the DB.
+    Returns the removed Pokémon, or None if it did not exist.
+    """
+    poke_id = int(pokemon_id)
+
+    _fh_bc("DELETE_POKEDEX_ENTRY_ENTER", pokemon_id=poke_id, storage=storage_debug)
+    before = _version_if_cached()
+
+    try:
+        deleted = get_backend().delete("pokedex", poke_id)
+
+        if deleted is None:
+            _fh_bc("DELETE_POKEDEX_ENTRY_MISSING", pokemon_id=poke_id)
+            return None
+
+        _fh_bc("DELETE_POKEDEX_ENTRY_OK", pokemon_id=poke_id)
+        result = _normalize_pokedex({str(poke_id): deleted})[poke_id]
 
     except Exception as e:
         _fh_bc(
-            "LOAD_POKEDEX_ERR",
+            "DELETE_POKEDEX_ENTRY_ERR",
+            pokemon_id=poke_id,
             err_type=type(e).__name__,
             err=str(e),
             traceback=traceback.format_exc(),
-            storage=storage_debug(),
         )
+        # Even a failed write may have partially landed.
+        invalidate_pokedex_cache()
         raise
 
+    # 🗂️ Keep the cache and its indexes instead of reloading everything
+    _apply_point_write(before, poke_id, None)
+    return result
+
 
 def save_pokedex(data: Union[Dict[int, dict], Dict[Any, dict]]):
     """
     Main Pokédex saver used by the app.
 
     If DATABASE_URL exists:
-        Saves to Neon.
+        Saves to Neon. With DB_STORAGE_LAYOUT=rows only the Pokémon whose
+        content changed are written, and removed Pokémon are deleted.
+
+        When `data` is the VersionedDocument returned by load_pokedex(),
+        the save is a compare-and-swap: a concurrent writer's changes are
+        merged in, and DocumentConflictError is raised only when both
+        sides changed the same Pokémon.
+
+    If STORAGE_BACKEND=sqlite:
+        Saves to the SQLite file; only changed rows are written and the
+        same compare-and-swap merge applies.
 
     If DATABASE_URL is missing:
-        Saves to local JSON fallback.
+        Saves to local JSON fallback (new snapshot, journal dropped).
 
     This preserves old local behavior while making Render persistent.
     """
@@ -268,7 +695,7 @@ def save_pokedex(data: Union[Dict[int, dict], Dict[Any, dict]]):
         "SAVE_POKEDEX_ENTER",
         incoming_type=type(data).__name__,
         incoming_len=len(data) if hasattr(data, "__len__") else None,
-        storage=storage_debug(),
+        storage=storage_debug,
     )
 
     try:
@@ -276,61 +703,51 @@ def save_pokedex(data: Union[Dict[int, dict], Dict[Any, dict]]):
 
         for raw_key, raw_entry in data.items():
             poke_id = int(raw_key)
-
-            if not isinstance(raw_entry, dict):
-                raise TypeError(f"Pokédex entry {raw_key} is not a dict")
-
-            entry = dict(raw_entry)
-            entry["id"] = int(entry.get("id", poke_id))
-
-            # ✅ Keep old clean behavior:
-            # None/blank nickname is removed.
-            # Real nickname survives.
-            if entry.get("nickname") is None or entry.get("nickname") == "":
-                entry.pop("nickname", None)
-
-            normalized[str(poke_id)] = entry
+            normalized[str(poke_id)] = _prepare_entry(poke_id, raw_entry)
 
         _fh_bc(
             "SAVE_POKEDEX_NORMALIZED",
             count=len(normalized),
-            nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
-            storage=storage_debug(),
+            nicknames=lambda: {pid: entry.get("nickname") for pid, entry in normalized.items()},
+            storage=storage_debug,
         )
 
-        saved_to_db = save_json_document("pokedex", normalized)
+        backend = get_backend()
+        backend.replace(
+            "pokedex",
+            normalized,
+            expected_version=getattr(data, "version", None),
+            base=getattr(data, "base", None),
+        )
 
-        if saved_to_db:
-            _fh_bc(
-                "SAVE_POKEDEX_DB_OK",
-                count=len(normalized),
-                nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
-                storage=storage_debug(),
-            )
+        _fh_bc(
+            "SAVE_POKEDEX_OK",
+            backend=backend.name,
+            count=len(normalized),
+            nicknames=lambda: {pid: entry.get("nickname") for pid, entry in normalized.items()},
+        )
 
-            # ✅ Immediate verification from Neon.
-            verify_raw = load_json_document(
-                key="pokedex",
-                fallback_loader=_load_pokedex_from_file,
-                expected_empty={},
-            )
-            verify_pokedex = _normalize_pokedex(verify_raw)
+        # ✅ Verification per STORAGE_VERIFY_MODE.
+        # "hash" is checked inside the PostgreSQL write (RETURNING md5(data::text)),
+        # only "full" pays for a second read.
+        mode = verify_mode()
+
+        if mode == "full":
+            verify_raw, _verify_version = backend.load("pokedex")
+            verify_pokedex = _from_storage(verify_raw, backend)
 
             _fh_bc(
-                "SAVE_POKEDEX_DB_VERIFY_OK",
+                "SAVE_POKEDEX_VERIFY_OK",
+                mode=mode,
                 count=len(verify_pokedex),
-                verify_nicknames={
+                verify_nicknames=lambda: {
                     str(pid): entry.get("nickname")
                     for pid, entry in verify_pokedex.items()
                 },
-                storage=storage_debug(),
+                storage=storage_debug,
             )
-
-            return
-
-        # ✅ Local fallback only when DB is disabled.
-        _fh_bc("SAVE_POKEDEX_FILE_FALLBACK_BEGIN", storage=storage_debug())
-        _save_pokedex_to_file({int(k): v for k, v in normalized.items()})
+        else:
+            _fh_bc("SAVE_POKEDEX_VERIFY_OK", mode=mode, count=len(normalized))
 
     except Exception as e:
         _fh_bc(
@@ -338,6 +755,66 @@ def save_pokedex(data: Union[Dict[int, dict], Dict[Any, dict]]):
             err_type=type(e).__name__,
             err=str(e),
             traceback=traceback.format_exc(),
-            storage=storage_debug(),
+            storage=storage_debug,
         )
-        raise
\ No newline at end of file
+        raise
+
+    finally:
+        # ✅ Even a failed save may have partially landed, so always drop the cache.
+        invalidate_pokedex_cache()
+
+
+# ⚡ Async variants for async routes.
+# Same behavior as the functions above, but run on the storage executor
+# so a DB round trip never blocks the event loop.
+async def pokedex_version_async() -> Tuple[int, Any]:
+    return await run_in_store_executor(pokedex_version)
+
+
+async def load_pokedex_async() -> Dict[int, dict]:
+    return await run_in_store_executor(load_pokedex)
+
+
+async def load_pokedex_cached_async() -> Dict[int, dict]:
+    return await run_in_store_executor(load_pokedex_cached)
+
+
+async def get_pokemon_records_many_async(pokemon_ids: Iterable[int]) -> Dict[int, Union[PokemonRecord, Exception]]:
+    return await run_in_store_executor(get_pokemon_records_many, pokemon_ids)
+
+
+async def search_pokemon_records_async(
+    query: str,
+    **options: Any,
+) -> List[Tuple[float, int, Union[PokemonRecord, Exception]]]:
+    return await run_in_store_executor(search_pokemon_records, query, **options)
+
+
+async def pokedex_stats_async() -> dict:
+    return await run_in_store_executor(pokedex_stats)
+
+
+async def pokemon_records_page_async(
+    **options: Any,
+) -> Tuple[List[Tuple[int, Union[PokemonRecord, Exception]]], Optional[tuple]]:
+    return await run_in_store_executor(pokemon_records_page, **options)
+
+
+async def save_pokedex_async(data: Union[Dict[int, dict], Dict[Any, dict]]) -> None:
+    await run_in_store_executor(save_pokedex, data)
+
+
+async def allocate_pokemon_ids_async(count: int = 1) -> int:
+    return await run_in_store_executor(allocate_pokemon_ids, count)
+
+
+async def insert_pokedex_entry_async(pokemon_id: int, entry: dict) -> dict:
+    return await run_in_store_executor(insert_pokedex_entry, pokemon_id, entry)
+
+
+async def patch_pokedex_entry_async(pokemon_id: int, fields: Dict[str, Any]) -> Optional[dict]:
+    return await run_in_store_executor(patch_pokedex_entry, pokemon_id, fields)
+
+
+async def delete_pokedex_entry_async(pokemon_id: int) -> Optional[dict]:
+    return await run_in_store_executor(delete_pokedex_entry, pokemon_id)
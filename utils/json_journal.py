@@ -0,0 +1,284 @@
+import json
+import os
+import threading
+import traceback
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from utils import binary_snapshot
+
+# 📓 Journaled JSON file storage for the local (no DATABASE_URL) backend.
+#
+#   data/pokedex.json     → snapshot, rewritten only on a full save / compaction
+#   data/pokedex.journal  → one compact JSON record per line, appended per change
+#
+# The first journal line stamps which snapshot it belongs to (mtime + size).
+# If the snapshot was replaced behind our back (another tool, a test fixture,
+# or a crash right after compaction), the stamp no longer matches and the old
+# journal is ignored instead of being replayed over the wrong snapshot.
+#
+# Records are "put" (whole entry) and "del", so replaying them twice gives the
+# same result. A half-written last line (crash mid-append) is skipped.
+#
+# Optionally every snapshot also gets a binary sidecar (utils/binary_snapshot)
+# that load() prefers over parsing the JSON, while its stamp still matches.
+
+_COMPACT = (",", ":")
+
+
+def _jl_noop(event: str, **fields) -> None:
+    pass
+
+
+def _stat_stamp(path: str) -> Optional[list]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _atomic_write(path: str, text: str, fsync: bool) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonJournal:
+    """
+    Snapshot + append-only journal for one JSON object keyed by id.
+
+    Safe for threads inside one process (one lock guards appends, full
+    rewrites and compaction). It is meant for the single-process local
+    fallback, not for several workers sharing one data directory.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        journal_path: str,
+        compact_bytes: Callable[[], int],
+        fsync: Callable[[], bool],
+        breadcrumb: Callable[..., None] = _jl_noop,
+        binary_path: Optional[str] = None,
+        binary_enabled: Callable[[], bool] = lambda: False,
+        prepare: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ):
+        """
+        prepare: turns whatever load() returned from the JSON file into the
+        storage form before compaction writes it, so the binary sidecar only
+        ever holds data the caller already cleaned.
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.binary_path = binary_path
+        self._compact_bytes = compact_bytes
+        self._fsync = fsync
+        self._binary_enabled = binary_enabled
+        self._prepare = prepare
+        self._bc = breadcrumb
+        self._lock = threading.RLock()
+        self._compacting = False
+        self.stats = {
+            "appends": 0,
+            "rewrites": 0,
+            "compactions": 0,
+            "replayed": 0,
+            "stale_journals": 0,
+            "binary_loads": 0,
+        }
+
+    @property
+    def binary_active(self) -> bool:
+        return bool(self.binary_path) and self._binary_enabled() and binary_snapshot.available()
+
+    @property
+    def enabled(self) -> bool:
+        return self._compact_bytes() > 0
+
+    # 🔎 Version probe: both files' stat, so appends and rewrites are both seen
+    def version(self) -> Tuple[Any, Any]:
+        def probe(path):
+            try:
+                stat = os.stat(path)
+                return stat.st_ino, stat.st_mtime_ns, stat.st_size
+            except FileNotFoundError:
+                return None
+
+        return probe(self.snapshot_path), probe(self.journal_path)
+
+    # 📖 Read snapshot, then replay the journal tail on top of it
+    def load(self) -> Any:
+        return self.load_with_source()[0]
+
+    def load_with_source(self) -> Tuple[Any, bool]:
+        """
+        Returns (data, from_binary). from_binary=True means the base came from
+        the binary sidecar, i.e. it is already in storage form (and so is
+        every journal record), so the caller may skip re-normalizing it.
+        """
+        with self._lock:
+            data = None
+            from_binary = False
+
+            if self.binary_active:
+                data = binary_snapshot.read(self.binary_path, self.snapshot_path)
+                from_binary = data is not None
+
+            if from_binary:
+                self.stats["binary_loads"] += 1
+            elif not os.path.exists(self.snapshot_path):
+                data = {}
+            else:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+            if not os.path.exists(self.journal_path):
+                return data, from_binary
+
+            if not isinstance(data, dict):
+                # Old list-style snapshot: let the caller normalize it first.
+                return data, from_binary
+
+            replayed = self._replay_into(data)
+            if replayed:
+                self.stats["replayed"] += replayed
+                self._bc("JOURNAL_REPLAY_OK", path=self.journal_path, records=replayed)
+            return data, from_binary
+
+    def _read_header(self) -> Optional[list]:
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                first = f.readline()
+            return json.loads(first).get("snapshot")
+        except (FileNotFoundError, ValueError, AttributeError):
+            return None
+
+    def _replay_into(self, data: Dict[str, Any]) -> int:
+        replayed = 0
+
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            header_line = f.readline()
+            try:
+                header = json.loads(header_line).get("snapshot")
+            except (ValueError, AttributeError):
+                header = None
+
+            if header != _stat_stamp(self.snapshot_path):
+                self.stats["stale_journals"] += 1
+                self._bc("JOURNAL_STALE_IGNORED", path=self.journal_path, header=header)
+                return 0
+
+            for line in f:
+                if not line.endswith("\n"):
+                    self._bc("JOURNAL_TORN_TAIL_SKIPPED", path=self.journal_path)
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self._bc("JOURNAL_BAD_RECORD_SKIPPED", path=self.journal_path)
+                    continue
+
+                key = str(record.get("id"))
+                if record.get("op") == "put":
+                    data[key] = record["entry"]
+                elif record.get("op") == "del":
+                    data.pop(key, None)
+                replayed += 1
+
+        return replayed
+
+    # ✍️ Append changes — O(size of the change), not O(size of the Pokédex)
+    def append(self, records: Iterable[dict]) -> None:
+        lines = "".join(json.dumps(r, separators=_COMPACT, ensure_ascii=False) + "\n" for r in records)
+        if not lines:
+            return
+
+        with self._lock:
+            stamp = _stat_stamp(self.snapshot_path)
+
+            if stamp is None:
+                # No snapshot yet: write an empty one so the journal has an anchor.
+                _atomic_write(self.snapshot_path, "{}\n", self._fsync())
+                stamp = _stat_stamp(self.snapshot_path)
+
+            if self._read_header() != stamp:
+                # Journal missing or belongs to an older snapshot → start fresh.
+                header = json.dumps({"snapshot": stamp}, separators=_COMPACT) + "\n"
+                _atomic_write(self.journal_path, header + lines, self._fsync())
+            else:
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    f.flush()
+                    if self._fsync():
+                        os.fsync(f.fileno())
+
+            self.stats["appends"] += 1
+            journal_size = os.path.getsize(self.journal_path)
+
+        if journal_size >= self._compact_bytes():
+            self._compact_in_background()
+
+    def put(self, entry_id: Any, entry: dict) -> None:
+        self.append([{"op": "put", "id": str(entry_id), "entry": entry}])
+
+    def delete(self, entry_id: Any) -> None:
+        self.append([{"op": "del", "id": str(entry_id)}])
+
+    # 💾 Full save: new snapshot (atomic rename), journal dropped
+    def rewrite(self, data: Dict[str, Any]) -> None:
+        with self._lock:
+            _atomic_write(
+                self.snapshot_path,
+                json.dumps(data, indent=4, ensure_ascii=False),
+                self._fsync(),
+            )
+            # Snapshot already holds everything; a leftover journal would be
+            # stale anyway (stamp mismatch), removing it just saves disk.
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+
+            if self.binary_active:
+                binary_snapshot.write(self.binary_path, self.snapshot_path, data, self._fsync())
+            elif self.binary_path:
+                binary_snapshot.remove(self.binary_path)
+
+            self.stats["rewrites"] += 1
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot."""
+        with self._lock:
+            if not os.path.exists(self.journal_path):
+                return
+            data, from_binary = self.load_with_source()
+            if self._prepare is not None and not from_binary:
+                data = self._prepare(data)
+            self.rewrite(data)
+            self.stats["compactions"] += 1
+            self._bc("JOURNAL_COMPACT_OK", path=self.snapshot_path, count=len(data))
+
+    def _compact_in_background(self) -> None:
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                self._bc(
+                    "JOURNAL_COMPACT_ERR",
+                    err_type=type(e).__name__,
+                    err=str(e),
+                    traceback=traceback.format_exc(),
+                )
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, name="journal-compaction", daemon=True).start()
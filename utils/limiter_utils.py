@@ -2,14 +2,10 @@ from typing import Any
 
 from utils.limiter import limiter
 from config import settings
+from utils.tracing import get_tracer
 
 
-def _lim_bc(event: str, **fields) -> None:
-    try:
-        parts = " ".join(f"{k}={repr(v)}" for k, v in fields.items())
-        print(f"[LIM_BC] {event}" + (f" {parts}" if parts else ""), flush=True)
-    except Exception as e:
-        print(f"[LIM_BC] {event} breadcrumb_error={type(e).__name__}:{e}", flush=True)
+_lim_bc = get_tracer("LIM_BC")
 
 
 def _safe_req_path(request: Any) -> str | None:
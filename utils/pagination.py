@@ -0,0 +1,49 @@
+import base64
+import binascii
+import json
+from typing import Tuple
+
+# 🔖 Opaque page cursors for list routes.
+#
+# A cursor is the keyset position of the last item sent (see
+# PokedexIndex.page) plus the order it belongs to, as url-safe base64 JSON.
+# Clients pass it back untouched; it is only valid for the same sort_by and
+# order it was issued for.
+
+# Shape of the position tuple per order: id → (id,), level → (level, id), name → (name, id)
+_KEY_TYPES = {
+    "id": (int,),
+    "level": (int, int),
+    "name": (str, int),
+}
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was issued for a different sort order."""
+
+
+def encode_cursor(sort_by: str, descending: bool, position: tuple) -> str:
+    raw = json.dumps([sort_by, "desc" if descending else "asc", list(position)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_order, position = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+
+    if cursor_sort != sort_by or cursor_order != ("desc" if descending else "asc"):
+        raise InvalidCursorError(f"Cursor was issued for sort_by={cursor_sort}&order={cursor_order}")
+
+    types = _KEY_TYPES.get(sort_by)
+    if (
+        types is None
+        or not isinstance(position, list)
+        or len(position) != len(types)
+        or not all(type(value) is kind for value, kind in zip(position, types))
+    ):
+        raise InvalidCursorError("Malformed cursor")
+
+    return tuple(position)
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from models.pokemon_batch import CreateOperation, PatchOperation
+
+# 📦 All-or-nothing application of POST /pokemon/batch operations.
+#
+# Operations run in order against a staged overlay of the loaded Pokédex
+# (a later op sees an earlier one's result). The document itself is only
+# touched once every operation succeeded, so a failed batch leaves it
+# exactly as loaded and the caller's single save never happens.
+
+
+class BatchRejected(Exception):
+    """At least one operation failed; nothing was applied."""
+
+    def __init__(self, results: List[dict]):
+        failed = sum(1 for result in results if result["status"] == "not_found")
+        super().__init__(f"{failed} of {len(results)} batch operations failed; nothing was saved")
+        self.results = results
+
+
+def _patch_updates(operation: PatchOperation) -> Dict[str, Any]:
+    # Same rules as PATCH /pokemon/{id}: unset fields are left alone
+    changes = operation.changes
+    updates = {}
+    if changes.level is not None:
+        updates["level"] = changes.level
+    if changes.ptype is not None:
+        updates["ptype"] = changes.ptype
+    if changes.nickname is not None:
+        updates["nickname"] = changes.nickname
+    return updates
+
+
+def apply_operations(document: Dict[int, dict], operations: List[Any], new_ids: Iterator[int]) -> List[dict]:
+    """
+    Apply `operations` to `document` (a loaded Pokédex) and return one
+    result per operation, in order. `new_ids` supplies ids for creates.
+
+    Raises BatchRejected (document untouched) if any operation fails.
+    """
+    staged: Dict[int, Optional[dict]] = {}  # id → new entry, or None = deleted
+    results: List[dict] = []
+    failed = False
+
+    def current(pid: int) -> Optional[dict]:
+        return staged[pid] if pid in staged else document.get(pid)
+
+    for operation in operations:
+        if isinstance(operation, CreateOperation):
+            entry = operation.pokemon.model_dump()
+            if entry.get("nickname") is None:
+                entry.pop("nickname", None)  # 🧹 Same as POST /pokemon/
+            pid = next(new_ids)
+            entry["id"] = pid
+            staged[pid] = entry
+            results.append({"op": "create", "id": pid, "status": "created", "data": {**entry, "nickname": entry.get("nickname")}})
+            continue
+
+        pid = operation.id
+        existing = current(pid)
+
+        if existing is None:
+            failed = True
+            results.append({"op": operation.op, "id": pid, "status": "not_found", "detail": "Pokemon not found"})
+            continue
+
+        if isinstance(operation, PatchOperation):
+            merged = {**existing, **_patch_updates(operation)}
+            if merged.get("nickname") in (None, ""):
+                merged.pop("nickname", None)  # 🧹 Blank nickname clears it
+            staged[pid] = merged
+            results.append({"op": "patch", "id": pid, "status": "updated", "data": {"id": pid, **merged}})
+        else:
+            staged[pid] = None
+            results.append({"op": "delete", "id": pid, "status": "deleted", "data": {"id": pid, **existing}})
+
+    if failed:
+        for result in results:
+            if result["status"] in ("created", "updated", "deleted"):
+                result["status"] = "not_applied"
+                result.pop("data", None)
+        raise BatchRejected(results)
+
+    for pid, entry in staged.items():
+        if entry is None:
+            document.pop(pid, None)
+        else:
+            document[pid] = entry
+
+    return results
@@ -0,0 +1,66 @@
+import csv
+import io
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from models.pokemon_record import PokemonRecord
+
+# 📤 Chunk encoders for the streaming Pokédex export (GET /pokemon/export).
+#
+# Each takes an iterable of batches — lists of (id, PokemonRecord) — and
+# yields one encoded chunk per batch, so only one batch is ever held in
+# memory. gzip_chunks() can wrap either.
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Same column names upload_csv reads back (plus id)
+CSV_COLUMNS = ["id", "name", "level", "ptype", "nickname"]
+
+Batch = List[Tuple[int, PokemonRecord]]
+
+
+def ndjson_chunks(batches: Iterable[Batch]) -> Iterator[bytes]:
+    # The record body is the pre-rendered Pokemon object; only the id is spliced in
+    for batch in batches:
+        if batch:
+            yield b"".join(b'{"id":%d,%s\n' % (pid, record.body[1:]) for pid, record in batch)
+
+
+def csv_chunks(batches: Iterable[Batch]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+
+    for batch in batches:
+        for pid, record in batch:
+            writer.writerow([pid, record.name, record.level, record.ptype, record.nickname or ""])
+
+        chunk = buffer.getvalue()
+        if chunk:
+            yield chunk.encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    # Empty export: still send the header row
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for item in (accept_encoding or "").split(","):
+        coding, _sep, params = item.partition(";")
+        if coding.strip().lower() in ("gzip", "x-gzip"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
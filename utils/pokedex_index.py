@@ -0,0 +1,431 @@
+import threading
+from collections import Counter
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.trigram_index import TrigramIndex
+
+# 🗂️ Secondary indexes over the cached Pokédex.
+#
+#   ptype → hash index        {type (casefolded): {ids}}
+#   level → sorted list       [(level, id)]               bisect range queries
+#   name  → sorted list       [(name (casefolded), id)]   bisect prefix queries
+#   id    → sorted list       [(id,)]                     default list order
+#   names → trigram index     name / poke_name / nickname  fuzzy search
+#   stats → running totals    type counts, level histogram/sum, nicknames
+#
+# A filter bisects every index it can use, walks only the smallest matching
+# slice and checks the other filters on those k entries: O(log n + k) instead
+# of a scan over pokedex.values().
+#
+# `entries` is the Pokédex being indexed and `records` (optional) the same
+# entries as validated typed records, built by the `record` factory once per
+# entry as it enters the index. Both are updated in place under `lock`, so a
+# point write costs O(log n), not a copy of the whole Pokédex. Code outside
+# the lock reads snapshot() / records_snapshot() instead: a copy made on the
+# first read after a write and shared by every read until the next one.
+# The trigram index is only built on the first search, then kept in step
+# by upsert()/remove() like the others. The running totals behind stats()
+# move by ± one entry per update, so a stats read never walks the Pokédex.
+
+_NAME_END = "\U0010ffff"
+
+# Orders page() can walk; a position in one is its key tuple, e.g. (level, id)
+SORT_ORDERS = ("id", "level", "name")
+
+# (ptype key, level key, name key) of one entry; None = not indexed
+_Keys = Tuple[Optional[str], Optional[int], Optional[str]]
+
+
+def _entry_keys(entry: dict) -> _Keys:
+    ptype = entry.get("ptype", entry.get("Type"))
+    name = entry.get("name", entry.get("poke_name"))
+
+    try:
+        level = int(entry.get("level"))
+    except (TypeError, ValueError):
+        level = None
+
+    return (
+        str(ptype).casefold() if ptype is not None else None,
+        level,
+        str(name).casefold() if name is not None else None,
+    )
+
+
+def _search_texts(entry: dict) -> List[str]:
+    return [entry.get("name"), entry.get("poke_name"), entry.get("nickname")]
+
+
+_LEVEL_BUCKET = 10  # histogram width: 1-10, 11-20, ... 91-100
+
+
+class _Aggregates:
+    """Running totals for stats(); add()/remove() one entry's facets."""
+
+    __slots__ = ("count", "by_type", "buckets", "level_count", "level_sum", "nicknamed")
+
+    def __init__(self):
+        self.count = 0
+        self.by_type: Counter = Counter()
+        self.buckets: Counter = Counter()
+        self.level_count = 0
+        self.level_sum = 0
+        self.nicknamed = 0
+
+    def add(self, facets: "_Facets", sign: int = 1) -> None:
+        ptype, level, nicknamed = facets
+        self.count += sign
+        if ptype is not None:
+            self.by_type[ptype] += sign
+            if self.by_type[ptype] <= 0:
+                del self.by_type[ptype]
+        if level is not None:
+            bucket = (level - 1) // _LEVEL_BUCKET
+            self.buckets[bucket] += sign
+            if self.buckets[bucket] <= 0:
+                del self.buckets[bucket]
+            self.level_count += sign
+            self.level_sum += sign * level
+        if nicknamed:
+            self.nicknamed += sign
+
+    def remove(self, facets: "_Facets") -> None:
+        self.add(facets, sign=-1)
+
+
+# (type as stored, level, has a nickname) of one entry, for _Aggregates
+_Facets = Tuple[Optional[str], Optional[int], bool]
+
+
+def _entry_facets(entry: dict, keys: _Keys) -> _Facets:
+    ptype = entry.get("ptype", entry.get("Type"))
+    return (str(ptype) if ptype is not None else None, keys[1], bool(entry.get("nickname")))
+
+
+def _remove_sorted(items: List[tuple], item: tuple) -> None:
+    i = bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
+
+
+class PokedexIndex:
+    """
+    Type / level / name-prefix indexes for one Pokédex snapshot.
+
+    Built once per cache load, then kept in step by upsert()/remove() for
+    point writes. The sorted lists use bisect for lookups; an update still
+    shifts the list (a memmove), which is cheap next to a full reload.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[int, dict]] = None,
+        record: Optional[Callable[[int, dict], Any]] = None,
+    ):
+        self.lock = threading.RLock()
+        self.entries: Dict[int, dict] = {}
+        self.records: Dict[int, Any] = {}  # record, or the exception that entry raised
+        self._make_record = record
+        self._keys: Dict[int, _Keys] = {}
+        self._by_type: Dict[str, Set[int]] = {}
+        self._by_level: List[Tuple[int, int]] = []
+        self._by_name: List[Tuple[str, int]] = []
+        self._by_id: List[Tuple[int]] = []
+        self._names: Optional[TrigramIndex] = None  # built lazily by search()
+        self._facets: Dict[int, _Facets] = {}
+        self._totals = _Aggregates()
+        self._snapshots: Dict[str, dict] = {}  # "entries" / "records" copies for lock-free readers
+
+        if entries:
+            self.rebuild(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _record(self, pid: int, entry: dict) -> Any:
+        try:
+            return self._make_record(pid, entry)
+        except Exception as e:
+            # Kept so readers can report the bad entry; the rest still work
+            return e
+
+    def rebuild(self, entries: Dict[int, dict]) -> None:
+        keys = {pid: _entry_keys(entry) for pid, entry in entries.items()}
+
+        by_type: Dict[str, Set[int]] = {}
+        for pid, (ptype, _level, _name) in keys.items():
+            if ptype is not None:
+                by_type.setdefault(ptype, set()).add(pid)
+
+        by_level = sorted((level, pid) for pid, (_t, level, _n) in keys.items() if level is not None)
+        by_name = sorted((name, pid) for pid, (_t, _l, name) in keys.items() if name is not None)
+        by_id = sorted((pid,) for pid in keys)
+
+        facets = {pid: _entry_facets(entry, keys[pid]) for pid, entry in entries.items()}
+        totals = _Aggregates()
+        for entry_facets in facets.values():
+            totals.add(entry_facets)
+
+        records = {}
+        if self._make_record is not None:
+            records = {pid: self._record(pid, entry) for pid, entry in entries.items()}
+
+        with self.lock:
+            self.entries = dict(entries)  # ours now: upsert()/remove() edit it in place
+            self.records = records
+            self._keys = keys
+            self._by_type = by_type
+            self._by_level = by_level
+            self._by_name = by_name
+            self._by_id = by_id
+            self._names = None
+            self._facets = facets
+            self._totals = totals
+            self._snapshots = {}
+
+    # 📸 Read-only copies for readers that iterate without the lock
+    def _snapshot(self, name: str) -> dict:
+        with self.lock:
+            copy = self._snapshots.get(name)
+            if copy is None:
+                copy = self._snapshots[name] = dict(getattr(self, name))
+            return copy
+
+    def snapshot(self) -> Dict[int, dict]:
+        """The entries as of now; later writes never change it. Shared — do not mutate."""
+        return self._snapshot("entries")
+
+    def records_snapshot(self) -> Dict[int, Any]:
+        """snapshot() for `records`."""
+        return self._snapshot("records")
+
+    # ✏️ Incremental maintenance
+    def upsert(self, pid: int, entry: dict) -> None:
+        with self.lock:
+            self._unindex(pid)
+            self._index(pid, entry)
+            self.entries[pid] = entry
+            if self._make_record is not None:
+                self.records[pid] = self._record(pid, entry)
+            self._snapshots.clear()
+
+    def remove(self, pid: int) -> None:
+        with self.lock:
+            self._unindex(pid)
+            self.entries.pop(pid, None)
+            self.records.pop(pid, None)
+            self._snapshots.clear()
+
+    def _index(self, pid: int, entry: dict) -> None:
+        keys = _entry_keys(entry)
+        ptype, level, name = keys
+        self._keys[pid] = keys
+        insort(self._by_id, (pid,))
+        if self._names is not None:
+            self._names.add(pid, _search_texts(entry))
+
+        facets = self._facets[pid] = _entry_facets(entry, keys)
+        self._totals.add(facets)
+
+        if ptype is not None:
+            self._by_type.setdefault(ptype, set()).add(pid)
+        if level is not None:
+            insort(self._by_level, (level, pid))
+        if name is not None:
+            insort(self._by_name, (name, pid))
+
+    def _unindex(self, pid: int) -> None:
+        if self._names is not None:
+            self._names.remove(pid)
+
+        keys = self._keys.pop(pid, None)
+        if keys is None:
+            return
+
+        self._totals.remove(self._facets.pop(pid))
+
+        ptype, level, name = keys
+        _remove_sorted(self._by_id, (pid,))
+
+        if ptype is not None:
+            ids = self._by_type.get(ptype)
+            if ids is not None:
+                ids.discard(pid)
+                if not ids:
+                    del self._by_type[ptype]
+        if level is not None:
+            _remove_sorted(self._by_level, (level, pid))
+        if name is not None:
+            _remove_sorted(self._by_name, (name, pid))
+
+    # 🔎 Queries
+    def _level_bounds(self, min_level: Optional[int], max_level: Optional[int]) -> Tuple[int, int]:
+        lo = 0 if min_level is None else bisect_left(self._by_level, (int(min_level),))
+        hi = len(self._by_level) if max_level is None else bisect_left(self._by_level, (int(max_level) + 1,))
+        return lo, max(lo, hi)
+
+    def _name_bounds(self, prefix: str) -> Tuple[int, int]:
+        prefix = prefix.casefold()
+        lo = bisect_left(self._by_name, (prefix,))
+        hi = bisect_left(self._by_name, (prefix + _NAME_END,))
+        return lo, hi
+
+    def filter_ids(
+        self,
+        ptype: Optional[str] = None,
+        min_level: Optional[int] = None,
+        max_level: Optional[int] = None,
+        name_prefix: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Ids matching every given filter, in id order.
+
+        Filters left as None are ignored; with no filters at all this is
+        every id.
+        """
+        with self.lock:
+            # (size, ids) per usable index — only the smallest one is walked
+            sources: List[Tuple[int, Iterable[int]]] = []
+
+            if ptype is not None:
+                ids = self._by_type.get(ptype.casefold(), ())
+                sources.append((len(ids), ids))
+
+            if min_level is not None or max_level is not None:
+                lo, hi = self._level_bounds(min_level, max_level)
+                sources.append((hi - lo, (self._by_level[i][1] for i in range(lo, hi))))
+
+            if name_prefix:
+                lo, hi = self._name_bounds(name_prefix)
+                sources.append((hi - lo, (self._by_name[i][1] for i in range(lo, hi))))
+
+            if not sources:
+                return sorted(self.entries)
+
+            _size, candidates = min(sources, key=lambda source: source[0])
+            wanted_type = ptype.casefold() if ptype is not None else None
+            wanted_prefix = name_prefix.casefold() if name_prefix else None
+
+            matches = []
+            for pid in candidates:
+                entry_type, level, name = self._keys[pid]
+
+                if wanted_type is not None and entry_type != wanted_type:
+                    continue
+                if min_level is not None and (level is None or level < min_level):
+                    continue
+                if max_level is not None and (level is None or level > max_level):
+                    continue
+                if wanted_prefix is not None and (name is None or not name.startswith(wanted_prefix)):
+                    continue
+
+                matches.append(pid)
+
+            matches.sort()
+            return matches
+
+    def filter(self, **filters: Any) -> List[dict]:
+        """Entries for filter_ids(**filters) — shared, do not mutate."""
+        with self.lock:
+            entries = self.entries
+            return [entries[pid] for pid in self.filter_ids(**filters)]
+
+    def _sort_key(self, by: str, pid: int) -> Optional[tuple]:
+        _ptype, level, name = self._keys[pid]
+        if by == "level":
+            return None if level is None else (level, pid)
+        if by == "name":
+            return None if name is None else (name, pid)
+        return (pid,)
+
+    def page(
+        self,
+        by: str = "id",
+        descending: bool = False,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        **filters: Any,
+    ) -> Tuple[List[int], Optional[tuple]]:
+        """
+        Keyset page: ids of up to `limit` entries that come strictly after
+        the position `after` in the given order (ties broken by id), plus
+        the position of the last one if more entries follow (else None).
+
+        Positions are key tuples, not offsets, so a page boundary stays put
+        while other entries are added or removed. Unfiltered pages bisect
+        the presorted list (O(log n + limit)); filtered ones sort only the
+        k matching entries. Entries without the sort field are left out.
+        """
+        if by not in SORT_ORDERS:
+            raise ValueError(f"Cannot order the Pokédex by {by!r}")
+
+        with self.lock:
+            if any(value is not None for value in filters.values()):
+                keys = [self._sort_key(by, pid) for pid in self.filter_ids(**filters)]
+                keys = [key for key in keys if key is not None]
+                if by != "id":
+                    keys.sort()
+            else:
+                keys = {"id": self._by_id, "level": self._by_level, "name": self._by_name}[by]
+
+            count = len(keys)
+            size = count if limit is None else max(limit, 0)
+
+            if descending:
+                stop = count if after is None else bisect_left(keys, after)
+                start = max(0, stop - size)
+                positions = range(stop - 1, start - 1, -1)
+                more = start > 0
+            else:
+                start = 0 if after is None else bisect_right(keys, after)
+                stop = min(count, start + size)
+                positions = range(start, stop)
+                more = stop < count
+
+            ids = [keys[i][-1] for i in positions]
+            last = keys[positions[-1]] if more and positions else None
+            return ids, last
+
+    def search(self, query: str, k: int = 10, min_score: float = 0.0) -> List[Tuple[float, int]]:
+        """
+        Fuzzy name search: the best `k` (score, id) pairs by trigram
+        similarity (0–1) over name, poke_name and nickname.
+        """
+        with self.lock:
+            if self._names is None:
+                names = TrigramIndex()
+                for pid, entry in self.entries.items():
+                    names.add(pid, _search_texts(entry))
+                self._names = names
+
+            return self._names.search(query, k=k, min_score=min_score)
+
+    def stats(self) -> dict:
+        """
+        Aggregate figures from the running totals: O(types + buckets), not
+        O(n). min/max come off the ends of the sorted level index.
+        """
+        with self.lock:
+            totals = self._totals
+            by_level = self._by_level
+
+            buckets = dict.fromkeys(range(100 // _LEVEL_BUCKET), 0)
+            buckets.update(totals.buckets)
+
+            return {
+                "count": totals.count,
+                "by_type": dict(sorted(totals.by_type.items())),
+                "level": {
+                    "min": by_level[0][0] if by_level else None,
+                    "max": by_level[-1][0] if by_level else None,
+                    "mean": round(totals.level_sum / totals.level_count, 2) if totals.level_count else None,
+                    "histogram": {
+                        f"{b * _LEVEL_BUCKET + 1}-{(b + 1) * _LEVEL_BUCKET}": n for b, n in sorted(buckets.items())
+                    },
+                },
+                "nicknames": {
+                    "count": totals.nicknamed,
+                    "coverage": round(totals.nicknamed / totals.count, 4) if totals.count else 0.0,
+                },
+            }
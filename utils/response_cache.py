@@ -0,0 +1,88 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+# 🧊 Already-encoded response bodies, per (route key, data version).
+#
+# An entry is only served while the data version it was built from is still
+# current, so any write that bumps the version (save_pokedex, point writes,
+# another worker) retires every entry built before it — no explicit purge.
+# ETags are strong: a hash of the exact bytes sent.
+
+
+class CachedResponse(NamedTuple):
+    version: Any
+    etag: str
+    body: bytes
+    headers: Dict[str, str]
+
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, "*" matches anything)."""
+    if not if_none_match:
+        return False
+
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    LRU-bounded map of key → CachedResponse. get() only returns an entry
+    built for the given version; older ones are dropped on sight.
+    max_entries=0 disables caching (put() still computes the ETag).
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable, version: Any) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+
+            if entry is not None:
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def put(
+        self,
+        key: Hashable,
+        version: Any,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CachedResponse:
+        entry = CachedResponse(version, strong_etag(body), body, dict(headers or {}))
+
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, **self._stats}
@@ -0,0 +1,404 @@
+import json
+import os
+import sqlite3
+import threading
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import settings
+from utils.db_json_store import DocumentConflictError, merge_documents
+from utils.tracing import get_tracer
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# 🗄️ Embedded SQLite backend (STORAGE_BACKEND=sqlite)
+#
+# One real table per collection instead of one JSON blob:
+#   pokemon(id, name, level, ptype, nickname, data)
+#   team(slot_id, position, data)
+#   store_meta(collection, version, seeded)           ← version bumps on every write
+#   id_counters(collection, next_id)                  ← allocate_ids()
+#
+# `data` keeps the full entry as JSON so unknown fields survive; the typed
+# columns mirror it for ad-hoc inspection with the sqlite3 shell. Filtering
+# and sorting go through the in-memory PokedexIndex (utils/pokedex_index), so
+# the table carries no secondary indexes to maintain on writes. WAL mode lets
+# readers run while a write is in progress, and every write is its own
+# durable transaction.
+
+_TABLES = {
+    "pokedex": {"table": "pokemon", "key": "id", "order": "id"},
+    "team": {"table": "team", "key": "slot_id", "order": "position"},
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pokemon (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT COLLATE NOCASE,
+    level    INTEGER,
+    ptype    TEXT COLLATE NOCASE,
+    nickname TEXT,
+    data     TEXT NOT NULL
+);
+
+-- Unused secondary indexes from earlier versions of this schema
+DROP INDEX IF EXISTS idx_pokemon_ptype;
+DROP INDEX IF EXISTS idx_pokemon_level;
+DROP INDEX IF EXISTS idx_pokemon_name;
+
+CREATE TABLE IF NOT EXISTS team (
+    slot_id  TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data     TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    collection TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL DEFAULT 0,
+    seeded     INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS id_counters (
+    collection TEXT PRIMARY KEY,
+    next_id    INTEGER NOT NULL
+);
+"""
+
+# ✅ One connection per thread (sqlite3 connections are not shared across threads)
+_LOCAL = threading.local()
+
+
+_sql_bc = get_tracer("SQL_BC")
+
+
+def sqlite_path() -> str:
+    return settings.SQLITE_PATH
+
+
+def _dumps(entry: Any) -> str:
+    return json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+
+
+def _loads(data: str) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _spec(collection: str) -> dict:
+    try:
+        return _TABLES[collection]
+    except KeyError:
+        raise ValueError(f"Unknown SQLite collection {collection!r}") from None
+
+
+def _connect() -> sqlite3.Connection:
+    path = sqlite_path()
+    conn = getattr(_LOCAL, "conn", None)
+
+    if conn is not None and _LOCAL.path == path and _LOCAL.pid == os.getpid():
+        return conn
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # isolation_level=None → we issue BEGIN/COMMIT ourselves
+    conn = sqlite3.connect(
+        path,
+        timeout=max(0, int(settings.SQLITE_BUSY_TIMEOUT_MS)) / 1000.0,
+        isolation_level=None,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # Durable in WAL mode except on power loss
+    conn.executescript(_SCHEMA)
+
+    _LOCAL.conn = conn
+    _LOCAL.path = path
+    _LOCAL.pid = os.getpid()
+
+    _sql_bc("SQLITE_CONNECTED", path=path, thread=threading.current_thread().name)
+    return conn
+
+
+@contextmanager
+def _transaction(write: bool = False):
+    """
+    BEGIN IMMEDIATE for writes takes the write lock up front, so a
+    read-modify-write inside it can never be lost to another writer.
+    """
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def close_connection() -> None:
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        conn.close()
+        _LOCAL.conn = None
+
+
+def _version(conn: sqlite3.Connection, collection: str) -> Optional[int]:
+    row = conn.execute("SELECT version FROM store_meta WHERE collection = ?", (collection,)).fetchone()
+    return row[0] if row else None
+
+
+def _bump_version(conn: sqlite3.Connection, collection: str) -> int:
+    return conn.execute(
+        """
+        INSERT INTO store_meta (collection, version, seeded) VALUES (?, 1, 1)
+        ON CONFLICT (collection) DO UPDATE SET version = version + 1, seeded = 1
+        RETURNING version
+        """,
+        (collection,),
+    ).fetchone()[0]
+
+
+def _put_row(conn: sqlite3.Connection, collection: str, entry_id: Any, entry: dict, position: Optional[int] = None) -> None:
+    if collection == "pokedex":
+        conn.execute(
+            """
+            INSERT INTO pokemon (id, name, level, ptype, nickname, data) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                name = excluded.name, level = excluded.level, ptype = excluded.ptype,
+                nickname = excluded.nickname, data = excluded.data
+            """,
+            (
+                int(entry_id),
+                entry.get("name"),
+                entry.get("level"),
+                entry.get("ptype"),
+                entry.get("nickname"),
+                _dumps(entry),
+            ),
+        )
+    else:
+        conn.execute(
+            """
+            INSERT INTO team (slot_id, position, data)
+            VALUES (?, COALESCE(?, (SELECT COALESCE(MAX(position), 0) + 1 FROM team)), ?)
+            ON CONFLICT (slot_id) DO UPDATE SET
+                position = COALESCE(?, team.position), data = excluded.data
+            """,
+            (str(entry_id), position, _dumps(entry), position),
+        )
+
+
+def _read_rows(conn: sqlite3.Connection, collection: str) -> Dict[str, Any]:
+    spec = _spec(collection)
+    rows = conn.execute(f"SELECT {spec['key']}, data FROM {spec['table']} ORDER BY {spec['order']}")
+    return {str(key): _loads(data) for key, data in rows}
+
+
+def _ensure_seeded(collection: str, fallback_loader: Callable[[], Any]) -> None:
+    """
+    First use of a collection copies the existing JSON file into SQLite,
+    the same way the PostgreSQL backend seeds its row.
+    """
+    conn = _connect()
+    row = conn.execute("SELECT seeded FROM store_meta WHERE collection = ?", (collection,)).fetchone()
+    if row and row[0]:
+        return
+
+    seed = fallback_loader() or {}
+
+    with _transaction(write=True) as conn:
+        row = conn.execute("SELECT seeded FROM store_meta WHERE collection = ?", (collection,)).fetchone()
+        if row and row[0]:
+            return  # Another thread/process seeded it while we loaded the file
+
+        for position, (entry_id, entry) in enumerate(seed.items(), start=1):
+            _put_row(conn, collection, entry_id, entry, position)
+        _bump_version(conn, collection)
+
+    _sql_bc("SQLITE_SEEDED", collection=collection, count=len(seed))
+
+
+# 📖 Reads
+def load_collection_versioned(collection: str, fallback_loader: Callable[[], Any]) -> Tuple[Dict[str, Any], Optional[int]]:
+    _ensure_seeded(collection, fallback_loader)
+
+    with _transaction() as conn:
+        version = _version(conn, collection)
+        data = _read_rows(conn, collection)
+
+    _sql_bc("SQLITE_LOAD_OK", collection=collection, count=len(data), version=version)
+    return data, version
+
+
+def collection_version(collection: str) -> Optional[int]:
+    return _version(_connect(), collection)
+
+
+def get_entry(collection: str, entry_id: Any, fallback_loader: Callable[[], Any]) -> Optional[dict]:
+    _ensure_seeded(collection, fallback_loader)
+    spec = _spec(collection)
+
+    row = _connect().execute(
+        f"SELECT data FROM {spec['table']} WHERE {spec['key']} = ?",
+        (int(entry_id) if collection == "pokedex" else str(entry_id),),
+    ).fetchone()
+    return _loads(row[0]) if row else None
+
+
+def get_entries(collection: str, entry_ids, fallback_loader: Callable[[], Any]) -> Dict[str, dict]:
+    _ensure_seeded(collection, fallback_loader)
+    spec = _spec(collection)
+    keys = [int(k) if collection == "pokedex" else str(k) for k in entry_ids]
+    if not keys:
+        return {}
+
+    placeholders = ",".join("?" * len(keys))
+    rows = _connect().execute(
+        f"SELECT {spec['key']}, data FROM {spec['table']} WHERE {spec['key']} IN ({placeholders})",
+        keys,
+    )
+    found = {str(key): _loads(data) for key, data in rows}
+    return {str(key): found[str(key)] for key in keys if str(key) in found}
+
+
+# ✍️ Writes
+def save_collection(
+    collection: str,
+    data: Dict[str, Any],
+    expected_version: Optional[int] = None,
+    base: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Replace a collection, writing only rows whose content changed.
+
+    With expected_version (from load_collection_versioned) a concurrent save
+    is merged in with merge_documents; the IMMEDIATE transaction makes the
+    check + merge + write atomic, so no retry loop is needed.
+    """
+    try:
+        with _transaction(write=True) as conn:
+            spec = _spec(collection)
+            current_version = _version(conn, collection)
+            existing = {
+                str(key): raw
+                for key, raw in conn.execute(f"SELECT {spec['key']}, data FROM {spec['table']}")
+            }
+
+            if expected_version is not None and current_version != expected_version:
+                theirs = {key: _loads(raw) for key, raw in existing.items()}
+                data = merge_documents(collection, base, data, theirs)
+                _sql_bc("SQLITE_SAVE_MERGED", collection=collection, expected=expected_version, found=current_version)
+
+            for entry_id in set(existing) - {str(k) for k in data}:
+                conn.execute(f"DELETE FROM {spec['table']} WHERE {spec['key']} = ?", (entry_id,))
+
+            written = 0
+            for position, (entry_id, entry) in enumerate(data.items(), start=1):
+                if collection == "team" or existing.get(str(entry_id)) != _dumps(entry):
+                    _put_row(conn, collection, entry_id, entry, position)
+                    written += 1
+
+            version = _bump_version(conn, collection)
+
+        _sql_bc("SQLITE_SAVE_OK", collection=collection, count=len(data), written=written, version=version)
+        return True
+
+    except DocumentConflictError:
+        raise
+    except Exception as e:
+        _sql_bc(
+            "SQLITE_SAVE_ERR",
+            collection=collection,
+            err_type=type(e).__name__,
+            err=str(e),
+            traceback=traceback.format_exc(),
+        )
+        raise
+
+
+def insert_entry(collection: str, entry_id: Any, entry: dict, fallback_loader: Callable[[], Any]) -> dict:
+    _ensure_seeded(collection, fallback_loader)
+
+    with _transaction(write=True) as conn:
+        _put_row(conn, collection, entry_id, entry)
+        _bump_version(conn, collection)
+
+    return entry
+
+
+def patch_entry(
+    collection: str,
+    entry_id: Any,
+    fields: Dict[str, Any],
+    fallback_loader: Callable[[], Any],
+    remove_fields=(),
+) -> Optional[dict]:
+    _ensure_seeded(collection, fallback_loader)
+    spec = _spec(collection)
+    key = int(entry_id) if collection == "pokedex" else str(entry_id)
+
+    with _transaction(write=True) as conn:
+        row = conn.execute(f"SELECT data FROM {spec['table']} WHERE {spec['key']} = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        updated = {k: v for k, v in _loads(row[0]).items() if k not in remove_fields}
+        updated.update(fields)
+        _put_row(conn, collection, key, updated)
+        _bump_version(conn, collection)
+
+    return updated
+
+
+def delete_entry(collection: str, entry_id: Any, fallback_loader: Callable[[], Any]) -> Optional[dict]:
+    _ensure_seeded(collection, fallback_loader)
+    spec = _spec(collection)
+    key = int(entry_id) if collection == "pokedex" else str(entry_id)
+
+    with _transaction(write=True) as conn:
+        row = conn.execute(
+            f"DELETE FROM {spec['table']} WHERE {spec['key']} = ? RETURNING data", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        _bump_version(conn, collection)
+
+    return _loads(row[0])
+
+
+# 🔢 ID allocation
+def allocate_ids(collection: str, count: int, fallback_loader: Callable[[], Any]) -> int:
+    """
+    Reserve `count` consecutive Pokédex ids and return the first.
+
+    The counter never drops below MAX(id) + 1 — a single b-tree lookup on
+    the INTEGER PRIMARY KEY — so ids written explicitly (full saves, CSV
+    imports with an id column) are never handed out again.
+    """
+    if collection != "pokedex":
+        raise ValueError(f"SQLite collection {collection!r} has no integer ids to allocate")
+    if count < 1:
+        raise ValueError("allocate_ids() needs count >= 1")
+
+    _ensure_seeded(collection, fallback_loader)
+
+    with _transaction(write=True) as conn:
+        floor = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM pokemon").fetchone()[0]
+        row = conn.execute("SELECT next_id FROM id_counters WHERE collection = ?", (collection,)).fetchone()
+        first_id = max(floor, row[0] if row else 1)
+
+        conn.execute(
+            """
+            INSERT INTO id_counters (collection, next_id) VALUES (?, ?)
+            ON CONFLICT (collection) DO UPDATE SET next_id = excluded.next_id
+            """,
+            (collection, first_id + count),
+        )
+
+    _sql_bc("SQLITE_IDS_ALLOCATED", collection=collection, first_id=first_id, count=count)
+    return first_id
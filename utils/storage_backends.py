@@ -0,0 +1,608 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import threading
+import traceback
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from config import settings
+from utils import sqlite_store
+from utils.db_json_store import (
+    allocate_ids,
+    delete_entry,
+    document_version,
+    get_json_row,
+    get_json_rows_many,
+    insert_entry,
+    load_json_document_versioned,
+    load_json_rows,
+    merge_documents,
+    patch_entry,
+    raise_id_floor,
+    rows_layout_enabled,
+    save_json_document,
+    save_json_rows,
+    storage_backend,
+)
+from utils.json_journal import JsonJournal, _atomic_write
+
+# 🗄️ One storage protocol, several backends.
+#
+# Every backend stores collections ("pokedex", "team") of JSON entries keyed by
+# string id and implements the same operations:
+#
+#   get(c, id)            → entry or None
+#   get_many(c, ids)      → {id: entry} for the ids that exist
+#   put(c, id, entry)     → insert or replace one entry
+#   patch(c, id, fields)  → merge fields into one entry (None if missing)
+#   delete(c, id)         → removed entry or None
+#   scan(c)               → {id: entry} for the whole collection
+#   load(c)               → (scan, version) read together, for compare-and-swap
+#   replace(c, entries)   → full save; with expected_version/base it merges
+#   version(c)            → cheap token that changes on every write
+#   version_after_write(c, v) → version our last point write moved v to, or None
+#   allocate_ids(c, n)    → first of n fresh consecutive integer ids
+#
+# Returned entries are always copies; callers may mutate them freely.
+# file_handler / team_handler only talk to get_backend(), never to a
+# concrete store, so new backends just need register_backend().
+
+
+class StorageBackend(ABC):
+    """
+    The protocol (see module comment). Subclasses must implement every
+    @abstractmethod; get_many, scan and version_after_write have defaults.
+    """
+
+    name = "base"
+    supports_cas = False          # replace() honours expected_version/base
+    returns_storage_form = False  # entries come back exactly as they were written
+    point_reads = True            # get() avoids reading the whole collection
+
+    @abstractmethod
+    def get(self, collection: str, entry_id: Any) -> Optional[dict]:
+        ...
+
+    def get_many(self, collection: str, entry_ids: Iterable[Any]) -> Dict[str, dict]:
+        found = {}
+        for entry_id in entry_ids:
+            entry = self.get(collection, entry_id)
+            if entry is not None:
+                found[str(entry_id)] = entry
+        return found
+
+    @abstractmethod
+    def put(self, collection: str, entry_id: Any, entry: dict) -> dict:
+        ...
+
+    @abstractmethod
+    def patch(self, collection: str, entry_id: Any, fields: Dict[str, Any], remove_fields=()) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def delete(self, collection: str, entry_id: Any) -> Optional[dict]:
+        ...
+
+    def scan(self, collection: str) -> Dict[str, dict]:
+        return self.load(collection)[0]
+
+    @abstractmethod
+    def load(self, collection: str) -> Tuple[Dict[str, dict], Any]:
+        ...
+
+    @abstractmethod
+    def replace(
+        self,
+        collection: str,
+        entries: Dict[str, dict],
+        expected_version: Any = None,
+        base: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def version(self, collection: str) -> Any:
+        ...
+
+    def version_after_write(self, collection: str, before: Any) -> Any:
+        """
+        The version a put/patch/delete that changed something produced,
+        given the version probed right before it. None when the backend
+        cannot tell (callers then reload instead of trusting a re-probe,
+        which may already include another writer's change).
+        """
+        return None
+
+    @abstractmethod
+    def allocate_ids(self, collection: str, count: int = 1) -> int:
+        """
+        Reserve `count` consecutive ids and return the first. Ids are never
+        handed out twice (deleted ones are not reused) and always lie above
+        every id already in the collection.
+        """
+
+
+def _int_id(entry_id: Any) -> Optional[int]:
+    try:
+        return int(entry_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _max_int_id(entry_ids: Iterable[Any]) -> int:
+    return max((i for i in map(_int_id, entry_ids) if i is not None), default=0)
+
+
+def _check_count(count: int) -> None:
+    if count < 1:
+        raise ValueError("allocate_ids() needs count >= 1")
+
+
+def _next_counter(before: Any) -> Optional[int]:
+    # Counter backends bump by exactly one per point write. If another
+    # writer got in, the real version is higher and the next probe misses.
+    return before + 1 if isinstance(before, int) else None
+
+
+def _patched(current: dict, fields: Dict[str, Any], remove_fields) -> dict:
+    updated = {k: v for k, v in current.items() if k not in remove_fields}
+    updated.update(fields)
+    return updated
+
+
+# 🧠 Memory — per-process dicts (tests, benchmarks, throwaway dev servers)
+class MemoryBackend(StorageBackend):
+    name = "memory"
+    supports_cas = True
+    returns_storage_form = True
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, dict]] = {}
+        self._versions: Dict[str, int] = {}
+        self._next_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _bump(self, collection: str) -> None:
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+
+    def _raise_floor(self, collection: str, floor: int) -> None:
+        if collection in self._next_ids:
+            self._next_ids[collection] = max(self._next_ids[collection], floor)
+
+    def get(self, collection, entry_id):
+        entry = self._data.get(collection, {}).get(str(entry_id))
+        return dict(entry) if entry is not None else None
+
+    def put(self, collection, entry_id, entry):
+        with self._lock:
+            self._data.setdefault(collection, {})[str(entry_id)] = dict(entry)
+            self._raise_floor(collection, (_int_id(entry_id) or 0) + 1)
+            self._bump(collection)
+        return dict(entry)
+
+    def patch(self, collection, entry_id, fields, remove_fields=()):
+        with self._lock:
+            current = self._data.get(collection, {}).get(str(entry_id))
+            if current is None:
+                return None
+            updated = _patched(current, fields, remove_fields)
+            self._data[collection][str(entry_id)] = updated
+            self._bump(collection)
+        return dict(updated)
+
+    def delete(self, collection, entry_id):
+        with self._lock:
+            removed = self._data.get(collection, {}).pop(str(entry_id), None)
+            if removed is not None:
+                self._bump(collection)
+        return removed
+
+    def load(self, collection):
+        with self._lock:
+            data = {k: dict(v) for k, v in self._data.get(collection, {}).items()}
+            return data, self._versions.get(collection, 0)
+
+    def replace(self, collection, entries, expected_version=None, base=None):
+        with self._lock:
+            current_version = self._versions.get(collection, 0)
+            if expected_version is not None and expected_version != current_version:
+                theirs = self._data.get(collection, {})
+                entries = merge_documents(collection, base, entries, theirs)
+            self._data[collection] = {str(k): dict(v) for k, v in entries.items()}
+            self._raise_floor(collection, _max_int_id(self._data[collection]) + 1)
+            self._bump(collection)
+
+    def version(self, collection):
+        return self._versions.get(collection, 0)
+
+    def version_after_write(self, collection, before):
+        return _next_counter(before)
+
+    def allocate_ids(self, collection, count=1):
+        _check_count(count)
+        with self._lock:
+            first_id = self._next_ids.get(collection)
+            if first_id is None:
+                first_id = _max_int_id(self._data.get(collection, {})) + 1
+            self._next_ids[collection] = first_id + count
+        return first_id
+
+
+# 📓 File — JSON snapshot + journal per collection (utils/json_journal)
+class FileCollection(NamedTuple):
+    path: str
+    journal_path: str
+    binary_path: Optional[str] = None
+    prepare: Optional[Callable[[Any], Dict[str, dict]]] = None   # raw JSON → storage form
+    breadcrumb: Optional[Callable[..., None]] = None
+    ids_path: Optional[str] = None   # next-id counter; defaults to <path stem>.ids
+
+
+_FILE_COLLECTIONS: Dict[str, FileCollection] = {}
+
+
+def register_file_collection(name: str, spec: FileCollection) -> None:
+    """Called by file_handler / team_handler at import to say where their JSON lives."""
+    _FILE_COLLECTIONS[name] = spec
+
+
+class FileBackend(StorageBackend):
+    """
+    Keeps a materialized copy of each collection, refreshed whenever the
+    files' stat changes, so point writes append one journal record instead
+    of re-reading the snapshot. The file has no version counter, so saves
+    are last-writer-wins (supports_cas=False), as they always were.
+
+    Allocated ids are persisted in a tiny counter file next to the
+    snapshot; the highest id in the materialized copy is tracked alongside
+    it, so allocation never scans the collection.
+    """
+
+    name = "file"
+    returns_storage_form = True
+
+    def __init__(self, collections: Optional[Dict[str, FileCollection]] = None):
+        self._collections = collections
+        self._journals: Dict[str, JsonJournal] = {}
+        self._state: Dict[str, Tuple[Any, Dict[str, dict]]] = {}
+        self._last_writes: Dict[str, Tuple[Any, Any]] = {}  # (stamp before, stamp after)
+        self._max_ids: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def _spec(self, collection: str) -> FileCollection:
+        specs = self._collections if self._collections is not None else _FILE_COLLECTIONS
+        try:
+            return specs[collection]
+        except KeyError:
+            raise ValueError(f"No JSON file registered for collection {collection!r}") from None
+
+    def _journal(self, collection: str) -> JsonJournal:
+        journal = self._journals.get(collection)
+        if journal is None:
+            spec = self._spec(collection)
+            journal = JsonJournal(
+                spec.path,
+                spec.journal_path,
+                compact_bytes=lambda: settings.FILE_JOURNAL_COMPACT_BYTES,
+                fsync=lambda: settings.FILE_JOURNAL_FSYNC,
+                breadcrumb=spec.breadcrumb or (lambda event, **fields: None),
+                binary_path=spec.binary_path,
+                binary_enabled=lambda: settings.FILE_BINARY_SNAPSHOT,
+                prepare=spec.prepare,
+            )
+            self._journals[collection] = journal
+        return journal
+
+    def journal(self, collection: str) -> JsonJournal:
+        return self._journal(collection)
+
+    def _current(self, collection: str) -> Dict[str, dict]:
+        """Materialized collection (shared, caller holds self._lock)."""
+        journal = self._journal(collection)
+        stamp = journal.version()
+        cached = self._state.get(collection)
+
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        spec = self._spec(collection)
+        bc = spec.breadcrumb or (lambda event, **fields: None)
+
+        try:
+            raw, from_binary = journal.load_with_source()
+            if from_binary or spec.prepare is None:
+                data = raw if isinstance(raw, dict) else {}
+            else:
+                data = spec.prepare(raw)
+        except Exception as e:
+            # ✅ Old behavior: unreadable JSON file counts as empty
+            bc(
+                "FILE_LOAD_ERR",
+                collection=collection,
+                path=spec.path,
+                err_type=type(e).__name__,
+                err=str(e),
+                traceback=traceback.format_exc(),
+            )
+            data = {}
+
+        # Stamp was probed BEFORE reading: a write in between is seen next time.
+        self._state[collection] = (stamp, data)
+        self._max_ids[collection] = _max_int_id(data)
+        return data
+
+    def _persist(self, collection: str, data: Dict[str, dict], key: str, entry: Optional[dict]) -> None:
+        journal = self._journal(collection)
+        before = self._state[collection][0]  # set by the _current() call that built `data`
+        self._last_writes.pop(collection, None)
+        try:
+            if not journal.enabled:
+                journal.rewrite(data)
+            elif entry is None:
+                journal.delete(key)
+            else:
+                journal.put(key, entry)
+        except Exception:
+            self._state.pop(collection, None)  # Memory copy may be ahead of disk now
+            raise
+        after = journal.version()
+        self._state[collection] = (after, data)
+        self._last_writes[collection] = (before, after)
+
+    def get(self, collection, entry_id):
+        with self._lock:
+            entry = self._current(collection).get(str(entry_id))
+        return dict(entry) if entry is not None else None
+
+    def put(self, collection, entry_id, entry):
+        key = str(entry_id)
+        with self._lock:
+            data = self._current(collection)
+            data[key] = dict(entry)
+            self._persist(collection, data, key, data[key])
+            self._max_ids[collection] = max(self._max_ids.get(collection, 0), _int_id(entry_id) or 0)
+        return dict(entry)
+
+    def patch(self, collection, entry_id, fields, remove_fields=()):
+        key = str(entry_id)
+        with self._lock:
+            data = self._current(collection)
+            current = data.get(key)
+            if current is None:
+                return None
+            data[key] = _patched(current, fields, remove_fields)
+            self._persist(collection, data, key, data[key])
+            return dict(data[key])
+
+    def delete(self, collection, entry_id):
+        key = str(entry_id)
+        with self._lock:
+            data = self._current(collection)
+            removed = data.pop(key, None)
+            if removed is not None:
+                self._persist(collection, data, key, None)
+        return removed
+
+    def load(self, collection):
+        with self._lock:
+            data = self._current(collection)
+            return {k: dict(v) for k, v in data.items()}, self._state[collection][0]
+
+    def replace(self, collection, entries, expected_version=None, base=None):
+        data = {str(k): dict(v) for k, v in entries.items()}
+        with self._lock:
+            journal = self._journal(collection)
+            self._last_writes.pop(collection, None)
+            try:
+                journal.rewrite(data)
+            finally:
+                self._state.pop(collection, None)
+            self._state[collection] = (journal.version(), data)
+            self._max_ids[collection] = _max_int_id(data)
+
+    def version(self, collection):
+        return self._journal(collection).version()
+
+    def version_after_write(self, collection, before):
+        # Stamps are file stats, not counters: only the write that started
+        # from `before` knows where it ended up.
+        with self._lock:
+            last = self._last_writes.get(collection)
+        return last[1] if last is not None and last[0] == before else None
+
+    def _ids_path(self, collection: str) -> str:
+        spec = self._spec(collection)
+        return spec.ids_path or os.path.splitext(spec.path)[0] + ".ids"
+
+    def allocate_ids(self, collection, count=1):
+        _check_count(count)
+        path = self._ids_path(collection)
+
+        with self._lock:
+            self._current(collection)  # refreshes the max id if the files changed
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored_next = int(json.load(f)["next_id"])
+            except (OSError, ValueError, TypeError, KeyError):
+                stored_next = 1  # Missing/damaged counter: the max id below still keeps us safe
+
+            first_id = max(stored_next, self._max_ids.get(collection, 0) + 1)
+            _atomic_write(path, json.dumps({"next_id": first_id + count}) + "\n", settings.FILE_JOURNAL_FSYNC)
+
+        return first_id
+
+
+def _storage_form(collection: str) -> Optional[Callable[[Any], Dict[str, dict]]]:
+    """Raw stored data → the form file_handler / team_handler save, for merges."""
+    spec = _FILE_COLLECTIONS.get(collection)
+    return spec.prepare if spec is not None else None
+
+
+def _file_seed(collection: str) -> Callable[[], Dict[str, dict]]:
+    """Database backends seed an empty collection from the JSON file."""
+    return lambda: get_backend("file").scan(collection)
+
+
+# 🐘 PostgreSQL — utils/db_json_store (document or rows layout)
+class PostgresBackend(StorageBackend):
+    name = "postgres"
+    supports_cas = True
+
+    def __init__(self):
+        # Highest id this process has allocated per collection; puts below it
+        # came from allocate_ids() and need no counter round trip.
+        self._allocated: Dict[str, int] = {}
+
+    @property
+    def point_reads(self) -> bool:
+        return rows_layout_enabled()
+
+    def get(self, collection, entry_id):
+        if rows_layout_enabled():
+            return get_json_row(collection, str(entry_id))
+        return self.scan(collection).get(str(entry_id))
+
+    def get_many(self, collection, entry_ids):
+        keys = [str(entry_id) for entry_id in entry_ids]
+        if rows_layout_enabled():
+            return get_json_rows_many(collection, keys)
+        data = self.scan(collection)
+        return {key: data[key] for key in keys if key in data}
+
+    def put(self, collection, entry_id, entry):
+        stored = insert_entry(collection, entry_id, entry, _file_seed(collection))
+        numeric_id = _int_id(entry_id)
+        if numeric_id is not None and numeric_id >= self._allocated.get(collection, 0):
+            raise_id_floor(collection, numeric_id + 1)
+        return stored
+
+    def patch(self, collection, entry_id, fields, remove_fields=()):
+        return patch_entry(collection, entry_id, fields, _file_seed(collection), remove_fields=remove_fields)
+
+    def delete(self, collection, entry_id):
+        return delete_entry(collection, entry_id, _file_seed(collection))
+
+    def load(self, collection):
+        if rows_layout_enabled():
+            # Rows are compared one by one on save; there is no document version.
+            return load_json_rows(collection, fallback_loader=_file_seed(collection)), None
+        return load_json_document_versioned(
+            key=collection,
+            fallback_loader=_file_seed(collection),
+            expected_empty={},
+        )
+
+    def replace(self, collection, entries, expected_version=None, base=None):
+        if rows_layout_enabled():
+            save_json_rows(
+                collection,
+                entries,
+                _file_seed(collection),
+                base=base,
+                normalize=_storage_form(collection),
+            )
+        else:
+            save_json_document(
+                collection,
+                entries,
+                expected_version=expected_version,
+                base=base,
+                normalize=_storage_form(collection),
+            )
+        raise_id_floor(collection, _max_int_id(entries) + 1)
+
+    def version(self, collection):
+        return document_version(collection)
+
+    def version_after_write(self, collection, before):
+        # (layout, counter); None = not stored yet, the write seeds it first
+        if before is None:
+            return None
+        layout, counter = before
+        after = _next_counter(counter)
+        return (layout, after) if after is not None else None
+
+    def allocate_ids(self, collection, count=1):
+        _check_count(count)
+        first_id = allocate_ids(collection, count, lambda: _max_int_id(self.scan(collection)) + 1)
+        self._allocated[collection] = max(self._allocated.get(collection, 0), first_id + count)
+        return first_id
+
+
+# 🗄️ SQLite — utils/sqlite_store
+class SqliteBackend(StorageBackend):
+    name = "sqlite"
+    supports_cas = True
+    returns_storage_form = True
+
+    def get(self, collection, entry_id):
+        return sqlite_store.get_entry(collection, entry_id, _file_seed(collection))
+
+    def get_many(self, collection, entry_ids):
+        return sqlite_store.get_entries(collection, entry_ids, _file_seed(collection))
+
+    def put(self, collection, entry_id, entry):
+        return sqlite_store.insert_entry(collection, entry_id, entry, _file_seed(collection))
+
+    def patch(self, collection, entry_id, fields, remove_fields=()):
+        return sqlite_store.patch_entry(
+            collection, entry_id, fields, _file_seed(collection), remove_fields=remove_fields
+        )
+
+    def delete(self, collection, entry_id):
+        return sqlite_store.delete_entry(collection, entry_id, _file_seed(collection))
+
+    def load(self, collection):
+        return sqlite_store.load_collection_versioned(collection, _file_seed(collection))
+
+    def replace(self, collection, entries, expected_version=None, base=None):
+        sqlite_store.save_collection(collection, entries, expected_version=expected_version, base=base)
+
+    def version(self, collection):
+        return sqlite_store.collection_version(collection)
+
+    def version_after_write(self, collection, before):
+        return _next_counter(before)
+
+    def allocate_ids(self, collection, count=1):
+        return sqlite_store.allocate_ids(collection, count, _file_seed(collection))
+
+
+# 📇 Registry (STORAGE_BACKEND picks the name, see db_json_store.storage_backend)
+_BACKEND_FACTORIES: Dict[str, Callable[[], StorageBackend]] = {}
+_BACKEND_INSTANCES: Dict[str, StorageBackend] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], StorageBackend]) -> None:
+    with _REGISTRY_LOCK:
+        _BACKEND_FACTORIES[name] = factory
+        _BACKEND_INSTANCES.pop(name, None)
+
+
+def registered_backends() -> Tuple[str, ...]:
+    return tuple(_BACKEND_FACTORIES)
+
+
+def get_backend(name: Optional[str] = None) -> StorageBackend:
+    name = name or storage_backend()
+    backend = _BACKEND_INSTANCES.get(name)
+    if backend is not None:
+        return backend
+
+    with _REGISTRY_LOCK:
+        backend = _BACKEND_INSTANCES.get(name)
+        if backend is None:
+            try:
+                factory = _BACKEND_FACTORIES[name]
+            except KeyError:
+                raise ValueError(f"Unknown storage backend {name!r}") from None
+            backend = _BACKEND_INSTANCES[name] = factory()
+        return backend
+
+
+register_backend("memory", MemoryBackend)
+register_backend("file", FileBackend)
+register_backend("postgres", PostgresBackend)
+register_backend("sqlite", SqliteBackend)
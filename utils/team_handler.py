@@ -1,42 +1,27 @@
 import os
-import json
 from typing import Dict, Any
 import traceback
 
-from utils.db_json_store import load_json_document, save_json_document, storage_debug
-
+from utils.db_json_store import (
+    VersionedDocument,
+    run_in_store_executor,
+    storage_debug,
+    verify_mode,
+)
+from utils.storage_backends import FileCollection, get_backend, register_file_collection
+from utils.tracing import get_tracer
 
 # ✅ Old local fallback path
 # Used only when DATABASE_URL is missing or during local/test mode.
 TEAM_FILE_PATH = os.path.join("data", "team_data.json")
+TEAM_JOURNAL_PATH = os.path.join("data", "team_data.journal")
 
 # ✅ Ensure the local fallback folder exists
 os.makedirs(os.path.dirname(TEAM_FILE_PATH), exist_ok=True)
 
 
-def _log(message: str):
-    """
-    Quiet during pytest, visible in Render/local logs otherwise.
-    """
-    if os.getenv("TESTING") != "1":
-        print(message, flush=True)
-
-
-def _team_bc(event: str, **fields) -> None:
-    """
-    Team storage breadcrumb logger.
-
-    These logs prove:
-    - whether Neon DB is active
-    - whether local JSON fallback is being used
-    - what team data was loaded/saved
-    - whether save verification succeeded
-    """
-    try:
-        parts = " ".join(f"{k}={repr(v)}" for k, v in fields.items())
-        _log(f"[TEAM_BC] {event}" + (f" {parts}" if parts else ""))
-    except Exception as e:
-        _log(f"[TEAM_BC] {event} breadcrumb_error={type(e).__name__}:{e}")
+# 🧵 Team storage breadcrumbs (utils/tracing)
+_team_bc = get_tracer("TEAM_BC")
 
 
 def _normalize_team(raw_data: Any) -> Dict[str, dict]:
@@ -89,126 +74,78 @@ def _normalize_team(raw_data: Any) -> Dict[str, dict]:
     _team_bc(
         "NORMALIZE_TEAM_OK",
         count=len(normalized),
-        nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
+        nicknames=lambda: {pid: entry.get("nickname") for pid, entry in normalized.items()},
     )
 
     return normalized
 
 
-def _load_team_from_file() -> Dict[str, dict]:
-    """
-    Old local team JSON loader.
-
-    This is now used only as:
-    - local fallback when DATABASE_URL is missing
-    - initial seed source when Neon DB row does not exist yet
-    """
-    _team_bc(
-        "FILE_LOAD_TEAM_ENTER",
-        path=TEAM_FILE_PATH,
-        exists=os.path.exists(TEAM_FILE_PATH),
-    )
-
-    if not os.path.exists(TEAM_FILE_PATH):
-        _team_bc("FILE_LOAD_TEAM_MISSING", path=TEAM_FILE_PATH)
-        return {}
-
-    try:
-        with open(TEAM_FILE_PATH, "r", encoding="utf-8") as file:
-            raw_data = json.load(file)
-
-        team = _normalize_team(raw_data)
-
-        _team_bc(
-            "FILE_LOAD_TEAM_OK",
-            count=len(team),
-            nicknames={pid: entry.get("nickname") for pid, entry in team.items()},
-        )
-
-        return team
-
-    except json.JSONDecodeError as e:
-        _team_bc(
-            "FILE_LOAD_TEAM_JSON_ERR",
-            err_type=type(e).__name__,
-            err=str(e),
-            traceback=traceback.format_exc(),
-        )
-        return {}
-
-    except Exception as e:
-        _team_bc(
-            "FILE_LOAD_TEAM_ERR",
-            err_type=type(e).__name__,
-            err=str(e),
-            traceback=traceback.format_exc(),
-        )
-        return {}
-
-
-def _save_team_to_file(team: Dict[str, Any]) -> None:
+def _team_storage_form(raw_data: Any) -> Dict[str, dict]:
     """
-    Old local team JSON saver.
-
-    Used only when DATABASE_URL is missing.
-    In Render production, we do NOT want this path.
+    Raw team (as read from the JSON file) → what the backends store:
+    string keys, no None/blank nickname.
     """
-    try:
-        normalized = _normalize_team(team)
+    normalized = _normalize_team(raw_data)
 
-        for pid, entry in normalized.items():
-            # ✅ Keep old clean behavior:
-            # If nickname is None/blank, don't store it.
-            # If nickname is real, keep it.
-            if entry.get("nickname") is None or entry.get("nickname") == "":
-                entry.pop("nickname", None)
+    for entry in normalized.values():
+        # ✅ Keep old clean behavior:
+        # If nickname is None/blank, don't store it.
+        # If nickname is real, keep it.
+        if entry.get("nickname") is None or entry.get("nickname") == "":
+            entry.pop("nickname", None)
 
-        with open(TEAM_FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(normalized, file, indent=4, ensure_ascii=False)
+    return normalized
 
-        _team_bc(
-            "FILE_SAVE_TEAM_OK",
-            path=TEAM_FILE_PATH,
-            count=len(normalized),
-            nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
-        )
 
-    except Exception as e:
-        _team_bc(
-            "FILE_SAVE_TEAM_ERR",
-            err_type=type(e).__name__,
-            err=str(e),
-            traceback=traceback.format_exc(),
-        )
-        raise
+# 📓 Where the file backend keeps the team (other backends seed from it)
+register_file_collection(
+    "team",
+    FileCollection(
+        path=TEAM_FILE_PATH,
+        journal_path=TEAM_JOURNAL_PATH,
+        prepare=_team_storage_form,
+        breadcrumb=_team_bc,
+    ),
+)
 
 
 def load_team() -> Dict[str, dict]:
     """
     Main team loader used by the app.
 
+    Reads from whichever backend STORAGE_BACKEND selects
+    (utils/storage_backends):
+
     Render production:
         DATABASE_URL present → load from Neon PostgreSQL.
 
     Local/dev/test:
         DATABASE_URL missing or TESTING=1 → load from data/team_data.json.
     """
-    _team_bc("LOAD_TEAM_ENTER", storage=storage_debug())
+    _team_bc("LOAD_TEAM_ENTER", storage=storage_debug)
 
     try:
-        raw_data = load_json_document(
-            key="team",
-            fallback_loader=_load_team_from_file,
-            expected_empty={},
+        backend = get_backend()
+        raw_data, version = backend.load("team")
+
+        if backend.returns_storage_form and isinstance(raw_data, dict):
+            normalized = {str(pid): dict(entry) for pid, entry in raw_data.items()}
+        else:
+            normalized = _normalize_team(raw_data)
+
+        # ✅ Remember version + raw stored data so save_team() can do a
+        # compare-and-swap with merge (not for the file, it has no version).
+        team = VersionedDocument(
+            normalized,
+            version=version if backend.supports_cas else None,
+            base=raw_data if backend.supports_cas and isinstance(raw_data, dict) else None,
         )
 
-        team = _normalize_team(raw_data)
-
         _team_bc(
             "LOAD_TEAM_OK",
             count=len(team),
-            storage=storage_debug(),
-            nicknames={pid: entry.get("nickname") for pid, entry in team.items()},
+            storage=storage_debug,
+            nicknames=lambda: {pid: entry.get("nickname") for pid, entry in team.items()},
         )
 
         return team
@@ -219,7 +156,7 @@ def load_team() -> Dict[str, dict]:
             err_type=type(e).__name__,
             err=str(e),
             traceback=traceback.format_exc(),
-            storage=storage_debug(),
+            storage=storage_debug,
         )
         raise
 
@@ -229,7 +166,16 @@ def save_team(team: Dict[str, Any]) -> None:
     Main team saver used by the app.
 
     If DATABASE_URL exists:
-        Saves to Neon.
+        Saves to Neon. With DB_STORAGE_LAYOUT=rows each team slot is its
+        own row and only changed slots are written.
+
+        When `team` is the VersionedDocument returned by load_team(), the
+        save is a compare-and-swap: concurrent changes to other slots are
+        merged in, and DocumentConflictError is raised only when both
+        sides changed the same slot.
+
+    If STORAGE_BACKEND=sqlite:
+        Saves to the SQLite team table with the same merge.
 
     If DATABASE_URL is missing:
         Saves to local JSON fallback.
@@ -240,56 +186,55 @@ def save_team(team: Dict[str, Any]) -> None:
         "SAVE_TEAM_ENTER",
         incoming_type=type(team).__name__,
         incoming_len=len(team) if hasattr(team, "__len__") else None,
-        storage=storage_debug(),
+        storage=storage_debug,
     )
 
     try:
-        normalized = _normalize_team(team)
-
-        for pid, entry in normalized.items():
-            if entry.get("nickname") is None or entry.get("nickname") == "":
-                entry.pop("nickname", None)
+        normalized = _team_storage_form(team)
 
         _team_bc(
             "SAVE_TEAM_NORMALIZED",
             count=len(normalized),
-            nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
-            storage=storage_debug(),
+            nicknames=lambda: {pid: entry.get("nickname") for pid, entry in normalized.items()},
+            storage=storage_debug,
         )
 
-        saved_to_db = save_json_document("team", normalized)
+        backend = get_backend()
+        backend.replace(
+            "team",
+            normalized,
+            expected_version=getattr(team, "version", None),
+            base=getattr(team, "base", None),
+        )
 
-        if saved_to_db:
-            _team_bc(
-                "SAVE_TEAM_DB_OK",
-                count=len(normalized),
-                nicknames={pid: entry.get("nickname") for pid, entry in normalized.items()},
-                storage=storage_debug(),
-            )
+        _team_bc(
+            "SAVE_TEAM_OK",
+            backend=backend.name,
+            count=len(normalized),
+            nicknames=lambda: {pid: entry.get("nickname") for pid, entry in normalized.items()},
+        )
 
-            # ✅ Immediate verification from Neon.
-            verify_raw = load_json_document(
-                key="team",
-                fallback_loader=_load_team_from_file,
-                expected_empty={},
-            )
+        # ✅ Verification per STORAGE_VERIFY_MODE.
+        # "hash" is checked inside the PostgreSQL write (RETURNING md5(data::text)),
+        # only "full" pays for a second read.
+        mode = verify_mode()
+
+        if mode == "full":
+            verify_raw, _verify_version = backend.load("team")
             verify_team = _normalize_team(verify_raw)
 
             _team_bc(
-                "SAVE_TEAM_DB_VERIFY_OK",
+                "SAVE_TEAM_VERIFY_OK",
+                mode=mode,
                 count=len(verify_team),
-                verify_nicknames={
+                verify_nicknames=lambda: {
                     pid: entry.get("nickname")
                     for pid, entry in verify_team.items()
                 },
-                storage=storage_debug(),
+                storage=storage_debug,
             )
-
-            return
-
-        # ✅ Local fallback only when DB is disabled.
-        _team_bc("SAVE_TEAM_FILE_FALLBACK_BEGIN", storage=storage_debug())
-        _save_team_to_file(normalized)
+        else:
+            _team_bc("SAVE_TEAM_VERIFY_OK", mode=mode, count=len(normalized))
 
     except Exception as e:
         _team_bc(
@@ -297,6 +242,15 @@ def save_team(team: Dict[str, Any]) -> None:
             err_type=type(e).__name__,
             err=str(e),
             traceback=traceback.format_exc(),
-            storage=storage_debug(),
+            storage=storage_debug,
         )
-        raise
\ No newline at end of file
+        raise
+
+
+# ⚡ Async variants for async routes (run on the storage executor).
+async def load_team_async() -> Dict[str, dict]:
+    return await run_in_store_executor(load_team)
+
+
+async def save_team_async(team: Dict[str, Any]) -> None:
+    await run_in_store_executor(save_team, team)
@@ -0,0 +1,212 @@
+import atexit
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import types
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+
+# 🧵 Breadcrumb tracing shared by every subsystem ([FH_BC], [DB_BC], ...).
+#
+#   _fh_bc = get_tracer("FH_BC")
+#   _fh_bc("LOAD_POKEDEX_RETURN_OK", count=len(pokedex), nicknames=lambda: {...})
+#
+# - Levels per subsystem: TRACE_LEVEL is the default, TRACE_LEVELS overrides
+#   single tags ("FH_BC=debug,DB_BC=error"). off < error < info < debug.
+# - An event's level comes from its name unless a level method is used:
+#   *_ERR / *_ERROR / *CRASH* → error, *_ENTER / *_BEGIN / *_ITEM_* → debug,
+#   everything else → info.
+# - A disabled event costs a level lookup: no repr(), no string building.
+#   Field values that are functions (lambdas) are only called when the event
+#   is actually written, so O(n) summaries are free when tracing is off.
+# - TRACE_SAMPLE_RATE keeps that fraction of info/debug events; errors are
+#   always kept.
+# - Lines go onto a bounded queue drained by one daemon thread that writes
+#   to stdout and flushes once per batch. A full queue drops the line
+#   (counted in trace_stats()) instead of blocking the request.
+
+LEVELS = {"off": 0, "error": 1, "info": 2, "debug": 3}
+ERROR, INFO, DEBUG = LEVELS["error"], LEVELS["info"], LEVELS["debug"]
+
+_BATCH_LINES = 256
+
+_STATS: Dict[str, int] = {"written": 0, "dropped": 0, "sampled_out": 0}
+
+# (TRACE_LEVEL, TRACE_LEVELS) → (default level, {tag: level}); re-parsed when settings change
+_THRESHOLDS: Optional[Tuple[Tuple[str, str], int, Dict[str, int]]] = None
+
+_QUEUE: Optional[queue.Queue] = None
+_WRITER_PID: Optional[int] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def _parse_level(name: str, default: int) -> int:
+    return LEVELS.get(str(name).strip().lower(), default)
+
+
+def _threshold(tag: str) -> int:
+    global _THRESHOLDS
+
+    key = (settings.TRACE_LEVEL, settings.TRACE_LEVELS)
+    parsed = _THRESHOLDS
+
+    if parsed is None or parsed[0] != key:
+        default = _parse_level(key[0], INFO)
+        overrides = {}
+        for item in str(key[1] or "").split(","):
+            name, sep, level = item.partition("=")
+            if sep and name.strip():
+                overrides[name.strip().upper()] = _parse_level(level, default)
+        parsed = _THRESHOLDS = (key, default, overrides)
+
+    return parsed[2].get(tag, parsed[1])
+
+
+def event_level(event: str) -> int:
+    if event.endswith(("_ERR", "_ERROR")) or "CRASH" in event:
+        return ERROR
+    if event.endswith(("_ENTER", "_BEGIN")) or "_ITEM_" in event:
+        return DEBUG
+    return INFO
+
+
+# 📤 Sink: bounded queue + one writer thread
+def _writer_loop(lines: queue.Queue) -> None:
+    while True:
+        batch = [lines.get()]
+        try:
+            while len(batch) < _BATCH_LINES:
+                batch.append(lines.get_nowait())
+        except queue.Empty:
+            pass
+
+        try:
+            sys.stdout.write("\n".join(batch) + "\n")
+            sys.stdout.flush()
+            _STATS["written"] += len(batch)
+        except Exception:
+            pass
+        finally:
+            for _ in batch:
+                lines.task_done()
+
+
+def _queue() -> queue.Queue:
+    global _QUEUE, _WRITER_PID
+
+    lines = _QUEUE
+    if lines is not None and _WRITER_PID == os.getpid():
+        return lines
+
+    with _WRITER_LOCK:
+        # A forked worker inherits the queue but not the thread: start over.
+        if _QUEUE is None or _WRITER_PID != os.getpid():
+            _QUEUE = queue.Queue(maxsize=max(1, int(settings.TRACE_QUEUE_SIZE)))
+            _WRITER_PID = os.getpid()
+            threading.Thread(target=_writer_loop, args=(_QUEUE,), name="trace-writer", daemon=True).start()
+        return _QUEUE
+
+
+def _write(line: str) -> None:
+    try:
+        _queue().put_nowait(line)
+    except queue.Full:
+        _STATS["dropped"] += 1
+
+
+def flush_traces(timeout: float = 2.0) -> None:
+    """Wait (bounded) until queued breadcrumbs are written — shutdown, tests."""
+    lines = _QUEUE
+    if lines is None or _WRITER_PID != os.getpid():
+        return
+
+    deadline = time.monotonic() + timeout
+    while lines.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+atexit.register(flush_traces)
+
+
+def trace_stats() -> dict:
+    lines = _QUEUE
+    return {"queued": lines.qsize() if lines is not None else 0, **_STATS}
+
+
+class Tracer:
+    """
+    Breadcrumb logger for one subsystem tag.
+
+    Call it like the old helpers: tracer("EVENT", key=value, ...). Use
+    .error / .info / .debug to override the level guessed from the name.
+    """
+
+    __slots__ = ("tag", "redact", "clip")
+
+    def __init__(self, tag: str, redact: Tuple[str, ...] = (), clip: Optional[int] = None):
+        self.tag = tag
+        self.redact = tuple(word.lower() for word in redact)
+        self.clip = clip
+
+    def enabled(self, level: int = INFO) -> bool:
+        return level <= _threshold(self.tag)
+
+    def __call__(self, event: str, /, **fields: Any) -> None:
+        self._emit(event_level(event), event, fields)
+
+    def error(self, event: str, /, **fields: Any) -> None:
+        self._emit(ERROR, event, fields)
+
+    def info(self, event: str, /, **fields: Any) -> None:
+        self._emit(INFO, event, fields)
+
+    def debug(self, event: str, /, **fields: Any) -> None:
+        self._emit(DEBUG, event, fields)
+
+    def _emit(self, level: int, event: str, fields: Dict[str, Any]) -> None:
+        if level > _threshold(self.tag):
+            return
+
+        if level > ERROR:
+            rate = settings.TRACE_SAMPLE_RATE
+            if rate < 1 and random.random() >= rate:
+                _STATS["sampled_out"] += 1
+                return
+
+        try:
+            parts = " ".join(f"{k}={self._format(k, v)}" for k, v in fields.items())
+            line = f"[{self.tag}] {event}" + (f" {parts}" if parts else "")
+        except Exception as e:
+            line = f"[{self.tag}] {event} breadcrumb_error={type(e).__name__}:{e}"
+
+        _write(line)
+
+    def _format(self, key: str, value: Any) -> str:
+        if self.redact and any(word in key.lower() for word in self.redact):
+            return repr("***hidden***")
+
+        if isinstance(value, types.FunctionType):
+            value = value()  # ⏳ Deferred field, only built when written
+
+        try:
+            text = repr(value)
+        except Exception:
+            text = f"<unrepr:{type(value).__name__}>"
+
+        if self.clip is not None and len(text) > self.clip:
+            text = text[: self.clip] + "…"
+        return text
+
+
+_TRACERS: Dict[str, Tracer] = {}
+
+
+def get_tracer(tag: str, redact: Tuple[str, ...] = (), clip: Optional[int] = None) -> Tracer:
+    tracer = _TRACERS.get(tag)
+    if tracer is None:
+        tracer = _TRACERS[tag] = Tracer(tag, redact=redact, clip=clip)
+    return tracer
@@ -0,0 +1,92 @@
+import heapq
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# 🔤 Trigram index for fuzzy name search (pg_trgm style).
+#
+# Every word is lower-cased and padded ("  pikachu ") before being cut into
+# three-letter grams, so prefixes weigh more than the middle of a word.
+# Similarity of a query and a text is the Jaccard overlap of their gram sets:
+#
+#   shared / (|query grams| + |text grams| - shared)
+#
+# A search only visits the posting lists of the query's grams, scores each
+# candidate once, and keeps the best k in a heap — cost follows the number of
+# candidates touched, not the number of results returned.
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    grams: Set[str] = set()
+    for word in _WORD.findall(str(text).casefold()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """
+    gram → ids posting lists over one or more texts per id (name,
+    nickname, ...). An id's score is its best-matching text.
+
+    Not thread-safe on its own; PokedexIndex guards it with its lock.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)  # gram → {(id, text no.)}
+        self._texts: Dict[int, List[FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, pid: int, texts: Iterable[str]) -> None:
+        self.remove(pid)
+
+        grams = []
+        for text in dict.fromkeys(t for t in texts if t):
+            text_grams = trigrams(text)
+            if text_grams:
+                grams.append(text_grams)
+
+        if not grams:
+            return
+
+        self._texts[pid] = grams
+        for n, text_grams in enumerate(grams):
+            for gram in text_grams:
+                self._postings[gram].add((pid, n))
+
+    def remove(self, pid: int) -> None:
+        grams = self._texts.pop(pid, None)
+        if grams is None:
+            return
+
+        for n, text_grams in enumerate(grams):
+            for gram in text_grams:
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard((pid, n))
+                    if not posting:
+                        del self._postings[gram]
+
+    def search(self, query: str, k: int = 10, min_score: float = 0.0) -> List[Tuple[float, int]]:
+        """Best `k` (score, id) pairs, highest score first (ties: lower id)."""
+        wanted = trigrams(query)
+        if not wanted or k <= 0:
+            return []
+
+        shared: Dict[Tuple[int, int], int] = defaultdict(int)
+        for gram in wanted:
+            for hit in self._postings.get(gram, ()):
+                shared[hit] += 1
+
+        best: Dict[int, float] = {}
+        for (pid, n), count in shared.items():
+            score = count / (len(wanted) + len(self._texts[pid][n]) - count)
+            if score >= min_score and score > best.get(pid, -1.0):
+                best[pid] = score
+
+        top = heapq.nlargest(k, best.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, pid) for pid, score in top]
@@ -0,0 +1,180 @@
+import asyncio
+import traceback
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from config import settings
+from utils.file_handler import load_pokedex_async, save_pokedex_async
+from utils.team_handler import load_team_async, save_team_async
+from utils.tracing import get_tracer
+
+# 🧺 Write coalescing: mutations that arrive within WRITE_BATCH_WINDOW_MS are
+# applied to one loaded document and persisted with a single save. Every caller
+# still waits until *its* batch is saved, so a 2xx always means "on disk / in DB".
+
+Mutation = Callable[[dict], Any]
+
+
+# 🧵 Breadcrumbs (utils/tracing)
+_wb_bc = get_tracer("WB_BC")
+
+
+class WriteBatcher:
+    """
+    Coalesce document mutations into one load → mutate… → save cycle.
+
+    A mutation is a plain function that receives the loaded document, changes
+    it in place and returns whatever the caller should get back. It must check
+    everything it needs *before* touching the document: if it raises, the
+    exception goes to that caller only and the rest of the batch still saves.
+
+    With a window of 0 the batcher is a pass-through: each submit loads, runs
+    the mutation and saves on its own, exactly like calling save_* directly.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load_fn: Callable[[], Awaitable[dict]],
+        save_fn: Callable[[dict], Awaitable[None]],
+        window_ms: Optional[int] = None,
+        max_batch: Optional[int] = None,
+    ):
+        self.name = name
+        self._load_fn = load_fn
+        self._save_fn = save_fn
+        self._window_ms = window_ms
+        self._max_batch = max_batch
+
+        self._pending: List[Tuple[Mutation, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"batches": 0, "mutations": 0, "failed_batches": 0}
+
+    # ⚙️ Settings are read on every call so tests/env changes take effect live
+    @property
+    def window_seconds(self) -> float:
+        window_ms = self._window_ms if self._window_ms is not None else settings.WRITE_BATCH_WINDOW_MS
+        return max(0, int(window_ms)) / 1000.0
+
+    @property
+    def max_batch(self) -> int:
+        size = self._max_batch if self._max_batch is not None else settings.WRITE_BATCH_MAX_SIZE
+        return max(1, int(size))
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    def _bind_loop(self) -> None:
+        # 🔁 Futures/locks belong to one event loop (TestClient may start several)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._flush_lock = asyncio.Lock()
+
+    async def submit(self, mutation: Mutation) -> Any:
+        """Apply `mutation` in the next batch and return its result once saved."""
+        if not self.enabled:
+            document = await self._load_fn()
+            result = mutation(document)
+            await self._save_fn(document)
+            return result
+
+        self._bind_loop()
+        future = self._loop.create_future()
+        self._pending.append((mutation, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._cancel_timer()
+            asyncio.ensure_future(self._flush())
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+        return await future
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.window_seconds)
+        except asyncio.CancelledError:
+            return
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            await self._apply_batch(batch)
+
+    async def _apply_batch(self, batch: List[Tuple[Mutation, asyncio.Future]]) -> None:
+        try:
+            document = await self._load_fn()
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            _wb_bc("BATCH_LOAD_FAILED", batcher=self.name, size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        applied: List[Tuple[asyncio.Future, Any]] = []
+        for mutation, future in batch:
+            if future.done():
+                continue  # 🚪 Caller went away (cancelled) — skip its change
+            try:
+                applied.append((future, mutation(document)))
+            except Exception as e:
+                future.set_exception(e)
+
+        if not applied:
+            return
+
+        try:
+            await self._save_fn(document)
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            _wb_bc(
+                "BATCH_SAVE_ERR",
+                batcher=self.name,
+                size=len(applied),
+                err_type=type(e).__name__,
+                err=str(e),
+                traceback=traceback.format_exc(),
+            )
+            for future, _ in applied:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["mutations"] += len(applied)
+        _wb_bc("BATCH_SAVED", batcher=self.name, size=len(applied))
+        for future, result in applied:
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """Save anything still waiting (called on shutdown)."""
+        if self._loop is not asyncio.get_running_loop() or not self._pending:
+            return
+        self._cancel_timer()
+        await self._flush()
+
+
+# 📦 Shared batchers used by the routers
+pokedex_writes = WriteBatcher("pokedex", load_pokedex_async, save_pokedex_async)
+team_writes = WriteBatcher("team", load_team_async, save_team_async)
+
+
+async def drain_all() -> None:
+    for batcher in (pokedex_writes, team_writes):
+        await batcher.drain()